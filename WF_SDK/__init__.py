@@ -1,17 +1,40 @@
 """
 This module realizes communication with Digilent Test & Measurement devices
+
+the submodules are imported on first use, so "import WF_SDK" is fast and only
+the instruments which are used load their dependencies
 """
 
-from WF_SDK import device
-from WF_SDK import scope
-from WF_SDK import wavegen
-from WF_SDK import supplies
-from WF_SDK import dmm
-from WF_SDK import logic
-from WF_SDK import pattern
-from WF_SDK import static
-from WF_SDK import protocol
+import importlib                  # import the submodules on first use
+
+# submodules which can be accessed as attributes of the package
+__submodules__ = ["device", "scope", "wavegen", "supplies", "dmm", "logic", "pattern", "static",
+                  "protocol", "monitor", "aio", "manager", "tools", "library", "simulator", "trace", "bode"]
+
+# names which are loaded from a submodule
+__names__ = {"error": "device", "warning": "device"}
+
+__all__ = __submodules__ + list(__names__)
+
+"""-----------------------------------------------------------------------"""
+
+def __getattr__(name):
+    """
+        import a submodule, or a name from a submodule, when it is first accessed
+    """
+    if name in __submodules__:
+        value = importlib.import_module("WF_SDK." + name)
+    elif name in __names__:
+        value = getattr(importlib.import_module("WF_SDK." + __names__[name]), name)
+    else:
+        raise AttributeError("module 'WF_SDK' has no attribute '" + name + "'")
+    globals()[name] = value     # later accesses don't call this function again
+    return value
 
-from WF_SDK import tools
+"""-----------------------------------------------------------------------"""
 
-from WF_SDK.device import error, warning
+def __dir__():
+    """
+        list the lazily loaded names too
+    """
+    return sorted(set(globals()) | set(__all__))
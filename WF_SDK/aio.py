@@ -0,0 +1,120 @@
+""" ASYNCIO CONTROL FUNCTIONS: record_scope, record_scope_channels, record_logic, generate, measure_dmm """
+
+import asyncio                    # event loop integration
+from WF_SDK import scope, logic, wavegen, dmm
+from WF_SDK.device import error
+
+"""-----------------------------------------------------------------------"""
+
+async def record_scope(device_data, channel, as_array=True, out=None):
+    """
+        record an analog signal without blocking the event loop
+
+        parameters: see scope.record, the wait policy is scope.data.wait
+
+        returns:    - a numpy array (or a list) with the recorded voltages
+
+        cancelling the task resets the oscilloscope
+    """
+    instrument = scope.instrument(device_data, scope.data)
+    await __acquire__(instrument, "record_scope", "scope")
+    return instrument.read(channel, as_array, out)
+
+"""-----------------------------------------------------------------------"""
+
+async def record_scope_channels(device_data, channels=None, out=None):
+    """
+        record several analog channels from one acquisition without blocking the event loop
+
+        parameters: see scope.record_channels
+
+        returns:    - a numpy array with one row of recorded voltages for each channel
+
+        cancelling the task resets the oscilloscope
+    """
+    instrument = scope.instrument(device_data, scope.data)
+    await __acquire__(instrument, "record_scope_channels", "scope")
+    return instrument.read_channels(channels, out)
+
+"""-----------------------------------------------------------------------"""
+
+async def record_logic(device_data, channel, as_array=True, out=None):
+    """
+        record a logic signal without blocking the event loop
+
+        parameters: see logic.record, the wait policy is logic.data.wait
+
+        returns:    - a numpy array (or a list) with the recorded logic values
+
+        cancelling the task resets the logic analyzer
+    """
+    instrument = logic.instrument(device_data, logic.data)
+    await __acquire__(instrument, "record_logic", "logic")
+    return instrument.read(channel, as_array, out)
+
+"""-----------------------------------------------------------------------"""
+
+async def generate(device_data, channel, *args, **kwargs):
+    """
+        generate an analog signal in a worker thread
+
+        parameters: see wavegen.generate
+
+        cancelling the task resets the wavegen channel
+    """
+    task = asyncio.ensure_future(asyncio.to_thread(wavegen.generate, device_data, channel, *args, **kwargs))
+    try:
+        return await asyncio.shield(task)
+    except asyncio.CancelledError:
+        # let the SDK calls finish before resetting the channel
+        await asyncio.gather(task, return_exceptions=True)
+        wavegen.close(device_data, channel)
+        raise
+
+"""-----------------------------------------------------------------------"""
+
+async def measure_dmm(device_data, *args, **kwargs):
+    """
+        measure with the digital multimeter in a worker thread
+
+        parameters: see dmm.measure
+
+        returns:    - the measured value
+
+        cancelling the task resets the multimeter
+    """
+    task = asyncio.ensure_future(asyncio.to_thread(dmm.measure, device_data, *args, **kwargs))
+    try:
+        return await asyncio.shield(task)
+    except asyncio.CancelledError:
+        # let the SDK calls finish before resetting the instrument
+        await asyncio.gather(task, return_exceptions=True)
+        dmm.close(device_data)
+        raise
+
+"""-----------------------------------------------------------------------"""
+
+async def __acquire__(instrument, function, name):
+    """
+        start an acquisition of a scope or logic instrument and await the full buffer
+    """
+    policy = instrument.data.wait
+    instrument.start()
+    try:
+        # same poll intervals as device.wait, but the event loop keeps running
+        delays = policy.delays(instrument.data.buffer_size / instrument.data.sampling_frequency)
+        while not instrument.done():
+            delay = next(delays, None)
+            if delay is None:
+                raise error("Timeout after " + str(policy.timeout) + "s", function, name)
+            if policy.cancel is not None and policy.cancel.is_set():
+                raise error("Cancelled", function, name)
+            await asyncio.sleep(delay)
+    except asyncio.CancelledError:
+        # reset the instrument, so the next acquisition starts clean
+        instrument.close()
+        raise
+    except error:
+        instrument.stop()
+        raise
+    return
@@ -0,0 +1,153 @@
+""" FREQUENCY RESPONSE FUNCTIONS: sweep, capture, response """
+
+import ctypes                     # import the C compatible data types
+import time                       # settling time of the circuit
+from concurrent.futures import ThreadPoolExecutor   # the DFT of a point runs during the next acquisition
+import numpy as np                # single-bin DFT of the captures
+from WF_SDK import scope, wavegen
+from WF_SDK.library import dwf
+from WF_SDK.device import check_error, error
+
+"""-----------------------------------------------------------------------"""
+
+class response:
+    """ frequency response of a sweep, one element for each frequency """
+    def __init__(self, frequency, input_amplitude, output_amplitude, phase):
+        self.frequency = frequency                          # stimulus frequency in Hz
+        self.input_amplitude = input_amplitude              # amplitude on the input channel in Volts
+        self.output_amplitude = output_amplitude            # amplitude on the output channel in Volts
+        # a point without input has no gain (NaN), a point without output is -inf dB
+        input_amplitude = np.asarray(input_amplitude, dtype=np.float64)
+        output_amplitude = np.asarray(output_amplitude, dtype=np.float64)
+        self.gain = np.divide(output_amplitude, input_amplitude, out=np.full(input_amplitude.shape, np.nan), where=input_amplitude > 0)   # output / input
+        self.gain_db = 20 * np.log10(self.gain, out=np.where(self.gain == 0, -np.inf, np.nan), where=self.gain > 0)                      # gain in dB
+        self.phase = phase                                  # phase of the output relative to the input in degrees
+        return
+
+"""-----------------------------------------------------------------------"""
+
+def sweep(device_data, frequencies, amplitude=1, offset=0, wavegen_channel=1, input_channel=1, output_channel=2, periods=2, samples_per_period=16, settle=2, amplitude_range=5, noise_floor=1e-03):
+    """
+        measure the frequency response of a circuit driven by the waveform generator
+
+        the sine stimulus is measured on the input channel, the response on the output
+        channel, gain and phase come from a single-bin DFT at the stimulus frequency;
+        every point is the shortest capture of whole periods the oscilloscope can make,
+        and its DFT is computed while the next point is acquired; a point whose input
+        amplitude is below the noise floor (the input is not connected, or the circuit
+        loads the stimulus down) has no meaningful gain or phase, and raises an error
+
+        parameters: - device data
+                    - list of frequencies in Hz
+                    - stimulus amplitude in Volts, default is 1V
+                    - stimulus offset in Volts, default is 0V
+                    - the selected wavegen channel (1-2), default is 1
+                    - oscilloscope channel of the circuit input (1-4), default is 1
+                    - oscilloscope channel of the circuit output (1-4), default is 2
+                    - minimum number of periods in a capture, default is 2
+                    - minimum number of samples in a period (if the buffer holds them), default is 16
+                    - settling time after a frequency change in periods, default is 2
+                    - oscilloscope range in Volts, default is 5V
+                    - smallest input amplitude relative to the range, default is 1e-03
+
+        returns:    - response
+    """
+    frequencies = np.asarray(frequencies, dtype=np.float64)
+    if frequencies.ndim != 1 or frequencies.size == 0 or np.any(frequencies <= 0):
+        raise error("The frequencies must be a non-empty list of positive values", "sweep", "bode")
+
+    # the oscilloscope gets its own settings, the module functions are not affected
+    recorder = scope.session(device_data, None)
+    stimulus = wavegen.output(device_data, wavegen_channel)
+    clock = __clock__(device_data)
+    buffer_size = device_data.analog.input.max_buffer_size
+    results = []
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="WF_SDK bode") as executor:
+        try:
+            stimulus.generate(wavegen.function.sine, offset, frequencies[0], amplitude)
+            for frequency in frequencies:
+                # change the frequency on the fly, the capture is whole periods long
+                stimulus.set(frequency=frequency)
+                sampling_frequency, count = capture(frequency, clock, buffer_size, periods, samples_per_period)
+                recorder.configure(sampling_frequency=sampling_frequency, buffer_size=count, amplitude_range=amplitude_range, mode=scope.filter_mode.average)
+                sampling_frequency = __sampling_frequency__(device_data)
+                time.sleep(settle / frequency)
+
+                # the previous point is computed during this acquisition
+                samples = recorder.record_channels([input_channel, output_channel])
+                results.append(executor.submit(__dft__, samples, frequency, sampling_frequency))
+        finally:
+            stimulus.close()
+            recorder.close()
+        values = np.array([result.result() for result in results])
+
+    # the gain and the phase are divided by the input, it must be above the noise
+    floor = noise_floor * amplitude_range
+    quiet = np.nonzero(np.abs(values[:, 0]) < floor)[0]
+    if quiet.size > 0:
+        raise error("The input amplitude is below " + str(floor) + "V at " + str(frequencies[quiet[0]]) + "Hz", "sweep", "bode")
+    return response(frequencies, np.abs(values[:, 0]), np.abs(values[:, 1]), np.degrees(np.angle(values[:, 1] / values[:, 0])))
+
+"""-----------------------------------------------------------------------"""
+
+def capture(frequency, clock, buffer_size, periods=2, samples_per_period=16):
+    """
+        find the shortest capture of whole periods
+
+        the sample rate is the ADC clock divided by an integer, the divider is
+        chosen so that the periods fill a whole number of samples (or the closest to it),
+        with as few samples as possible
+
+        parameters: - signal frequency in Hz
+                    - ADC clock frequency in Hz
+                    - buffer size in samples
+                    - minimum number of periods, default is 2
+                    - minimum number of samples in a period (if the buffer holds them), default is 16
+
+        returns:    - sampling frequency in Hz, number of samples
+    """
+    duration = periods / frequency
+    # the smallest divider which fits the buffer, and the largest one which gives enough samples
+    lowest = max(int(np.ceil(clock * duration / buffer_size)), 1)
+    highest = min(max(int(clock / (frequency * samples_per_period)), lowest), lowest + 1000000)
+    dividers = np.arange(lowest, highest + 1)
+    counts = clock * duration / dividers
+
+    # prefer exact whole periods, then fewer samples
+    mismatch = np.abs(counts - np.rint(counts)) / counts
+    exact = np.nonzero(mismatch < 1e-09)[0]
+    best = exact[-1] if exact.size > 0 else np.argmin(mismatch)
+    return clock / dividers[best], int(np.rint(counts[best]))
+
+"""-----------------------------------------------------------------------"""
+
+def __clock__(device_data):
+    """
+        the highest sampling frequency of the oscilloscope (the ADC clock)
+    """
+    minimum = ctypes.c_double()
+    maximum = ctypes.c_double()
+    if dwf.FDwfAnalogInFrequencyInfo(device_data.handle, ctypes.byref(minimum), ctypes.byref(maximum)) == 0:
+        check_error()
+    return maximum.value
+
+"""-----------------------------------------------------------------------"""
+
+def __sampling_frequency__(device_data):
+    """
+        the sampling frequency set on the device
+    """
+    frequency = ctypes.c_double()
+    if dwf.FDwfAnalogInFrequencyGet(device_data.handle, ctypes.byref(frequency)) == 0:
+        check_error()
+    return frequency.value
+
+"""-----------------------------------------------------------------------"""
+
+def __dft__(samples, frequency, sampling_frequency):
+    """
+        complex amplitude of every channel at one frequency
+    """
+    count = samples.shape[1]
+    kernel = np.exp(-2j * np.pi * frequency / sampling_frequency * np.arange(count))
+    return (samples - samples.mean(axis=1, keepdims=True)) @ kernel * 2 / count
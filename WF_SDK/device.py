@@ -1,4 +1,4 @@
-""" DEVICE CONTROL FUNCTIONS: open, check_error, close, temperature """
+""" DEVICE CONTROL FUNCTIONS: open, list_devices, check_error, count_errors, error_rate, wait, close, temperature, info_cache """
 
 """
 import ctypes                            # import the C compatible data types
@@ -20,29 +20,13 @@ else:
 
 """-----------------------------------------------------------------------"""
 
+import builtins                   # the built-in open, shadowed by open in this module
 import ctypes                     # import the C compatible data types
-from sys import platform, path    # this is needed to check the OS type and get the PATH
-from os import sep                # OS specific file path separators
-import inspect                    # caller function data
-
-# load the dynamic library, get constants path (the path is OS specific)
-if platform.startswith("win"):
-    # on Windows
-    dwf = ctypes.cdll.dwf
-    constants_path = "C:" + sep + "Program Files (x86)" + sep + "Digilent" + sep + "WaveFormsSDK" + sep + "samples" + sep + "py"
-elif platform.startswith("darwin"):
-    # on macOS
-    lib_path = sep + "Library" + sep + "Frameworks" + sep + "dwf.framework" + sep + "dwf"
-    dwf = ctypes.cdll.LoadLibrary(lib_path)
-    constants_path = sep + "Applications" + sep + "WaveForms.app" + sep + "Contents" + sep + "Resources" + sep + "SDK" + sep + "samples" + sep + "py"
-else:
-    # on Linux
-    dwf = ctypes.cdll.LoadLibrary("libdwf.so")
-    constants_path = sep + "usr" + sep + "share" + sep + "digilent" + sep + "waveforms" + sep + "samples" + sep + "py"
-
-# import constants
-path.append(constants_path)
-import dwfconstants as constants
+import json                       # format of the capability cache
+import os                         # location of the capability cache
+import threading                  # the error counters are shared between threads
+import time                       # timing of the wait loops
+from WF_SDK.library import dwf, constants, last_failed, tracing
 
 """-----------------------------------------------------------------------"""
 
@@ -55,7 +39,7 @@ def open():
     device_handle = ctypes.c_int()
 
     # connect to the first available device
-    dwf.FDwfDeviceOpen(ctypes.c_int(-1), ctypes.byref(device_handle))
+    dwf.FDwfDeviceOpen(-1, ctypes.byref(device_handle))
     data.handle = device_handle
     data.name = device_name
     return data
@@ -65,14 +49,17 @@ def open():
 
 class error(Exception):
     """
-        WaveForms SDK error
+        WaveForms SDK error, code is the DWFERC returned by the SDK (0 for errors raised by this module)
     """
-    def __init__(self, message, function, instrument):
+    def __init__(self, message, function, instrument, code=0):
         self.message = message
         self.function = function
         self.instrument = instrument
+        self.code = code
         return
     def __str__(self):
+        if self.code != 0:
+            return "Error: " + self.instrument + " -> " + self.function + " -> " + self.message + " (code " + str(self.code) + ")"
         return "Error: " + self.instrument + " -> " + self.function + " -> " + self.message
 
 class warning(Exception):
@@ -87,10 +74,92 @@ class warning(Exception):
     def __str__(self):
         return "Warning: " + self.instrument + " -> " + self.function + " -> " + self.message
 
+class wait_policy:
+    """
+        describes how acquisition loops wait for an instrument
+
+        parameters: - interval - fixed poll interval in seconds, default is None (adaptive)
+                    - min_interval - shortest adaptive poll interval in seconds, default is 1ms
+                    - max_interval - longest adaptive poll interval in seconds, default is 100ms
+                    - timeout - maximum waiting time in seconds, default is 0 (no limit)
+                    - cancel - threading.Event which aborts the wait when set, default is None
+
+        the adaptive policy sleeps through the expected acquisition time in steps of
+        at most max_interval, then polls with an exponential backoff from min_interval
+    """
+    def __init__(self, interval=None, min_interval=1e-03, max_interval=0.1, timeout=0, cancel=None):
+        # a zero interval would turn the wait into a busy loop
+        if interval is not None and interval <= 0:
+            raise error("The poll interval must be positive", "wait_policy", "device")
+        if min_interval <= 0 or max_interval <= 0:
+            raise error("The adaptive poll intervals must be positive", "wait_policy", "device")
+        if min_interval > max_interval:
+            raise error("The minimum poll interval is larger than the maximum", "wait_policy", "device")
+        if timeout < 0:
+            raise error("The timeout can't be negative", "wait_policy", "device")
+        self.interval = interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.timeout = timeout
+        self.cancel = cancel
+        return
+
+    def delays(self, expected_time=0):
+        """
+            generate the poll intervals of one wait, the generator ends when the timeout expires
+
+            parameters: - expected time until the instrument is ready in seconds, default is 0
+
+            yields:     - the time to sleep before the next poll in seconds
+        """
+        start = time.perf_counter()
+        backoff = self.min_interval
+        while True:
+            elapsed = time.perf_counter() - start
+            if self.timeout > 0 and elapsed >= self.timeout:
+                return
+
+            # choose the next poll interval
+            if self.interval is not None:
+                delay = self.interval
+            elif elapsed < expected_time:
+                delay = min(max(expected_time - elapsed, self.min_interval), self.max_interval)
+            else:
+                delay = backoff
+                backoff = min(2 * backoff, self.max_interval)
+            if self.timeout > 0:
+                delay = min(delay, self.timeout - elapsed)
+            yield delay
+
+class error_statistics:
+    """ number of SDK errors per device handle and instrument, counted only after count_errors() """
+    enabled = False
+    start = 0
+    count = {}      # (device handle, instrument): number of errors
+    reset = {}      # (device handle or None, instrument or None): time of the last reset of the matching counters
+    lock = threading.Lock()
+
+# SDK function name prefixes and the instruments they belong to (the first match is used)
+__instruments__ = [("FDwfAnalogIn", "scope"), ("FDwfAnalogOut", "wavegen"), ("FDwfAnalogIO", "analog IO"),
+                   ("FDwfDigitalIn", "logic"), ("FDwfDigitalOut", "pattern"), ("FDwfDigitalIO", "static"),
+                   ("FDwfDigitalUart", "protocol/uart"), ("FDwfDigitalSpi", "protocol/spi"), ("FDwfDigitalI2c", "protocol/i2c"),
+                   ("FDwfSpectrum", "tools"), ("FDwf", "device")]
+
+class info_cache:
+    """
+        capabilities of the devices stored on disk, so open doesn't query them again
+
+        the entries are keyed by device type, revision, configuration and WaveForms version
+    """
+    enabled = True
+    version = 2         # format of the entries, changed when the stored capabilities change
+    path = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"), "WF_SDK")
+
 class data:
     """ stores the device handle, the device name and the device data """
     handle = ctypes.c_int(0)
     name = ""
+    serial = ""
     version = ""
     class analog:
         class input:
@@ -127,6 +196,7 @@ class data:
             max_read_range = []
             set_steps = []
             read_steps = []
+            __lookup__ = {}      # (channel label, node name) -> (channel index, node index), see __node__
     class digital:
         class input:
             channel_count = 0
@@ -137,108 +207,254 @@ class data:
 
 """-----------------------------------------------------------------------"""
 
-def open(device=None, config=0):
+# every opened device gets an independent copy of this empty device data
+__empty__ = data
+
+class device_info:
+    """ describes a connected device """
+    def __init__(self, index, serial, name, opened):
+        self.index = index      # enumeration index
+        self.serial = serial    # serial number
+        self.name = name        # device name, empty if unknown
+        self.opened = opened    # True if the device is used by a process
+        return
+    def __repr__(self):
+        return "device_info(" + str(self.index) + ", " + repr(self.serial) + ", " + repr(self.name) + ", " + str(self.opened) + ")"
+
+# device names and device IDs
+__device_names__ = [("Analog Discovery", constants.devidDiscovery), ("Analog Discovery 2", constants.devidDiscovery2),
+                    ("Analog Discovery Studio", constants.devidDiscovery2), ("Digital Discovery", constants.devidDDiscovery),
+                    ("Analog Discovery Pro 3X50", constants.devidADP3X50), ("Analog Discovery Pro 5250", constants.devidADP5250)]
+
+"""-----------------------------------------------------------------------"""
+
+def open(device=None, config=0, serial=None, refresh=False):
     """
         open a specific device
 
+        the device capabilities are loaded from the cache (see info_cache) if the
+        same device type was opened before with the same WaveForms version
+
         parameters: - device type: None (first device), "Analog Discovery", "Analog Discovery 2", "Analog Discovery Studio", "Digital Discovery", "Analog Discovery Pro 3X50", "Analog Discovery Pro 5250"
                     - configuration: 0 = auto, default = auto
+                    - serial number: None means any device, default is None
+                    - refresh: True queries the capabilities and updates the cache, default is False
 
         returns:    - device data
     """
-    device_names = [("Analog Discovery", constants.devidDiscovery), ("Analog Discovery 2", constants.devidDiscovery2),
-                    ("Analog Discovery Studio", constants.devidDiscovery2), ("Digital Discovery", constants.devidDDiscovery),
-                    ("Analog Discovery Pro 3X50", constants.devidADP3X50), ("Analog Discovery Pro 5250", constants.devidADP5250)]
-    
-    # decode device names
-    device_type = constants.enumfilterAll
-    for pair in device_names:
-        if pair[0] == device:
-            device_type = pair[1]
-            break
-
     # count devices
-    device_count = ctypes.c_int()
-    dwf.FDwfEnum(device_type, ctypes.byref(device_count))
+    device_count = __enum__(device)
 
     # check for connected devices
-    if device_count.value <= 0:
-        if device_type.value == 0:
+    if device_count <= 0:
+        if device is None:
             raise error("There are no connected devices", "open", "device")
         else:
             raise error("Error: There is no " + device + " connected", "open", "device")
 
-    # this is the device handle - it will be used by all functions to "address" the connected device
-    device_handle = ctypes.c_int(0)
+    # connect to the first available device (with the requested serial number)
+    device_data = None
+    for index in range(device_count):
+        if serial is not None and __serial__(index) != serial:
+            continue
+        device_data = __open__(index, config, refresh)
+        if device_data is not None:
+            break
 
-    # connect to the first available device
-    index = 0
-    while device_handle.value == 0 and index < device_count.value:
-        dwf.FDwfDeviceConfigOpen(ctypes.c_int(index), ctypes.c_int(config), ctypes.byref(device_handle))
-        index += 1  # increment the index and try again if the device is busy
-
-    # check connected device type
-    device_name = ""
-    if device_handle.value != 0:
-        device_id = ctypes.c_int()
-        device_rev = ctypes.c_int()
-        dwf.FDwfEnumDeviceType(ctypes.c_int(index - 1), ctypes.byref(device_id), ctypes.byref(device_rev))
-
-        # decode device id
-        for pair in device_names:
-            if pair[1].value == device_id.value:
-                device_name = pair[0]
-                break
-
-    # check for errors
-    # if the device handle is empty after a connection attempt
-    if device_handle == constants.hdwfNone:
-        # check for errors
-        err_nr = ctypes.c_int() # variable for error number
-        dwf.FDwfGetLastError(ctypes.byref(err_nr));  # get error number
-        # if there is an error
-        if err_nr != constants.dwfercNoErc:
-            # check the error message
-            check_error()
+    # check for errors if no device could be opened
+    if device_data is None:
+        err_nr = ctypes.c_int()                           # variable for the error number
+        dwf.FDwfGetLastError(ctypes.byref(err_nr))        # get the error number
+        err_msg = ctypes.create_string_buffer(512)        # variable for the error message
+        dwf.FDwfGetLastErrorMsg(err_msg)                  # get the error message
+        err_msg = err_msg.value.decode("ascii").strip()
+        if err_msg == "":
+            if serial is None:
+                err_msg = "Every connected device is in use"
+            else:
+                err_msg = "The device " + serial + " is not connected, or it is in use"
+        raise error(err_msg, "open", "device", err_nr.value)
 
     global data
-    data.handle = device_handle
-    data.name = device_name
-    data = __get_info__(data)
+    data = device_data
     return data
 
 """-----------------------------------------------------------------------"""
 
-def check_error():
+def list_devices(device=None):
+    """
+        list the connected devices
+
+        parameters: - device type: None (every device), or a device name, see open()
+
+        returns:    - list of device_info objects: index, serial, name, opened
+    """
+    devices = []
+    for index in range(__enum__(device)):
+        opened = ctypes.c_int()
+        if dwf.FDwfEnumDeviceIsOpened(index, ctypes.byref(opened)) == 0:
+            check_error()
+        devices.append(device_info(index, __serial__(index), __device_name__(index), opened.value != 0))
+    return devices
+
+"""-----------------------------------------------------------------------"""
+
+def check_error(function=None, handle=None):
     """
         check for errors
+
+        the error contains the SDK error code, the name of the SDK function which failed
+        and the instrument this function belongs to
+
+        parameters: - the name of the failed SDK function, default is None (the last
+                      function which returned 0, the status functions are not recorded)
+                    - the device handle of the failed call, used only with the function name
     """
+    err_func, err_handle = last_failed()              # the SDK function which returned 0
+    if function is not None:
+        err_func, err_handle = function, handle
+    err_nr = ctypes.c_int()                           # variable for the error number
+    dwf.FDwfGetLastError(ctypes.byref(err_nr))        # get the error number
+    if err_nr.value == constants.dwfercNoErc.value:
+        return
     err_msg = ctypes.create_string_buffer(512)        # variable for the error message
     dwf.FDwfGetLastErrorMsg(err_msg)                  # get the error message
-    err_msg = err_msg.value.decode("ascii")           # format the message
-    if err_msg != "":
-        err_func = inspect.stack()[1].function        # get caller function
-        err_inst = inspect.stack()[1].filename        # get caller file name
-        # delete the extension
-        err_inst = err_inst.split('.')[0]
-        # delete the path
-        path_list = err_inst.split('/')
-        err_inst = path_list[-1]
-        path_list = err_inst.split('\\')
-        err_inst = path_list[-1]
-        raise error(err_msg, err_func, err_inst)
+    err_msg = err_msg.value.decode("ascii").strip()   # format the message
+    if err_func == "":
+        err_func = "unknown"
+    # find the instrument from the function name
+    err_inst = "device"
+    for prefix, instrument in __instruments__:
+        if err_func.startswith(prefix):
+            err_inst = instrument
+            break
+    # count the error if required
+    if error_statistics.enabled:
+        key = (getattr(err_handle, "value", err_handle), err_inst)
+        with error_statistics.lock:
+            error_statistics.count[key] = error_statistics.count.get(key, 0) + 1
+    raise error(err_msg, err_func, err_inst, err_nr.value)
+
+"""-----------------------------------------------------------------------"""
+
+def count_errors(enable=True, instrument=None, device_data=None):
+    """
+        start (and reset), or stop counting SDK errors per device and instrument
+
+        parameters: - enable - True to start counting from zero, False to stop, default is True
+                    - instrument name, only its counters are reset, default is None (every instrument)
+                    - device data, only its counters are reset, default is None (every device)
+    """
+    with error_statistics.lock:
+        error_statistics.enabled = enable
+        if not enable:
+            return
+        now = time.perf_counter()
+        if instrument is None and device_data is None:
+            error_statistics.count = {}
+            error_statistics.reset = {}
+            error_statistics.start = now
+            return
+
+        # reset the matching counters, the others keep counting
+        handle = None if device_data is None else device_data.handle.value
+        for key in list(error_statistics.count):
+            if __matches__(key, handle, instrument):
+                del error_statistics.count[key]
+        error_statistics.reset[(handle, instrument)] = now
     return
 
 """-----------------------------------------------------------------------"""
 
+def error_rate(instrument=None, device_data=None):
+    """
+        get the number of SDK errors and the error rate since the counters were reset with count_errors()
+
+        parameters: - instrument name (scope, wavegen, analog IO, logic, pattern, static,
+                      protocol/uart, protocol/spi, protocol/i2c, tools, device), None means every instrument
+                    - device data, None means every device (and the errors without a device)
+
+        returns:    - the number of errors
+                    - the number of errors per second (the sum of the rates of the matching counters)
+    """
+    now = time.perf_counter()
+    handle = None if device_data is None else device_data.handle.value
+    count = 0
+    rate = 0
+    with error_statistics.lock:
+        for key, value in error_statistics.count.items():
+            if __matches__(key, handle, instrument):
+                elapsed = now - __reset_time__(key)
+                count += value
+                rate += value / elapsed if elapsed > 0 else 0
+    if not error_statistics.enabled:
+        return count, 0
+    return count, rate
+
+"""-----------------------------------------------------------------------"""
+
+def __matches__(key, handle, instrument):
+    """
+        check if an error counter belongs to a device handle and an instrument, None matches everything
+    """
+    return (handle is None or key[0] == handle) and (instrument is None or key[1] == instrument)
+
+"""-----------------------------------------------------------------------"""
+
+def __reset_time__(key):
+    """
+        the time an error counter was last reset
+    """
+    start = error_statistics.start
+    for (handle, instrument), reset in error_statistics.reset.items():
+        if __matches__(key, handle, instrument):
+            start = max(start, reset)
+    return start
+
+"""-----------------------------------------------------------------------"""
+
+def wait(ready, policy, expected_time=0, function="wait", instrument="device"):
+    """
+        wait until an instrument is ready without keeping the CPU busy
+
+        parameters: - ready - function returning True when the instrument is ready
+                    - policy - wait_policy instance
+                    - expected time until the instrument is ready in seconds, default is 0
+                    - function and instrument names used in error messages
+    """
+    delays = policy.delays(expected_time)
+    while not ready():
+        delay = next(delays, None)
+        if delay is None:
+            raise error("Timeout after " + str(policy.timeout) + "s", function, instrument)
+        if not sleep(policy, delay):
+            raise error("Cancelled", function, instrument)
+    return
+
+"""-----------------------------------------------------------------------"""
+
+def sleep(policy, delay):
+    """
+        sleep for the given time in seconds, or until the wait is cancelled
+
+        returns:    - False if the wait was cancelled, True otherwise
+    """
+    if policy.cancel is not None:
+        return not policy.cancel.wait(max(delay, 0))
+    if delay > 0:
+        time.sleep(delay)
+    return True
+
+"""-----------------------------------------------------------------------"""
+
 def close(device_data):
     """
         close a specific device
     """
-    if device_data.handle != 0:
+    if device_data.handle.value != 0:
         dwf.FDwfDeviceClose(device_data.handle)
-    data.handle = ctypes.c_int(0)
-    data.name = ""
+    device_data.handle = ctypes.c_int(0)
+    device_data.name = ""
     return
 
 """-----------------------------------------------------------------------"""
@@ -247,30 +463,17 @@ def temperature(device_data):
     """
         return the board temperature
     """
-    channel = -1
-    node = -1
-    # find the system monitor
-    for channel_index in range(device_data.analog.IO.channel_count):
-        if device_data.analog.IO.channel_label[channel_index] == "System":
-            channel = channel_index
-            break
-    if channel < 0:
-        return 0
-    
-    # find the temperature node
-    for node_index in range(device_data.analog.IO.node_count[channel]):
-        if device_data.analog.IO.node_name[channel][node_index] == "Temp":
-            node = node_index
-            break
+    # find the temperature node of the system monitor
+    channel, node = __node__(device_data, "System", "Temp")
     if node < 0:
         return 0
     
     # read the temperature
     if dwf.FDwfAnalogIOStatus(device_data.handle) == 0:
-        check_error()
+        check_error("FDwfAnalogIOStatus", device_data.handle)
     temperature = ctypes.c_double()
-    if dwf.FDwfAnalogIOChannelNodeStatus(device_data.handle, ctypes.c_int(channel), ctypes.c_int(node), ctypes.byref(temperature)) == 0:
-        check_error()
+    if dwf.FDwfAnalogIOChannelNodeStatus(device_data.handle, channel, node, ctypes.byref(temperature)) == 0:
+        check_error("FDwfAnalogIOChannelNodeStatus", device_data.handle)
     return temperature.value
 
 """-----------------------------------------------------------------------"""
@@ -279,12 +482,6 @@ def __get_info__(device_data):
     """
         get and return device information
     """
-    # check WaveForms version
-    version = ctypes.create_string_buffer(16)
-    if dwf.FDwfGetVersion(version) == 0:
-        check_error()
-    device_data.version = str(version.value)[2:-1]
-
     # define temporal variables
     temp1 = ctypes.c_int()
     temp2 = ctypes.c_int()
@@ -296,7 +493,7 @@ def __get_info__(device_data):
         check_error()
     device_data.analog.input.channel_count = temp1.value
     # buffer size
-    if dwf.FDwfAnalogInBufferSizeInfo(device_data.handle, 0, ctypes.byref(temp1)) == 0:
+    if dwf.FDwfAnalogInBufferSizeInfo(device_data.handle, None, ctypes.byref(temp1)) == 0:
         check_error()
     device_data.analog.input.max_buffer_size = temp1.value
     # ADC resolution
@@ -327,13 +524,15 @@ def __get_info__(device_data):
     for channel_index in range(device_data.analog.output.channel_count):
         # check node types and node count
         temp1 = ctypes.c_int()
-        if dwf.FDwfAnalogOutNodeInfo(device_data.handle, ctypes.c_int(channel_index), ctypes.byref(temp1)) == 0:
+        if dwf.FDwfAnalogOutNodeInfo(device_data.handle, channel_index, ctypes.byref(temp1)) == 0:
             check_error()
         templist = []
+        node_ids = []       # the SDK node ids of the channel, the lists below are in the same order
         for node_index in range(3):
             if ((1 << node_index) & int(temp1.value)) == 0:
                 continue
-            elif node_index == constants.AnalogOutNodeCarrier.value:
+            node_ids.append(node_index)
+            if node_index == constants.AnalogOutNodeCarrier.value:
                 templist.append("carrier")
             elif node_index == constants.AnalogOutNodeFM.value:
                 templist.append("FM")
@@ -343,8 +542,8 @@ def __get_info__(device_data):
         device_data.analog.output.node_count.append(len(templist))
         # buffer size
         templist = []
-        for node_index in range(device_data.analog.output.node_count[channel_index]):
-            if dwf.FDwfAnalogOutNodeDataInfo(device_data.handle, ctypes.c_int(channel_index), ctypes.c_int(node_index), 0, ctypes.byref(temp1)) == 0:
+        for node_index in node_ids:
+            if dwf.FDwfAnalogOutNodeDataInfo(device_data.handle, channel_index, node_index, None, ctypes.byref(temp1)) == 0:
                 check_error()
             templist.append(temp1.value)
         device_data.analog.output.max_buffer_size.append(templist)
@@ -353,8 +552,8 @@ def __get_info__(device_data):
         templist2 = []
         temp1 = ctypes.c_double()
         temp2 = ctypes.c_double()
-        for node_index in range(device_data.analog.output.node_count[channel_index]):
-            if dwf.FDwfAnalogOutNodeAmplitudeInfo(device_data.handle, ctypes.c_int(channel_index), ctypes.c_int(node_index), ctypes.byref(temp1), ctypes.byref(temp2)) == 0:
+        for node_index in node_ids:
+            if dwf.FDwfAnalogOutNodeAmplitudeInfo(device_data.handle, channel_index, node_index, ctypes.byref(temp1), ctypes.byref(temp2)) == 0:
                 check_error()
             templist1.append(temp1.value)
             templist2.append(temp2.value)
@@ -363,8 +562,8 @@ def __get_info__(device_data):
         # offset information
         templist1 = []
         templist2 = []
-        for node_index in range(device_data.analog.output.node_count[channel_index]):
-            if dwf.FDwfAnalogOutNodeOffsetInfo(device_data.handle, ctypes.c_int(channel_index), ctypes.c_int(node_index), ctypes.byref(temp1), ctypes.byref(temp2)) == 0:
+        for node_index in node_ids:
+            if dwf.FDwfAnalogOutNodeOffsetInfo(device_data.handle, channel_index, node_index, ctypes.byref(temp1), ctypes.byref(temp2)) == 0:
                 check_error()
             templist1.append(temp1.value)
             templist2.append(temp2.value)
@@ -373,8 +572,8 @@ def __get_info__(device_data):
         # frequency information
         templist1 = []
         templist2 = []
-        for node_index in range(device_data.analog.output.node_count[channel_index]):
-            if dwf.FDwfAnalogOutNodeFrequencyInfo(device_data.handle, ctypes.c_int(channel_index), ctypes.c_int(node_index), ctypes.byref(temp1), ctypes.byref(temp2)) == 0:
+        for node_index in node_ids:
+            if dwf.FDwfAnalogOutNodeFrequencyInfo(device_data.handle, channel_index, node_index, ctypes.byref(temp1), ctypes.byref(temp2)) == 0:
                 check_error()
             templist1.append(temp1.value)
             templist2.append(temp2.value)
@@ -391,13 +590,13 @@ def __get_info__(device_data):
         # channel names and labels
         temp1 = ctypes.create_string_buffer(256)
         temp2 = ctypes.create_string_buffer(256)
-        if dwf.FDwfAnalogIOChannelName(device_data.handle, ctypes.c_int(channel_index), temp1, temp2) == 0:
+        if dwf.FDwfAnalogIOChannelName(device_data.handle, channel_index, temp1, temp2) == 0:
             check_error()
         device_data.analog.IO.channel_name.append(str(temp1.value)[2:-1])
         device_data.analog.IO.channel_label.append(str(temp2.value)[2:-1])
         # check node count
         temp1 = ctypes.c_int()
-        if dwf.FDwfAnalogIOChannelInfo(device_data.handle, ctypes.c_int(channel_index), ctypes.byref(temp1)) == 0:
+        if dwf.FDwfAnalogIOChannelInfo(device_data.handle, channel_index, ctypes.byref(temp1)) == 0:
             check_error()
         device_data.analog.IO.node_count.append(temp1.value)
         # node names and units
@@ -406,7 +605,7 @@ def __get_info__(device_data):
         for node_index in range(device_data.analog.IO.node_count[channel_index]):
             temp1 = ctypes.create_string_buffer(256)
             temp2 = ctypes.create_string_buffer(256)
-            if dwf.FDwfAnalogIOChannelNodeName(device_data.handle, ctypes.c_int(channel_index), ctypes.c_int(node_index), temp1, temp2) == 0:
+            if dwf.FDwfAnalogIOChannelNodeName(device_data.handle, channel_index, node_index, temp1, temp2) == 0:
                 check_error()
             templist1.append(str(temp1.value)[2:-1])
             templist2.append(str(temp2.value)[2:-1])
@@ -420,7 +619,7 @@ def __get_info__(device_data):
         temp2 = ctypes.c_double()
         temp3 = ctypes.c_int()
         for node_index in range(device_data.analog.IO.node_count[channel_index]):
-            if dwf.FDwfAnalogIOChannelNodeSetInfo(device_data.handle, ctypes.c_int(channel_index), ctypes.c_int(node_index), ctypes.byref(temp1), ctypes.byref(temp2), ctypes.byref(temp3)) == 0:
+            if dwf.FDwfAnalogIOChannelNodeSetInfo(device_data.handle, channel_index, node_index, ctypes.byref(temp1), ctypes.byref(temp2), ctypes.byref(temp3)) == 0:
                 check_error()
             templist1.append(temp1.value)
             templist2.append(temp2.value)
@@ -433,8 +632,8 @@ def __get_info__(device_data):
         templist2 = []
         templist3 = []
         for node_index in range(device_data.analog.IO.node_count[channel_index]):
-            if dwf.FDwfAnalogIOChannelNodeStatusInfo(device_data.handle, ctypes.c_int(channel_index), ctypes.c_int(node_index), ctypes.byref(temp1), ctypes.byref(temp2), ctypes.byref(temp3)) == 0:
-                check_error()
+            if dwf.FDwfAnalogIOChannelNodeStatusInfo(device_data.handle, channel_index, node_index, ctypes.byref(temp1), ctypes.byref(temp2), ctypes.byref(temp3)) == 0:
+                check_error("FDwfAnalogIOChannelNodeStatusInfo", device_data.handle)
             templist1.append(temp1.value)
             templist2.append(temp2.value)
             templist3.append(temp3.value)
@@ -459,8 +658,255 @@ def __get_info__(device_data):
         check_error()
     device_data.digital.output.channel_count = temp1.value
     # buffer size
-    if dwf.FDwfDigitalOutDataInfo(device_data.handle, ctypes.c_int(0), ctypes.byref(temp1)) == 0:
+    temp1 = ctypes.c_uint()
+    if dwf.FDwfDigitalOutDataInfo(device_data.handle, 0, ctypes.byref(temp1)) == 0:
         check_error()
     device_data.digital.output.max_buffer_size = temp1.value
 
     return device_data
+
+"""-----------------------------------------------------------------------"""
+
+def __enum__(device=None):
+    """
+        enumerate the connected devices
+
+        parameters: - device type: None (every device), or a device name, see open()
+
+        returns:    - the number of devices
+    """
+    # decode device names
+    device_type = constants.enumfilterAll
+    for pair in __device_names__:
+        if pair[0] == device:
+            device_type = pair[1]
+            break
+
+    # count devices
+    device_count = ctypes.c_int()
+    dwf.FDwfEnum(device_type, ctypes.byref(device_count))
+    return device_count.value
+
+"""-----------------------------------------------------------------------"""
+
+def __serial__(index):
+    """
+        returns:    - the serial number of an enumerated device
+    """
+    serial = ctypes.create_string_buffer(32)
+    if dwf.FDwfEnumSN(index, serial) == 0:
+        check_error()
+    return serial.value.decode("ascii")
+
+"""-----------------------------------------------------------------------"""
+
+def __device_type__(index):
+    """
+        returns:    - the device ID and the revision of an enumerated device
+    """
+    device_id = ctypes.c_int()
+    device_rev = ctypes.c_int()
+    if dwf.FDwfEnumDeviceType(index, ctypes.byref(device_id), ctypes.byref(device_rev)) == 0:
+        check_error()
+    return device_id.value, device_rev.value
+
+"""-----------------------------------------------------------------------"""
+
+def __device_name__(index):
+    """
+        returns:    - the name of an enumerated device, or an empty string if it is unknown
+    """
+    device_id = __device_type__(index)[0]
+
+    # decode device id
+    for pair in __device_names__:
+        if pair[1].value == device_id:
+            return pair[0]
+    return ""
+
+"""-----------------------------------------------------------------------"""
+
+def __version__():
+    """
+        returns:    - the version of WaveForms
+    """
+    version = ctypes.create_string_buffer(16)
+    if dwf.FDwfGetVersion(version) == 0:
+        check_error()
+    return str(version.value)[2:-1]
+
+"""-----------------------------------------------------------------------"""
+
+def __open__(index, config=0, refresh=False):
+    """
+        open an enumerated device
+
+        parameters: - the enumeration index of the device
+                    - configuration: 0 = auto
+                    - refresh: True ignores the capability cache, default is False
+
+        returns:    - new device data, or None if the device can't be opened (it is in use)
+    """
+    # read the enumerated information, it is also the key of the capability cache
+    device_id, device_rev = __device_type__(index)
+    device_name = __device_name__(index)
+    device_serial = __serial__(index)
+
+    # this is the device handle - it will be used by all functions to "address" the connected device
+    device_handle = ctypes.c_int(0)
+    dwf.FDwfDeviceConfigOpen(index, config, ctypes.byref(device_handle))
+    if device_handle.value == 0:
+        return None
+
+    device_data = __new_data__(__empty__)
+    device_data.handle = device_handle
+    device_data.name = device_name
+    device_data.serial = device_serial
+    device_data.version = __version__()
+
+    # load the capabilities from the cache, or query and store them,
+    # recorded and replayed sessions always query them, so the calls don't depend on the cache
+    path = os.path.join(info_cache.path, str(device_id) + "-" + str(device_rev) + "-" + str(config) + "-" + device_data.version + "-v" + str(info_cache.version) + ".json")
+    cached = info_cache.enabled and not tracing()
+    if not cached or refresh or not __load_info__(device_data, path):
+        try:
+            __get_info__(device_data)
+        except:
+            # don't leave the device open if it can't be used
+            close(device_data)
+            raise
+        if cached:
+            __save_info__(device_data, path)
+    __build_index__(device_data)
+    return device_data
+
+"""-----------------------------------------------------------------------"""
+
+def __build_index__(device_data):
+    """
+        map the labels and node names of the AnalogIO channels to their indices
+
+        the first channel with a label and the first node with a name is used,
+        (label, None) maps to the channel with a node index of -1
+    """
+    analog_io = device_data.analog.IO
+    index = {}
+    for channel_index in range(analog_io.channel_count):
+        label = analog_io.channel_label[channel_index]
+        index.setdefault((label, None), (channel_index, -1))
+        for node_index in range(analog_io.node_count[channel_index]):
+            index.setdefault((label, analog_io.node_name[channel_index][node_index]), (channel_index, node_index))
+    analog_io.__lookup__ = index
+    return
+
+"""-----------------------------------------------------------------------"""
+
+def __node__(device_data, labels, node=None):
+    """
+        find an AnalogIO channel and one of its nodes without searching
+
+        parameters: - device data
+                    - channel label, or a tuple of labels which are tried in order
+                    - node name, default is None (only the channel)
+
+        returns:    - the channel index and the node index, -1 for the missing ones
+    """
+    if isinstance(labels, str):
+        labels = (labels,)
+    index = device_data.analog.IO.__lookup__
+    for label in labels:
+        if (label, node) in index:
+            return index[(label, node)]
+    # the channel can exist without the node
+    for label in labels:
+        if (label, None) in index:
+            return index[(label, None)][0], -1
+    return -1, -1
+
+"""-----------------------------------------------------------------------"""
+
+def __load_info__(device_data, path):
+    """
+        load the device capabilities from a cache file
+
+        returns:    - True on success, False if the file is missing, or it doesn't match the device data
+    """
+    try:
+        with builtins.open(path, "r") as file:
+            info = json.load(file)
+        __set_tree__(device_data.analog, info["analog"])
+        __set_tree__(device_data.digital, info["digital"])
+    except (OSError, ValueError, KeyError, TypeError):
+        # rebuild the device data from scratch, the copy may be incomplete
+        device_data.analog = __new_data__(__empty__.analog)
+        device_data.digital = __new_data__(__empty__.digital)
+        return False
+    return True
+
+"""-----------------------------------------------------------------------"""
+
+def __save_info__(device_data, path):
+    """
+        save the device capabilities to a cache file, a read-only cache is ignored
+    """
+    info = {"analog": __get_tree__(device_data.analog), "digital": __get_tree__(device_data.digital)}
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # write a temporary file first, so other processes never read a partial entry
+        temporary = path + "." + str(os.getpid()) + ".tmp"
+        with builtins.open(temporary, "w") as file:
+            json.dump(info, file)
+        os.replace(temporary, path)
+    except OSError:
+        pass
+    return
+
+"""-----------------------------------------------------------------------"""
+
+def __get_tree__(node):
+    """
+        convert a nested data class into a dictionary
+    """
+    tree = {}
+    for name, value in vars(node).items():
+        if name.startswith("__"):
+            continue
+        tree[name] = __get_tree__(value) if isinstance(value, type) else value
+    return tree
+
+"""-----------------------------------------------------------------------"""
+
+def __set_tree__(node, tree):
+    """
+        fill a nested data class from a dictionary, every attribute must be present
+    """
+    for name, value in list(vars(node).items()):
+        if name.startswith("__"):
+            continue
+        if isinstance(value, type):
+            __set_tree__(value, tree[name])
+        elif type(tree[name]) is not type(value) and not (isinstance(value, (int, float)) and isinstance(tree[name], (int, float))):
+            raise TypeError(name)
+        else:
+            setattr(node, name, tree[name])
+    return
+
+"""-----------------------------------------------------------------------"""
+
+def __new_data__(template):
+    """
+        create an independent copy of a (nested) data class, the lists and dictionaries are copied
+    """
+    attributes = {}
+    for name, value in vars(template).items():
+        if name in ("__module__", "__qualname__", "__dict__", "__weakref__", "__doc__"):
+            continue
+        if isinstance(value, type):
+            value = __new_data__(value)
+        elif isinstance(value, list):
+            value = list(value)
+        elif isinstance(value, dict):
+            value = dict(value)
+        attributes[name] = value
+    attributes["__doc__"] = template.__doc__
+    return type(template.__name__, (), attributes)
@@ -1,28 +1,9 @@
-""" DIGITAL MULTIMETER CONTROL FUNCTIONS: open, measure, close """
+""" DIGITAL MULTIMETER CONTROL FUNCTIONS: open, measure, close, instrument """
 
 import ctypes                     # import the C compatible data types
-from sys import platform, path    # this is needed to check the OS type and get the PATH
-from os import sep                # OS specific file path separators
-
-# load the dynamic library, get constants path (the path is OS specific)
-if platform.startswith("win"):
-    # on Windows
-    dwf = ctypes.cdll.dwf
-    constants_path = "C:" + sep + "Program Files (x86)" + sep + "Digilent" + sep + "WaveFormsSDK" + sep + "samples" + sep + "py"
-elif platform.startswith("darwin"):
-    # on macOS
-    lib_path = sep + "Library" + sep + "Frameworks" + sep + "dwf.framework" + sep + "dwf"
-    dwf = ctypes.cdll.LoadLibrary(lib_path)
-    constants_path = sep + "Applications" + sep + "WaveForms.app" + sep + "Contents" + sep + "Resources" + sep + "SDK" + sep + "samples" + sep + "py"
-else:
-    # on Linux
-    dwf = ctypes.cdll.LoadLibrary("libdwf.so")
-    constants_path = sep + "usr" + sep + "share" + sep + "digilent" + sep + "waveforms" + sep + "samples" + sep + "py"
-
-# import constants
-path.append(constants_path)
-import dwfconstants as constants
+from WF_SDK.library import dwf, constants
 from WF_SDK.device import check_error
+from WF_SDK import device
 
 """-----------------------------------------------------------------------"""
 
@@ -52,38 +33,16 @@ class data:
         __raw__ = -1
         __input__ = -1
 
+# the settings of new instruments, the module functions change data
+__defaults__ = device.__new_data__(data)
+
 """-----------------------------------------------------------------------"""
 
 def open(device_data):
     """
         initialize the digital multimeter
     """
-    # find channel
-    for channel_index in range(device_data.analog.IO.channel_count):
-        if device_data.analog.IO.channel_label[channel_index] == "DMM":
-            data.__channel__ = channel_index
-            break
-    
-    # find nodes
-    if data.__channel__ >= 0:
-        for node_index in range(device_data.analog.IO.node_count[data.__channel__]):
-            if device_data.analog.IO.node_name[data.__channel__][node_index] == "Enable":
-                data.__nodes__.__enable__ = node_index
-            elif device_data.analog.IO.node_name[data.__channel__][node_index] == "Mode":
-                data.__nodes__.__mode__ = node_index
-            elif device_data.analog.IO.node_name[data.__channel__][node_index] == "Range":
-                data.__nodes__.__range__ = node_index
-            elif device_data.analog.IO.node_name[data.__channel__][node_index] == "Meas":
-                data.__nodes__.__meas__ = node_index
-            elif device_data.analog.IO.node_name[data.__channel__][node_index] == "Raw":
-                data.__nodes__.__raw__ = node_index
-            elif device_data.analog.IO.node_name[data.__channel__][node_index] == "Input":
-                data.__nodes__.__input__ = node_index
-
-    # enable the DMM
-    if data.__channel__ >= 0 and data.__nodes__.__enable__ >= 0:
-        if dwf.FDwfAnalogIOChannelNodeSet(device_data.handle, ctypes.c_int(data.__channel__), ctypes.c_int(data.__nodes__.__enable__), ctypes.c_double(1.0)) == 0:
-            check_error()
+    instrument(device_data, data).open()
     return
 
 """-----------------------------------------------------------------------"""
@@ -99,39 +58,7 @@ def measure(device_data, mode, range=0, high_impedance=False):
         
         returns:    - the measured value in V/A/Ω/°C, or None on error
     """
-    if data.__channel__ >= 0:
-        # set input impedance
-        if data.__nodes__.__input__ >= 0:
-            if high_impedance:
-                if dwf.FDwfAnalogIOChannelNodeSet(device_data.handle, ctypes.c_int(data.__channel__), ctypes.c_int(data.__nodes__.__input__), ctypes.c_double(1)) == 0:
-                    check_error()
-            else:
-                if dwf.FDwfAnalogIOChannelNodeSet(device_data.handle, ctypes.c_int(data.__channel__), ctypes.c_int(data.__nodes__.__input__), ctypes.c_double(0)) == 0:
-                    check_error()
-
-        # set mode
-        if data.__nodes__.__mode__ >= 0:
-            if dwf.FDwfAnalogIOChannelNodeSet(device_data.handle, ctypes.c_int(data.__channel__), ctypes.c_int(data.__nodes__.__mode__), mode) == 0:
-                check_error()
-
-        # set range
-        if data.__nodes__.__range__ >= 0:
-            if dwf.FDwfAnalogIOChannelNodeSet(device_data.handle, ctypes.c_int(data.__channel__), ctypes.c_int(data.__nodes__.__range__), range) == 0:
-                check_error()
-
-        # fetch analog IO status
-        if dwf.FDwfAnalogIOStatus(device_data.handle) == 0:
-            # signal error
-            check_error()
-            return None
-        
-        # get reading
-        if data.__nodes__.__meas__ >= 0:
-            measurement = ctypes.c_double()
-            if dwf.FDwfAnalogIOChannelNodeSet(device_data.handle, ctypes.c_int(data.__channel__), ctypes.c_int(data.__nodes__.__meas__), ctypes.byref(measurement)) == 0:
-                check_error()
-            return measurement.value
-    return None
+    return instrument(device_data, data).measure(mode, range, high_impedance)
 
 """-----------------------------------------------------------------------"""
 
@@ -139,11 +66,103 @@ def close(device_data):
     """
         reset the instrument
     """
-    # disable the DMM
-    if data.__channel__ >= 0 and data.__nodes__.__enable__ >= 0:
-        if dwf.FDwfAnalogIOChannelNodeSet(device_data.handle, ctypes.c_int(data.__channel__), ctypes.c_int(data.__nodes__.__enable__), ctypes.c_double(0)) == 0:
-            check_error()
-    # reset the instrument
-    if dwf.FDwfAnalogIOReset(device_data.handle) == 0:
-        check_error()
+    instrument(device_data, data).close()
     return
+
+"""-----------------------------------------------------------------------"""
+
+class instrument:
+    """
+        digital multimeter of one device with its own channel and node indices
+
+        the module functions share the indices in data, while every instrument
+        keeps a separate copy; the methods are the module functions without
+        the device data
+
+        parameters: - device data
+                    - settings, default is None (a new copy of the default settings)
+    """
+    def __init__(self, device_data, settings=None):
+        self.device_data = device_data
+        if settings is None:
+            settings = device.__new_data__(__defaults__)
+        self.data = settings
+        return
+
+    def open(self):
+        """
+            initialize the digital multimeter
+        """
+        nodes = self.data.__nodes__
+
+        # find the channel and the nodes
+        self.data.__channel__ = device.__node__(self.device_data, "DMM")[0]
+        nodes.__enable__ = device.__node__(self.device_data, "DMM", "Enable")[1]
+        nodes.__mode__ = device.__node__(self.device_data, "DMM", "Mode")[1]
+        nodes.__range__ = device.__node__(self.device_data, "DMM", "Range")[1]
+        nodes.__meas__ = device.__node__(self.device_data, "DMM", "Meas")[1]
+        nodes.__raw__ = device.__node__(self.device_data, "DMM", "Raw")[1]
+        nodes.__input__ = device.__node__(self.device_data, "DMM", "Input")[1]
+        channel = self.data.__channel__
+
+        # enable the DMM
+        if channel >= 0 and nodes.__enable__ >= 0:
+            if dwf.FDwfAnalogIOChannelNodeSet(self.device_data.handle, channel, nodes.__enable__, 1.0) == 0:
+                check_error()
+        return
+
+    def measure(self, mode, range=0, high_impedance=False):
+        """
+            measure a voltage/current/resistance/continuity/temperature, see measure
+        """
+        handle = self.device_data.handle
+        channel = self.data.__channel__
+        nodes = self.data.__nodes__
+        if channel >= 0:
+            # set input impedance
+            if nodes.__input__ >= 0:
+                if high_impedance:
+                    if dwf.FDwfAnalogIOChannelNodeSet(handle, channel, nodes.__input__, 1) == 0:
+                        check_error()
+                else:
+                    if dwf.FDwfAnalogIOChannelNodeSet(handle, channel, nodes.__input__, 0) == 0:
+                        check_error()
+
+            # set mode
+            if nodes.__mode__ >= 0:
+                if dwf.FDwfAnalogIOChannelNodeSet(handle, channel, nodes.__mode__, mode) == 0:
+                    check_error()
+
+            # set range
+            if nodes.__range__ >= 0:
+                if dwf.FDwfAnalogIOChannelNodeSet(handle, channel, nodes.__range__, range) == 0:
+                    check_error()
+
+            # fetch analog IO status
+            if dwf.FDwfAnalogIOStatus(handle) == 0:
+                # signal error
+                check_error("FDwfAnalogIOStatus", handle)
+                return None
+
+            # get reading
+            if nodes.__meas__ >= 0:
+                measurement = ctypes.c_double()
+                if dwf.FDwfAnalogIOChannelNodeStatus(handle, channel, nodes.__meas__, ctypes.byref(measurement)) == 0:
+                    check_error("FDwfAnalogIOChannelNodeStatus", handle)
+                return measurement.value
+        return None
+
+    def close(self):
+        """
+            reset the instrument
+        """
+        handle = self.device_data.handle
+
+        # disable the DMM
+        if self.data.__channel__ >= 0 and self.data.__nodes__.__enable__ >= 0:
+            if dwf.FDwfAnalogIOChannelNodeSet(handle, self.data.__channel__, self.data.__nodes__.__enable__, 0) == 0:
+                check_error()
+        # reset the instrument
+        if dwf.FDwfAnalogIOReset(handle) == 0:
+            check_error()
+        return
@@ -0,0 +1,388 @@
+""" DYNAMIC LIBRARY: loads libdwf once and declares the prototypes of the used functions """
+
+import ctypes                     # import the C compatible data types
+import threading                  # the failed function is stored per thread
+import atexit                     # the trace file is closed at exit
+from sys import platform, path    # this is needed to check the OS type and get the PATH
+from os import sep, environ       # OS specific file path separators, backend selection
+
+"""-----------------------------------------------------------------------"""
+
+class __backend__:
+    """
+        stands for the library or the constants until the backend is loaded
+
+        the backend is loaded on the first attribute access, the attributes are
+        copied to the instance, so later accesses are plain attribute lookups
+    """
+    def __init__(self, name):
+        self.__name = name
+        return
+
+    def __getattr__(self, attribute):
+        if attribute.startswith("__"):
+            raise AttributeError(attribute)
+        value = getattr(__load__()[self.__name], attribute)
+        setattr(self, attribute, value)
+        return value
+
+# the selected backend: "libdwf" (the WaveForms SDK), "simulator" or "replay"
+backend = environ.get("WF_SDK_BACKEND", "libdwf")
+
+# the trace file which is recorded, or replayed by the "replay" backend
+trace = environ.get("WF_SDK_TRACE") or None
+
+# the loaded library and constants
+__loaded__ = {}
+__lock__ = threading.Lock()
+
+dwf = __backend__("dwf")
+constants = __backend__("constants")
+
+"""-----------------------------------------------------------------------"""
+
+# argument types used in the SDK header
+HDWF = ctypes.c_int                     # device handle
+BOOL = ctypes.c_int                     # every flag is an int, pass True/False
+ENUM = ctypes.c_int                     # ACQMODE, FILTER, TRIGTYPE, AnalogOutNode, DwfTriggerSlope, ...
+BYTE = ctypes.c_ubyte                   # TRIGSRC, FUNC and DwfState
+UINT = ctypes.c_uint                    # digital masks, dividers and counters
+INT = ctypes.c_int
+DOUBLE = ctypes.c_double
+STRING = ctypes.c_char_p                # name and message buffers (create_string_buffer)
+DATA = ctypes.c_void_p                  # raw byte buffers, numpy or ctypes arrays
+P_INT = ctypes.POINTER(ctypes.c_int)
+P_UINT = ctypes.POINTER(ctypes.c_uint)
+P_BYTE = ctypes.POINTER(ctypes.c_ubyte)
+P_DOUBLE = ctypes.POINTER(ctypes.c_double)
+P_SHORT = ctypes.POINTER(ctypes.c_short)
+
+"""-----------------------------------------------------------------------"""
+
+# function name: argument types (every function returns an int, 0 means failure)
+__prototypes__ = {
+    # system and device
+    "FDwfGetLastError": [P_INT],
+    "FDwfGetLastErrorMsg": [STRING],
+    "FDwfGetVersion": [STRING],
+    "FDwfEnum": [ENUM, P_INT],
+    "FDwfEnumDeviceType": [INT, P_INT, P_INT],
+    "FDwfEnumDeviceIsOpened": [INT, P_INT],
+    "FDwfEnumSN": [INT, STRING],
+    "FDwfDeviceOpen": [INT, P_INT],
+    "FDwfDeviceConfigOpen": [INT, INT, P_INT],
+    "FDwfDeviceClose": [HDWF],
+
+    # analog input
+    "FDwfAnalogInReset": [HDWF],
+    "FDwfAnalogInConfigure": [HDWF, BOOL, BOOL],
+    "FDwfAnalogInStatus": [HDWF, BOOL, P_BYTE],
+    "FDwfAnalogInStatusRecord": [HDWF, P_INT, P_INT, P_INT],
+    "FDwfAnalogInStatusData": [HDWF, INT, P_DOUBLE, INT],
+    "FDwfAnalogInStatusData16": [HDWF, INT, P_SHORT, INT, INT],
+    "FDwfAnalogInStatusSample": [HDWF, INT, P_DOUBLE],
+    "FDwfAnalogInStatusTime": [HDWF, P_UINT, P_UINT, P_UINT],
+    "FDwfAnalogInBufferSizeInfo": [HDWF, P_INT, P_INT],
+    "FDwfAnalogInBufferSizeSet": [HDWF, INT],
+    "FDwfAnalogInBitsInfo": [HDWF, P_INT],
+    "FDwfAnalogInFrequencyInfo": [HDWF, P_DOUBLE, P_DOUBLE],
+    "FDwfAnalogInFrequencySet": [HDWF, DOUBLE],
+    "FDwfAnalogInFrequencyGet": [HDWF, P_DOUBLE],
+    "FDwfAnalogInAcquisitionModeSet": [HDWF, ENUM],
+    "FDwfAnalogInRecordLengthSet": [HDWF, DOUBLE],
+    "FDwfAnalogInChannelCount": [HDWF, P_INT],
+    "FDwfAnalogInChannelEnableSet": [HDWF, INT, BOOL],
+    "FDwfAnalogInChannelFilterSet": [HDWF, INT, ENUM],
+    "FDwfAnalogInChannelRangeInfo": [HDWF, P_DOUBLE, P_DOUBLE, P_DOUBLE],
+    "FDwfAnalogInChannelRangeSet": [HDWF, INT, DOUBLE],
+    "FDwfAnalogInChannelRangeGet": [HDWF, INT, P_DOUBLE],
+    "FDwfAnalogInChannelOffsetInfo": [HDWF, P_DOUBLE, P_DOUBLE, P_DOUBLE],
+    "FDwfAnalogInChannelOffsetSet": [HDWF, INT, DOUBLE],
+    "FDwfAnalogInChannelOffsetGet": [HDWF, INT, P_DOUBLE],
+    "FDwfAnalogInTriggerSourceSet": [HDWF, BYTE],
+    "FDwfAnalogInTriggerAutoTimeoutSet": [HDWF, DOUBLE],
+    "FDwfAnalogInTriggerChannelSet": [HDWF, INT],
+    "FDwfAnalogInTriggerTypeSet": [HDWF, ENUM],
+    "FDwfAnalogInTriggerLevelSet": [HDWF, DOUBLE],
+    "FDwfAnalogInTriggerConditionSet": [HDWF, ENUM],
+
+    # analog output
+    "FDwfAnalogOutCount": [HDWF, P_INT],
+    "FDwfAnalogOutReset": [HDWF, INT],
+    "FDwfAnalogOutConfigure": [HDWF, INT, BOOL],
+    "FDwfAnalogOutStatus": [HDWF, INT, P_BYTE],
+    "FDwfAnalogOutRunSet": [HDWF, INT, DOUBLE],
+    "FDwfAnalogOutWaitSet": [HDWF, INT, DOUBLE],
+    "FDwfAnalogOutRepeatSet": [HDWF, INT, INT],
+    "FDwfAnalogOutNodeInfo": [HDWF, INT, P_INT],
+    "FDwfAnalogOutNodeEnableSet": [HDWF, INT, ENUM, BOOL],
+    "FDwfAnalogOutNodeFunctionSet": [HDWF, INT, ENUM, BYTE],
+    "FDwfAnalogOutNodeFrequencyInfo": [HDWF, INT, ENUM, P_DOUBLE, P_DOUBLE],
+    "FDwfAnalogOutNodeFrequencySet": [HDWF, INT, ENUM, DOUBLE],
+    "FDwfAnalogOutNodeAmplitudeInfo": [HDWF, INT, ENUM, P_DOUBLE, P_DOUBLE],
+    "FDwfAnalogOutNodeAmplitudeSet": [HDWF, INT, ENUM, DOUBLE],
+    "FDwfAnalogOutNodeOffsetInfo": [HDWF, INT, ENUM, P_DOUBLE, P_DOUBLE],
+    "FDwfAnalogOutNodeOffsetSet": [HDWF, INT, ENUM, DOUBLE],
+    "FDwfAnalogOutNodeSymmetrySet": [HDWF, INT, ENUM, DOUBLE],
+    "FDwfAnalogOutNodeDataInfo": [HDWF, INT, ENUM, P_INT, P_INT],
+    "FDwfAnalogOutNodeDataSet": [HDWF, INT, ENUM, P_DOUBLE, INT],
+    "FDwfAnalogOutNodePlayStatus": [HDWF, INT, ENUM, P_INT, P_INT, P_INT],
+    "FDwfAnalogOutNodePlayData": [HDWF, INT, ENUM, P_DOUBLE, INT],
+
+    # analog IO
+    "FDwfAnalogIOReset": [HDWF],
+    "FDwfAnalogIOStatus": [HDWF],
+    "FDwfAnalogIOEnableSet": [HDWF, BOOL],
+    "FDwfAnalogIOChannelCount": [HDWF, P_INT],
+    "FDwfAnalogIOChannelName": [HDWF, INT, STRING, STRING],
+    "FDwfAnalogIOChannelInfo": [HDWF, INT, P_INT],
+    "FDwfAnalogIOChannelNodeName": [HDWF, INT, INT, STRING, STRING],
+    "FDwfAnalogIOChannelNodeSetInfo": [HDWF, INT, INT, P_DOUBLE, P_DOUBLE, P_INT],
+    "FDwfAnalogIOChannelNodeSet": [HDWF, INT, INT, DOUBLE],
+    "FDwfAnalogIOChannelNodeGet": [HDWF, INT, INT, P_DOUBLE],
+    "FDwfAnalogIOChannelNodeStatusInfo": [HDWF, INT, INT, P_DOUBLE, P_DOUBLE, P_INT],
+    "FDwfAnalogIOChannelNodeStatus": [HDWF, INT, INT, P_DOUBLE],
+
+    # digital IO
+    "FDwfDigitalIOReset": [HDWF],
+    "FDwfDigitalIOStatus": [HDWF],
+    "FDwfDigitalIOOutputEnableSet": [HDWF, UINT],
+    "FDwfDigitalIOOutputEnableGet": [HDWF, P_UINT],
+    "FDwfDigitalIOOutputSet": [HDWF, UINT],
+    "FDwfDigitalIOOutputGet": [HDWF, P_UINT],
+    "FDwfDigitalIOInputStatus": [HDWF, P_UINT],
+
+    # digital input
+    "FDwfDigitalInReset": [HDWF],
+    "FDwfDigitalInConfigure": [HDWF, BOOL, BOOL],
+    "FDwfDigitalInStatus": [HDWF, BOOL, P_BYTE],
+    "FDwfDigitalInStatusData": [HDWF, DATA, INT],
+    "FDwfDigitalInStatusRecord": [HDWF, P_INT, P_INT, P_INT],
+    "FDwfDigitalInInternalClockInfo": [HDWF, P_DOUBLE],
+    "FDwfDigitalInDividerSet": [HDWF, UINT],
+    "FDwfDigitalInBitsInfo": [HDWF, P_INT],
+    "FDwfDigitalInSampleFormatSet": [HDWF, INT],
+    "FDwfDigitalInBufferSizeInfo": [HDWF, P_INT],
+    "FDwfDigitalInBufferSizeSet": [HDWF, INT],
+    "FDwfDigitalInAcquisitionModeSet": [HDWF, ENUM],
+    "FDwfDigitalInTriggerSourceSet": [HDWF, BYTE],
+    "FDwfDigitalInTriggerPositionSet": [HDWF, UINT],
+    "FDwfDigitalInTriggerPrefillSet": [HDWF, UINT],
+    "FDwfDigitalInTriggerAutoTimeoutSet": [HDWF, DOUBLE],
+    "FDwfDigitalInTriggerSet": [HDWF, UINT, UINT, UINT, UINT],
+    "FDwfDigitalInTriggerResetSet": [HDWF, UINT, UINT, UINT, UINT],
+    "FDwfDigitalInTriggerCountSet": [HDWF, INT, BOOL],
+    "FDwfDigitalInTriggerLengthSet": [HDWF, DOUBLE, DOUBLE, INT],
+
+    # digital output
+    "FDwfDigitalOutReset": [HDWF],
+    "FDwfDigitalOutConfigure": [HDWF, BOOL],
+    "FDwfDigitalOutCount": [HDWF, P_INT],
+    "FDwfDigitalOutInternalClockInfo": [HDWF, P_DOUBLE],
+    "FDwfDigitalOutEnableSet": [HDWF, INT, BOOL],
+    "FDwfDigitalOutTypeSet": [HDWF, INT, ENUM],
+    "FDwfDigitalOutIdleSet": [HDWF, INT, ENUM],
+    "FDwfDigitalOutDividerSet": [HDWF, INT, UINT],
+    "FDwfDigitalOutCounterInfo": [HDWF, INT, P_UINT, P_UINT],
+    "FDwfDigitalOutCounterSet": [HDWF, INT, UINT, UINT],
+    "FDwfDigitalOutDataInfo": [HDWF, INT, P_UINT],
+    "FDwfDigitalOutDataSet": [HDWF, INT, DATA, UINT],
+    "FDwfDigitalOutWaitSet": [HDWF, DOUBLE],
+    "FDwfDigitalOutRepeatSet": [HDWF, UINT],
+    "FDwfDigitalOutRunSet": [HDWF, DOUBLE],
+    "FDwfDigitalOutRepeatTriggerSet": [HDWF, BOOL],
+    "FDwfDigitalOutTriggerSourceSet": [HDWF, BYTE],
+    "FDwfDigitalOutTriggerSlopeSet": [HDWF, ENUM],
+
+    # UART
+    "FDwfDigitalUartReset": [HDWF],
+    "FDwfDigitalUartRateSet": [HDWF, DOUBLE],
+    "FDwfDigitalUartBitsSet": [HDWF, INT],
+    "FDwfDigitalUartParitySet": [HDWF, INT],
+    "FDwfDigitalUartStopSet": [HDWF, DOUBLE],
+    "FDwfDigitalUartTxSet": [HDWF, INT],
+    "FDwfDigitalUartRxSet": [HDWF, INT],
+    "FDwfDigitalUartTx": [HDWF, DATA, INT],
+    "FDwfDigitalUartRx": [HDWF, DATA, INT, P_INT, P_INT],
+
+    # SPI
+    "FDwfDigitalSpiReset": [HDWF],
+    "FDwfDigitalSpiFrequencySet": [HDWF, DOUBLE],
+    "FDwfDigitalSpiClockSet": [HDWF, INT],
+    "FDwfDigitalSpiDataSet": [HDWF, INT, INT],
+    "FDwfDigitalSpiIdleSet": [HDWF, INT, ENUM],
+    "FDwfDigitalSpiModeSet": [HDWF, INT],
+    "FDwfDigitalSpiOrderSet": [HDWF, INT],
+    "FDwfDigitalSpiSelect": [HDWF, INT, INT],
+    "FDwfDigitalSpiWriteRead": [HDWF, INT, INT, DATA, INT, DATA, INT],
+    "FDwfDigitalSpiRead": [HDWF, INT, INT, DATA, INT],
+    "FDwfDigitalSpiWrite": [HDWF, INT, INT, DATA, INT],
+    "FDwfDigitalSpiWriteOne": [HDWF, INT, INT, UINT],
+
+    # I2C
+    "FDwfDigitalI2cReset": [HDWF],
+    "FDwfDigitalI2cClear": [HDWF, P_INT],
+    "FDwfDigitalI2cStretchSet": [HDWF, BOOL],
+    "FDwfDigitalI2cRateSet": [HDWF, DOUBLE],
+    "FDwfDigitalI2cSclSet": [HDWF, INT],
+    "FDwfDigitalI2cSdaSet": [HDWF, INT],
+    "FDwfDigitalI2cWriteRead": [HDWF, BYTE, DATA, INT, DATA, INT, P_INT],
+    "FDwfDigitalI2cRead": [HDWF, BYTE, DATA, INT, P_INT],
+    "FDwfDigitalI2cWrite": [HDWF, BYTE, DATA, INT, P_INT],
+    "FDwfDigitalI2cSpyStart": [HDWF],
+    "FDwfDigitalI2cSpyStatus": [HDWF, P_INT, P_INT, DATA, P_INT, P_INT],
+
+    # tools
+    "FDwfSpectrumWindow": [P_DOUBLE, INT, ENUM, DOUBLE, P_DOUBLE],
+    "FDwfSpectrumTransform": [P_DOUBLE, INT, P_DOUBLE, P_DOUBLE, INT, DOUBLE, DOUBLE],
+}
+
+# functions which are allowed to fail without being recorded
+__unchecked__ = ["FDwfGetLastError", "FDwfGetLastErrorMsg", "FDwfEnum", "FDwfDeviceConfigOpen"]
+
+# functions without a device handle as first argument
+__unbound__ = ["FDwfGetLastError", "FDwfGetLastErrorMsg", "FDwfGetVersion", "FDwfEnum", "FDwfEnumDeviceType",
+               "FDwfEnumDeviceIsOpened", "FDwfEnumSN", "FDwfDeviceOpen", "FDwfDeviceConfigOpen",
+               "FDwfSpectrumWindow", "FDwfSpectrumTransform"]
+
+# name and device handle of the last function which returned 0, stored separately for every thread
+__failed__ = threading.local()
+
+"""-----------------------------------------------------------------------"""
+
+def declare(name, argtypes, restype=ctypes.c_int, library=None):
+    """
+        declare the prototype of a library function
+
+        parameters: - the name of the function
+                    - list of argument types
+                    - return type, default is int
+                    - the library, default is the loaded backend
+
+        returns:    - the function, or None if the library does not export it
+    """
+    function = getattr(library or dwf, name, None)
+    if function is not None:
+        function.argtypes = argtypes
+        function.restype = restype
+        # the status functions are polled in loops, they are named in check_error instead
+        if name not in __unchecked__ and "Status" not in name:
+            function.errcheck = __errcheck__
+    return function
+
+"""-----------------------------------------------------------------------"""
+
+def last_failed():
+    """
+        returns:    - the name of the last library function which failed in this thread,
+                      or an empty string, the name is cleared after reading
+                    - the device handle of the call, or None
+    """
+    name = getattr(__failed__, "name", "")
+    handle = getattr(__failed__, "handle", None)
+    __failed__.name = ""
+    __failed__.handle = None
+    return name, handle
+
+"""-----------------------------------------------------------------------"""
+
+def __errcheck__(result, function, arguments):
+    """
+        record the name and the device handle of a failed function, the result is returned unchanged
+    """
+    if result == 0:
+        __failed__.name = function.__name__
+        __failed__.handle = arguments[0] if function.__name__ not in __unbound__ and len(arguments) > 0 else None
+    return result
+
+"""-----------------------------------------------------------------------"""
+
+def select(name, trace_path=None):
+    """
+        select the backend, call it before the instruments are imported
+
+        the backend can be also selected with the WF_SDK_BACKEND environment variable,
+        and the trace file with the WF_SDK_TRACE environment variable
+
+        parameters: - "libdwf" for the WaveForms SDK, "simulator" for the simulated
+                      device in WF_SDK.simulator (no hardware or WaveForms needed),
+                      or "replay" to play back a trace recorded with WF_SDK.trace
+                    - trace file: the calls of "libdwf" and "simulator" are recorded
+                      into it, "replay" reads it, default is None (no recording)
+    """
+    global backend, trace
+    if name not in ("libdwf", "simulator", "replay"):
+        raise ValueError("unknown backend: " + str(name))
+    if name == "replay" and trace_path is None:
+        raise ValueError("the replay backend needs a trace file")
+    with __lock__:
+        if len(__loaded__) > 0 and (name != backend or trace_path != trace):
+            raise RuntimeError("the " + backend + " backend is already in use")
+        backend = name
+        trace = trace_path
+    return
+
+"""-----------------------------------------------------------------------"""
+
+def tracing():
+    """
+        returns:    - True if the calls are recorded or replayed
+    """
+    return trace is not None
+
+"""-----------------------------------------------------------------------"""
+
+def __load__():
+    """
+        load the selected backend once and declare the prototypes
+
+        returns:    - dictionary of the library ("dwf") and the constants ("constants")
+    """
+    with __lock__:
+        if len(__loaded__) == 0:
+            if backend == "simulator":
+                from WF_SDK import simulator
+                library, constants_module = simulator.library(), simulator.constants
+            elif backend == "replay":
+                from WF_SDK import simulator, trace as trace_module
+                library, constants_module = trace_module.player(trace), simulator.constants
+            else:
+                library, constants_module = __load_libdwf__()
+
+            # declare every prototype once, functions missing from older SDK versions are skipped
+            for name, argtypes in __prototypes__.items():
+                declare(name, argtypes, library=library)
+
+            # record the calls, the file is completed when the interpreter exits
+            if trace is not None and backend != "replay":
+                from WF_SDK import trace as trace_module
+                library = trace_module.recorder(library, trace)
+                atexit.register(library.close)
+            __loaded__.update(dwf=library, constants=constants_module)
+    return __loaded__
+
+"""-----------------------------------------------------------------------"""
+
+def __load_libdwf__():
+    """
+        load the dynamic library and import the constants (the paths are OS specific)
+    """
+    if platform.startswith("win"):
+        # on Windows
+        library = ctypes.cdll.dwf
+        constants_path = "C:" + sep + "Program Files (x86)" + sep + "Digilent" + sep + "WaveFormsSDK" + sep + "samples" + sep + "py"
+    elif platform.startswith("darwin"):
+        # on macOS
+        lib_path = sep + "Library" + sep + "Frameworks" + sep + "dwf.framework" + sep + "dwf"
+        library = ctypes.cdll.LoadLibrary(lib_path)
+        constants_path = sep + "Applications" + sep + "WaveForms.app" + sep + "Contents" + sep + "Resources" + sep + "SDK" + sep + "samples" + sep + "py"
+    else:
+        # on Linux
+        library = ctypes.cdll.LoadLibrary("libdwf.so")
+        constants_path = sep + "usr" + sep + "share" + sep + "digilent" + sep + "waveforms" + sep + "samples" + sep + "py"
+
+    # import constants (the path is added only once)
+    if constants_path not in path:
+        path.append(constants_path)
+    import dwfconstants
+    return library, dwfconstants
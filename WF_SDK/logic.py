@@ -1,36 +1,22 @@
-""" LOGIC ANALYZER CONTROL FUNCTIONS: open, trigger, record, close """
+""" LOGIC ANALYZER CONTROL FUNCTIONS: open, trigger, record, close, instrument """
 
 import ctypes                     # import the C compatible data types
-from sys import platform, path    # this is needed to check the OS type and get the PATH
-from os import sep                # OS specific file path separators
-
-# load the dynamic library, get constants path (the path is OS specific)
-if platform.startswith("win"):
-    # on Windows
-    dwf = ctypes.cdll.dwf
-    constants_path = "C:" + sep + "Program Files (x86)" + sep + "Digilent" + sep + "WaveFormsSDK" + sep + "samples" + sep + "py"
-elif platform.startswith("darwin"):
-    # on macOS
-    lib_path = sep + "Library" + sep + "Frameworks" + sep + "dwf.framework" + sep + "dwf"
-    dwf = ctypes.cdll.LoadLibrary(lib_path)
-    constants_path = sep + "Applications" + sep + "WaveForms.app" + sep + "Contents" + sep + "Resources" + sep + "SDK" + sep + "samples" + sep + "py"
-else:
-    # on Linux
-    dwf = ctypes.cdll.LoadLibrary("libdwf.so")
-    constants_path = sep + "usr" + sep + "share" + sep + "digilent" + sep + "waveforms" + sep + "samples" + sep + "py"
-
-# import constants
-path.append(constants_path)
-import dwfconstants as constants
-from WF_SDK.device import check_error
+import numpy as np                # arrays for the recorded data
+from WF_SDK.library import dwf, constants
+from WF_SDK.device import check_error, error, wait_policy
+from WF_SDK import device
 
 """-----------------------------------------------------------------------"""
 
 class data:
-    """ stores the sampling frequency and the buffer size """
+    """ stores the sampling frequency, the buffer size and the wait policy """
     sampling_frequency = 100e06
     buffer_size = 4096
     max_buffer_size = 0
+    wait = wait_policy()    # how the acquisitions wait for data, see device.wait_policy
+
+# the settings of new instruments, the module functions change data
+__defaults__ = device.__new_data__(data)
 
 """-----------------------------------------------------------------------"""
 
@@ -42,29 +28,7 @@ def open(device_data, sampling_frequency=100e06, buffer_size=0):
                     - sampling frequency in Hz, default is 100MHz
                     - buffer size, default is 0 (maximum)
     """
-    # set global variables
-    data.sampling_frequency = sampling_frequency
-    data.max_buffer_size = device_data.digital.input.max_buffer_size
-
-    # get internal clock frequency
-    internal_frequency = ctypes.c_double()
-    if dwf.FDwfDigitalInInternalClockInfo(device_data.handle, ctypes.byref(internal_frequency)) == 0:
-        check_error()
-    
-    # set clock frequency divider (needed for lower frequency input signals)
-    if dwf.FDwfDigitalInDividerSet(device_data.handle, ctypes.c_int(int(internal_frequency.value / sampling_frequency))) == 0:
-        check_error()
-    
-    # set 16-bit sample format
-    if dwf.FDwfDigitalInSampleFormatSet(device_data.handle, ctypes.c_int(16)) == 0:
-        check_error()
-    
-    # set buffer size
-    if buffer_size == 0:
-        buffer_size = data.max_buffer_size
-    data.buffer_size = buffer_size
-    if dwf.FDwfDigitalInBufferSizeSet(device_data.handle, ctypes.c_int(buffer_size)) == 0:
-        check_error()
+    instrument(device_data, data).open(sampling_frequency, buffer_size)
     return
 
 """-----------------------------------------------------------------------"""
@@ -84,84 +48,23 @@ def trigger(device_data, enable, channel, position=0, timeout=0, rising_edge=Tru
                     - length_max - trigger sequence maximum time in seconds, the default is 20
                     - count - instance count, the default is 0 (immediate)
     """
-    # set trigger source to digital I/O lines, or turn it off
-    if enable:
-        if dwf.FDwfDigitalInTriggerSourceSet(device_data.handle, constants.trigsrcDetectorDigitalIn) == 0:
-            check_error()
-    else:
-        if dwf.FDwfDigitalInTriggerSourceSet(device_data.handle, constants.trigsrcNone) == 0:
-            check_error()
-        return
-    
-    # set starting position and prefill
-    position = min(data.buffer_size, max(0, position))
-    if dwf.FDwfDigitalInTriggerPositionSet(device_data.handle, ctypes.c_int(data.buffer_size - position)) == 0:
-        check_error()
-    if dwf.FDwfDigitalInTriggerPrefillSet(device_data.handle, ctypes.c_int(position)) == 0:
-        check_error()
-
-    # set trigger condition
-    channel = ctypes.c_int(1 << channel)
-    if not rising_edge:
-        if dwf.FDwfDigitalInTriggerSet(device_data.handle, channel, ctypes.c_int(0), ctypes.c_int(0), ctypes.c_int(0)) == 0:
-            check_error()
-        if dwf.FDwfDigitalInTriggerResetSet(device_data.handle, ctypes.c_int(0), ctypes.c_int(0), ctypes.c_int(0), channel) == 0:
-            check_error()
-    else:
-        if dwf.FDwfDigitalInTriggerSet(device_data.handle, ctypes.c_int(0), channel, ctypes.c_int(0), ctypes.c_int(0)) == 0:
-            check_error()
-        if dwf.FDwfDigitalInTriggerResetSet(device_data.handle, ctypes.c_int(0), ctypes.c_int(0), channel, ctypes.c_int(0)) == 0:
-            check_error()
-    
-    # set auto triggering
-    if dwf.FDwfDigitalInTriggerAutoTimeoutSet(device_data.handle, ctypes.c_double(timeout)) == 0:
-        check_error()
-    
-    # set sequence length to activate trigger
-    if dwf.FDwfDigitalInTriggerLengthSet(device_data.handle, ctypes.c_double(length_min), ctypes.c_double(length_max), ctypes.c_int(0)) == 0:
-        check_error()
-
-    # set event counter
-    if dwf.FDwfDigitalInTriggerCountSet(device_data.handle, ctypes.c_int(count), ctypes.c_int(0)) == 0:
-        check_error()
+    instrument(device_data, data).trigger(enable, channel, position, timeout, rising_edge, length_min, length_max, count)
     return
 
 """-----------------------------------------------------------------------"""
 
-def record(device_data, channel):
+def record(device_data, channel, as_array=False, out=None):
     """
         initialize the logic analyzer
 
         parameters: - device data
                     - channel - the selected DIO line number
+                    - as_array - True returns a numpy array instead of a list, default is False
+                    - out - preallocated integer numpy array to record into, default is None (implies as_array)
 
-        returns:    - a list with the recorded logic values
+        returns:    - a list, or a numpy array with the recorded logic values
     """
-    # set up the instrument
-    if dwf.FDwfDigitalInConfigure(device_data.handle, ctypes.c_bool(False), ctypes.c_bool(True)) == 0:
-        check_error()
-    
-    # read data to an internal buffer
-    while True:
-        status = ctypes.c_byte()    # variable to store buffer status
-        if dwf.FDwfDigitalInStatus(device_data.handle, ctypes.c_bool(True), ctypes.byref(status)) == 0:
-            check_error()
-    
-        if status.value == constants.stsDone.value:
-            # exit loop when finished
-            break
-    
-    # get samples
-    buffer = (ctypes.c_uint16 * data.buffer_size)()
-    if dwf.FDwfDigitalInStatusData(device_data.handle, buffer, ctypes.c_int(2 * data.buffer_size)) == 0:
-        check_error()
-    
-    # convert buffer to list of lists of integers
-    result = []
-    for point in buffer:
-        result.append((int(point) & (1 << channel)) >> channel)
-    
-    return result
+    return instrument(device_data, data).record(channel, as_array, out)
 
 """-----------------------------------------------------------------------"""
 
@@ -169,6 +72,209 @@ def close(device_data):
     """
         reset the instrument
     """
-    if dwf.FDwfDigitalInReset(device_data.handle) == 0:
-        check_error()
+    instrument(device_data, data).close()
     return
+
+"""-----------------------------------------------------------------------"""
+
+class instrument:
+    """
+        logic analyzer of one device with its own settings
+
+        the module functions share the settings in data, while every instrument
+        keeps a separate copy, so the logic analyzers of several devices can be
+        used from separate threads; the methods are the module functions
+        without the device data
+
+        the raw samples are read into a buffer of the instrument, which is
+        allocated once and reused by every record; start, done and read split
+        a record, so the acquisition can be waited for by another loop (see aio)
+
+        parameters: - device data
+                    - settings, default is None (a new copy of the default settings)
+    """
+    def __init__(self, device_data, settings=None):
+        self.device_data = device_data
+        if settings is None:
+            settings = device.__new_data__(__defaults__)
+            settings.wait = wait_policy()
+        self.data = settings
+        self.samples = None     # reusable buffer for the raw 16-bit samples
+        return
+
+    def open(self, sampling_frequency=100e06, buffer_size=0):
+        """
+            initialize the logic analyzer, see open
+        """
+        handle = self.device_data.handle
+
+        # set the stored settings
+        self.data.sampling_frequency = sampling_frequency
+        self.data.max_buffer_size = self.device_data.digital.input.max_buffer_size
+
+        # get internal clock frequency
+        internal_frequency = ctypes.c_double()
+        if dwf.FDwfDigitalInInternalClockInfo(handle, ctypes.byref(internal_frequency)) == 0:
+            check_error()
+
+        # set clock frequency divider (needed for lower frequency input signals)
+        if dwf.FDwfDigitalInDividerSet(handle, int(internal_frequency.value / sampling_frequency)) == 0:
+            check_error()
+
+        # set 16-bit sample format
+        if dwf.FDwfDigitalInSampleFormatSet(handle, 16) == 0:
+            check_error()
+
+        # set buffer size
+        if buffer_size == 0:
+            buffer_size = self.data.max_buffer_size
+        self.data.buffer_size = buffer_size
+        if dwf.FDwfDigitalInBufferSizeSet(handle, buffer_size) == 0:
+            check_error()
+        return
+
+    def trigger(self, enable, channel, position=0, timeout=0, rising_edge=True, length_min=0, length_max=20, count=0):
+        """
+            set up triggering, see trigger
+        """
+        handle = self.device_data.handle
+
+        # set trigger source to digital I/O lines, or turn it off
+        if enable:
+            if dwf.FDwfDigitalInTriggerSourceSet(handle, constants.trigsrcDetectorDigitalIn) == 0:
+                check_error()
+        else:
+            if dwf.FDwfDigitalInTriggerSourceSet(handle, constants.trigsrcNone) == 0:
+                check_error()
+            return
+
+        # set starting position and prefill
+        position = min(self.data.buffer_size, max(0, position))
+        if dwf.FDwfDigitalInTriggerPositionSet(handle, self.data.buffer_size - position) == 0:
+            check_error()
+        if dwf.FDwfDigitalInTriggerPrefillSet(handle, position) == 0:
+            check_error()
+
+        # set trigger condition
+        channel = 1 << channel
+        if not rising_edge:
+            if dwf.FDwfDigitalInTriggerSet(handle, channel, 0, 0, 0) == 0:
+                check_error()
+            if dwf.FDwfDigitalInTriggerResetSet(handle, 0, 0, 0, channel) == 0:
+                check_error()
+        else:
+            if dwf.FDwfDigitalInTriggerSet(handle, 0, channel, 0, 0) == 0:
+                check_error()
+            if dwf.FDwfDigitalInTriggerResetSet(handle, 0, 0, channel, 0) == 0:
+                check_error()
+
+        # set auto triggering
+        if dwf.FDwfDigitalInTriggerAutoTimeoutSet(handle, timeout) == 0:
+            check_error()
+
+        # set sequence length to activate trigger
+        if dwf.FDwfDigitalInTriggerLengthSet(handle, length_min, length_max, 0) == 0:
+            check_error()
+
+        # set event counter
+        if dwf.FDwfDigitalInTriggerCountSet(handle, count, 0) == 0:
+            check_error()
+        return
+
+    def record(self, channel, as_array=False, out=None):
+        """
+            record a DIO line, see record
+        """
+        # check the output array before starting the acquisition
+        self.__check_out__(out)
+
+        # set up the instrument
+        self.start()
+
+        # read data to an internal buffer
+        try:
+            device.wait(self.done, self.data.wait, self.data.buffer_size / self.data.sampling_frequency, "record", "logic")
+        except error:
+            # stop the acquisition on timeout or cancellation
+            self.stop()
+            raise
+        return self.read(channel, as_array, out)
+
+    def close(self):
+        """
+            reset the instrument
+        """
+        if dwf.FDwfDigitalInReset(self.device_data.handle) == 0:
+            check_error()
+        return
+
+    def __check_out__(self, out):
+        """
+            check that a preallocated array can hold the recorded logic values
+        """
+        if out is not None:
+            if not isinstance(out, np.ndarray) or out.dtype.kind not in "iu" or not out.flags.writeable:
+                raise error("The output must be a writeable integer array", "record", "logic")
+            if out.size < self.data.buffer_size:
+                raise error("The output array is smaller than the buffer (" + str(self.data.buffer_size) + " samples)", "record", "logic")
+        return
+
+    def start(self):
+        """
+            start a single acquisition, read a DIO line when done returns True
+        """
+        if dwf.FDwfDigitalInConfigure(self.device_data.handle, False, True) == 0:
+            check_error()
+        return
+
+    def done(self):
+        """
+            read the instrument status, returns True when the buffer is full
+        """
+        status = ctypes.c_ubyte()    # variable to store buffer status
+        if dwf.FDwfDigitalInStatus(self.device_data.handle, True, ctypes.byref(status)) == 0:
+            check_error("FDwfDigitalInStatus", self.device_data.handle)
+        return status.value == constants.stsDone.value
+
+    def stop(self):
+        """
+            stop the running acquisition
+        """
+        if dwf.FDwfDigitalInConfigure(self.device_data.handle, False, False) == 0:
+            check_error()
+        return
+
+    def read(self, channel, as_array=False, out=None):
+        """
+            copy a DIO line from the finished acquisition, the parameters are the same as for record
+        """
+        self.__check_out__(out)
+        buffer_size = self.data.buffer_size
+
+        # get the raw samples into the reusable buffer, it holds the largest acquisition
+        if out is not None or as_array:
+            if self.samples is None or self.samples.size < buffer_size:
+                self.samples = np.empty(max(self.data.max_buffer_size, buffer_size), dtype=np.uint16)
+            samples = self.samples[:buffer_size]
+            if dwf.FDwfDigitalInStatusData(self.device_data.handle, samples.ctypes.data_as(ctypes.POINTER(ctypes.c_uint16)), 2 * buffer_size) == 0:
+                check_error("FDwfDigitalInStatusData", self.device_data.handle)
+
+            # extract the selected bit straight into the output, the only copy of the samples
+            if out is None:
+                out = np.empty(buffer_size, dtype=np.uint8)
+            result = out[:buffer_size]
+            np.right_shift(samples, channel, out=result, casting="unsafe")
+            np.bitwise_and(result, 1, out=result)
+            return result
+
+        # get samples
+        buffer = (ctypes.c_uint16 * buffer_size)()
+        if dwf.FDwfDigitalInStatusData(self.device_data.handle, buffer, 2 * buffer_size) == 0:
+            check_error("FDwfDigitalInStatusData", self.device_data.handle)
+
+        # convert buffer to list of lists of integers
+        result = []
+        for point in buffer:
+            result.append((int(point) & (1 << channel)) >> channel)
+
+        return result
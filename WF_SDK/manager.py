@@ -0,0 +1,106 @@
+""" DEVICE MANAGER: open several devices and run captures on all of them in parallel """
+
+from concurrent.futures import ThreadPoolExecutor   # worker pool, the SDK calls release the GIL
+from WF_SDK import device
+from WF_SDK.device import error
+
+"""-----------------------------------------------------------------------"""
+
+class pool:
+    """
+        opens every connected device, or the devices with the given serial numbers,
+        and runs functions on all of them at the same time
+
+        every device gets its own device data, the results are keyed by serial number
+
+        the module functions of the instruments share their settings (scope.data,
+        logic.data, ...), create an instrument for each device (scope.instrument,
+        logic.instrument, ...) to use different settings on the devices
+
+        parameters: - list of serial numbers, default is None (every free device)
+                    - device type: None (any), or a device name, see device.open()
+                    - configuration: 0 = auto, default = auto
+                    - number of worker threads, default is None (one for each device)
+    """
+    def __init__(self, serials=None, device_type=None, config=0, workers=None):
+        self.devices = {}       # device data for every serial number
+        try:
+            for info in device.list_devices(device_type):
+                if serials is not None and info.serial not in serials:
+                    continue
+                if info.opened:
+                    if serials is not None:
+                        raise error("The device " + info.serial + " is in use", "pool", "manager")
+                    continue
+                device_data = device.__open__(info.index, config)
+                if device_data is None:
+                    raise error("The device " + info.serial + " can't be opened", "pool", "manager")
+                self.devices[info.serial] = device_data
+
+            # check the requested devices
+            if serials is not None:
+                missing = [serial for serial in serials if serial not in self.devices]
+                if len(missing) > 0:
+                    raise error("Not connected: " + ", ".join(missing), "pool", "manager")
+            if len(self.devices) == 0:
+                raise error("There are no free devices", "pool", "manager")
+        except:
+            self.close()
+            raise
+        self.__executor__ = ThreadPoolExecutor(max_workers=workers or len(self.devices), thread_name_prefix="WF_SDK device")
+        return
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+        return
+
+    @property
+    def serials(self):
+        """ serial numbers of the opened devices """
+        return list(self.devices)
+
+    def run(self, function, *args, return_exceptions=False, **kwargs):
+        """
+            call a function for every device at the same time
+
+            parameters: - the function, its first argument is the device data
+                        - further positional and keyword arguments of the function
+                        - return_exceptions - if True, a failed call returns its exception,
+                          otherwise the first exception is raised after every call finished
+
+            returns:    - dictionary of the results keyed by serial number
+        """
+        futures = {}
+        for serial, device_data in self.devices.items():
+            futures[serial] = self.__executor__.submit(function, device_data, *args, **kwargs)
+
+        # wait for every device, even if one of them fails
+        results = {}
+        first_exception = None
+        for serial, future in futures.items():
+            exception = future.exception()
+            if exception is None:
+                results[serial] = future.result()
+            else:
+                results[serial] = exception
+                if first_exception is None:
+                    first_exception = exception
+        if first_exception is not None and not return_exceptions:
+            raise first_exception
+        return results
+
+    def close(self):
+        """
+            stop the workers and close every device
+        """
+        executor = getattr(self, "__executor__", None)
+        if executor is not None:
+            executor.shutdown(wait=True)
+            self.__executor__ = None
+        for device_data in self.devices.values():
+            device.close(device_data)
+        self.devices = {}
+        return
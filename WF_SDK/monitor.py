@@ -0,0 +1,154 @@
+""" SCOPE MONITOR: background acquisition into a ring buffer """
+
+import threading                  # background acquisition thread
+import numpy as np                # ring buffer storage
+from WF_SDK import scope
+from WF_SDK.device import wait_policy
+
+"""-----------------------------------------------------------------------"""
+
+class background:
+    """
+        records the oscilloscope in a background thread and keeps the most recent samples
+
+        the scope must be initialized (scope.open, instrument.open or
+        session.configure) before starting; the samples
+        are addressed with cursors, which count every sample since the start
+        (lost samples are stored as NaN, so the cursors follow the time base)
+
+        parameters: - device data
+                    - list of the selected oscilloscope channels, default is (1,)
+                    - length of the kept history in seconds, default is 10s
+                    - oscilloscope - the scope.instrument or scope.session which is streamed,
+                      default is None (the module functions and their settings)
+    """
+    def __init__(self, device_data, channels=(1,), length=10, oscilloscope=None):
+        self.device_data = device_data
+        self.channels = list(channels)
+        if oscilloscope is None:
+            oscilloscope = scope.instrument(device_data, scope.data)
+        self.oscilloscope = oscilloscope
+        self.sampling_frequency = oscilloscope.data.sampling_frequency
+        self.size = max(int(length * self.sampling_frequency), 1)
+        self.buffer = np.full((len(self.channels), self.size), np.nan)
+        self.cursor = 0         # number of samples written since the start
+        self.lost = 0           # samples lost by the device
+        self.corrupted = 0      # samples possibly corrupted by the device
+        self.overruns = 0       # samples overwritten before a read_since call fetched them
+        self.exception = None   # exception which stopped the background thread
+        self.__lock__ = threading.Lock()
+        self.__policy__ = wait_policy(max_interval=oscilloscope.data.wait.max_interval, cancel=threading.Event())
+        self.__thread__ = None
+        return
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+        return
+
+    @property
+    def running(self):
+        """ True while the background thread is acquiring """
+        return self.__thread__ is not None and self.__thread__.is_alive()
+
+    def start(self):
+        """
+            start the background acquisition
+        """
+        if self.running:
+            return
+        self.__policy__.cancel.clear()
+        self.exception = None
+        self.__thread__ = threading.Thread(target=self.__run__, name="WF_SDK scope monitor", daemon=True)
+        self.__thread__.start()
+        return
+
+    def stop(self):
+        """
+            stop the background acquisition, the recorded samples are kept
+        """
+        self.__policy__.cancel.set()
+        if self.__thread__ is not None:
+            self.__thread__.join()
+            self.__thread__ = None
+        return
+
+    def read_latest(self, seconds=None):
+        """
+            return a copy of the most recent samples without blocking
+
+            parameters: - length of the returned history in seconds, default is None (everything kept)
+
+            returns:    - a numpy array with one row for each channel
+        """
+        with self.__lock__:
+            count = min(self.cursor, self.size)
+            if seconds is not None:
+                count = min(count, int(seconds * self.sampling_frequency))
+            return self.__read__(self.cursor - count, self.cursor)
+
+    def read_since(self, cursor):
+        """
+            return a copy of the samples recorded since a cursor without blocking
+
+            parameters: - cursor returned by a previous call, or 0 for the start
+
+            returns:    - a numpy array with one row for each channel
+                        - the cursor for the next call
+        """
+        with self.__lock__:
+            oldest = max(self.cursor - self.size, 0)
+            if cursor < oldest:
+                # the samples were overwritten before they were read
+                self.overruns += oldest - cursor
+                cursor = oldest
+            return self.__read__(cursor, self.cursor), self.cursor
+
+    def __read__(self, start, stop):
+        """
+            copy the samples between two cursors from the ring buffer
+        """
+        first = start % self.size
+        count = stop - start
+        if first + count <= self.size:
+            return self.buffer[:, first:first + count].copy()
+        return np.concatenate((self.buffer[:, first:], self.buffer[:, :first + count - self.size]), axis=1)
+
+    def __write__(self, samples, count):
+        """
+            write samples into the ring buffer, or NaN if samples is None
+        """
+        offset = 0
+        while offset < count:
+            first = self.cursor % self.size
+            length = min(count - offset, self.size - first)
+            if samples is None:
+                self.buffer[:, first:first + length] = np.nan
+            else:
+                self.buffer[:, first:first + length] = samples[:, offset:offset + length]
+            self.cursor += length
+            offset += length
+        return
+
+    def __run__(self):
+        """
+            background thread: move the streamed chunks into the ring buffer
+        """
+        try:
+            for samples, lost, corrupted in self.oscilloscope.stream(self.channels, policy=self.__policy__):
+                with self.__lock__:
+                    self.lost += lost
+                    self.corrupted += corrupted
+                    # keep the time base across lost samples, without rewriting the whole ring
+                    self.__write__(None, min(lost, self.size))
+                    self.cursor += lost - min(lost, self.size)
+                    count = min(samples.shape[1], self.size)
+                    self.__write__(samples[:, samples.shape[1] - count:], count)
+                    self.cursor += samples.shape[1] - count
+        except Exception as exception:
+            # keep every failure, so the readers can see why the thread stopped
+            self.exception = exception
+        return
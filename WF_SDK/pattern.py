@@ -1,27 +1,7 @@
 """ PATTERN GENERATOR CONTROL FUNCTIONS: generate, close, enable, disable """
 
 import ctypes                     # import the C compatible data types
-from sys import platform, path    # this is needed to check the OS type and get the PATH
-from os import sep                # OS specific file path separators
-
-# load the dynamic library, get constants path (the path is OS specific)
-if platform.startswith("win"):
-    # on Windows
-    dwf = ctypes.cdll.dwf
-    constants_path = "C:" + sep + "Program Files (x86)" + sep + "Digilent" + sep + "WaveFormsSDK" + sep + "samples" + sep + "py"
-elif platform.startswith("darwin"):
-    # on macOS
-    lib_path = sep + "Library" + sep + "Frameworks" + sep + "dwf.framework" + sep + "dwf"
-    dwf = ctypes.cdll.LoadLibrary(lib_path)
-    constants_path = sep + "Applications" + sep + "WaveForms.app" + sep + "Contents" + sep + "Resources" + sep + "SDK" + sep + "samples" + sep + "py"
-else:
-    # on Linux
-    dwf = ctypes.cdll.LoadLibrary("libdwf.so")
-    constants_path = sep + "usr" + sep + "share" + sep + "digilent" + sep + "waveforms" + sep + "samples" + sep + "py"
-
-# import constants
-path.append(constants_path)
-import dwfconstants as constants
+from WF_SDK.library import dwf, constants
 from WF_SDK.device import check_error
 
 """-----------------------------------------------------------------------"""
@@ -79,7 +59,7 @@ def generate(device_data, channel, function, frequency, duty_cycle=50, data=[],
     
     # get counter value range
     counter_limit = ctypes.c_uint()
-    if dwf.FDwfDigitalOutCounterInfo(device_data.handle, ctypes.c_int(channel), ctypes.c_int(0), ctypes.byref(counter_limit)) == 0:
+    if dwf.FDwfDigitalOutCounterInfo(device_data.handle, channel, None, ctypes.byref(counter_limit)) == 0:
         check_error()
     
     # calculate the divider for the given signal frequency
@@ -89,19 +69,19 @@ def generate(device_data, channel, function, frequency, duty_cycle=50, data=[],
         divider = int(internal_frequency.value / frequency)
     
     # enable the respective channel
-    if dwf.FDwfDigitalOutEnableSet(device_data.handle, ctypes.c_int(channel), ctypes.c_int(1)) == 0:
+    if dwf.FDwfDigitalOutEnableSet(device_data.handle, channel, 1) == 0:
         check_error()
     
     # set output type
-    if dwf.FDwfDigitalOutTypeSet(device_data.handle, ctypes.c_int(channel), function) == 0:
+    if dwf.FDwfDigitalOutTypeSet(device_data.handle, channel, function) == 0:
         check_error()
     
     # set frequency
-    if dwf.FDwfDigitalOutDividerSet(device_data.handle, ctypes.c_int(channel), ctypes.c_int(divider)) == 0:
+    if dwf.FDwfDigitalOutDividerSet(device_data.handle, channel, divider) == 0:
         check_error()
 
     # set idle state
-    if dwf.FDwfDigitalOutIdleSet(device_data.handle, ctypes.c_int(channel), idle) == 0:
+    if dwf.FDwfDigitalOutIdleSet(device_data.handle, channel, idle) == 0:
         check_error()
 
     # set PWM signal duty cycle
@@ -111,7 +91,7 @@ def generate(device_data, channel, function, frequency, duty_cycle=50, data=[],
         # calculate steps for low and high parts of the period
         high_steps = int(steps * duty_cycle / 100)
         low_steps = int(steps - high_steps)
-        if dwf.FDwfDigitalOutCounterSet(device_data.handle, ctypes.c_int(channel), ctypes.c_int(low_steps), ctypes.c_int(high_steps)) == 0:
+        if dwf.FDwfDigitalOutCounterSet(device_data.handle, channel, low_steps, high_steps) == 0:
             check_error()
     
     # load custom signal data
@@ -123,7 +103,7 @@ def generate(device_data, channel, function, frequency, duty_cycle=50, data=[],
                 buffer[index >> 3] |= 1 << (index & 7)
     
         # load data
-        if dwf.FDwfDigitalOutDataSet(device_data.handle, ctypes.c_int(channel), ctypes.byref(buffer), ctypes.c_int(len(data))) == 0:
+        if dwf.FDwfDigitalOutDataSet(device_data.handle, channel, ctypes.byref(buffer), len(data)) == 0:
             check_error()
     
     # calculate run length
@@ -131,19 +111,19 @@ def generate(device_data, channel, function, frequency, duty_cycle=50, data=[],
         run_time = len(data) / frequency
     
     # set wait time
-    if dwf.FDwfDigitalOutWaitSet(device_data.handle, ctypes.c_double(wait)) == 0:
+    if dwf.FDwfDigitalOutWaitSet(device_data.handle, wait) == 0:
         check_error()
     
     # set repeat count
-    if dwf.FDwfDigitalOutRepeatSet(device_data.handle, ctypes.c_int(repeat)) == 0:
+    if dwf.FDwfDigitalOutRepeatSet(device_data.handle, repeat) == 0:
         check_error()
     
     # set run length
-    if dwf.FDwfDigitalOutRunSet(device_data.handle, ctypes.c_double(run_time)) == 0:
+    if dwf.FDwfDigitalOutRunSet(device_data.handle, run_time) == 0:
         check_error()
 
     # enable triggering
-    if dwf.FDwfDigitalOutRepeatTriggerSet(device_data.handle, ctypes.c_int(trigger_enabled)) == 0:
+    if dwf.FDwfDigitalOutRepeatTriggerSet(device_data.handle, trigger_enabled) == 0:
         check_error()
     
     if trigger_enabled:
@@ -166,7 +146,7 @@ def generate(device_data, channel, function, frequency, duty_cycle=50, data=[],
                 check_error()
 
     # start generating the signal
-    if dwf.FDwfDigitalOutConfigure(device_data.handle, ctypes.c_int(True)) == 0:
+    if dwf.FDwfDigitalOutConfigure(device_data.handle, True) == 0:
         check_error()
     return
 
@@ -186,9 +166,9 @@ def enable(device_data, channel):
     """ enables a digital output channel """
     if device_data.name == "Digital Discovery":
         channel = channel - 24
-    if dwf.FDwfDigitalOutEnableSet(device_data.handle, ctypes.c_int(channel), ctypes.c_int(1)) == 0:
+    if dwf.FDwfDigitalOutEnableSet(device_data.handle, channel, 1) == 0:
         check_error()
-    if dwf.FDwfDigitalOutConfigure(device_data.handle, ctypes.c_int(True)) == 0:
+    if dwf.FDwfDigitalOutConfigure(device_data.handle, True) == 0:
         check_error()
     return
 
@@ -198,8 +178,8 @@ def disable(device_data, channel):
     """ disables a digital output channel """
     if device_data.name == "Digital Discovery":
         channel = channel - 24
-    if dwf.FDwfDigitalOutEnableSet(device_data.handle, ctypes.c_int(channel), ctypes.c_int(0)) == 0:
+    if dwf.FDwfDigitalOutEnableSet(device_data.handle, channel, 0) == 0:
         check_error()
-    if dwf.FDwfDigitalOutConfigure(device_data.handle, ctypes.c_int(True)) == 0:
+    if dwf.FDwfDigitalOutConfigure(device_data.handle, True) == 0:
         check_error()
     return
@@ -1,7 +1,30 @@
 """
 This module controls the protocol instrument
+
+the protocol submodules are imported on first use
 """
 
-from WF_SDK.protocol import i2c
-from WF_SDK.protocol import spi
-from WF_SDK.protocol import uart
+import importlib                  # import the submodules on first use
+
+# submodules which can be accessed as attributes of the package
+__all__ = ["i2c", "spi", "uart"]
+
+"""-----------------------------------------------------------------------"""
+
+def __getattr__(name):
+    """
+        import a protocol submodule when it is first accessed
+    """
+    if name not in __all__:
+        raise AttributeError("module 'WF_SDK.protocol' has no attribute '" + name + "'")
+    module = importlib.import_module("WF_SDK.protocol." + name)
+    globals()[name] = module    # later accesses don't call this function again
+    return module
+
+"""-----------------------------------------------------------------------"""
+
+def __dir__():
+    """
+        list the lazily loaded names too
+    """
+    return sorted(set(globals()) | set(__all__))
@@ -1,38 +1,20 @@
 """ PROTOCOL: I2C CONTROL FUNCTIONS: open, read, write, exchange, spy, close """
 
 import ctypes                     # import the C compatible data types
-from sys import platform, path    # this is needed to check the OS type and get the PATH
-from os import sep                # OS specific file path separators
-import inspect                    # get caller information
-
-# load the dynamic library, get constants path (the path is OS specific)
-if platform.startswith("win"):
-    # on Windows
-    dwf = ctypes.cdll.dwf
-    constants_path = "C:" + sep + "Program Files (x86)" + sep + "Digilent" + sep + "WaveFormsSDK" + sep + "samples" + sep + "py"
-elif platform.startswith("darwin"):
-    # on macOS
-    lib_path = sep + "Library" + sep + "Frameworks" + sep + "dwf.framework" + sep + "dwf"
-    dwf = ctypes.cdll.LoadLibrary(lib_path)
-    constants_path = sep + "Applications" + sep + "WaveForms.app" + sep + "Contents" + sep + "Resources" + sep + "SDK" + sep + "samples" + sep + "py"
-else:
-    # on Linux
-    dwf = ctypes.cdll.LoadLibrary("libdwf.so")
-    constants_path = sep + "usr" + sep + "share" + sep + "digilent" + sep + "waveforms" + sep + "samples" + sep + "py"
-
-# import constants
-path.append(constants_path)
-import dwfconstants as constants
+from WF_SDK.library import dwf, constants
 from WF_SDK.device import check_error, warning
 
 """-----------------------------------------------------------------------"""
 
-def __check_warning__(device_data, nak):
+def __check_warning__(nak, function):
     """
         check for I2C errors
+
+        parameters: - the NAK index returned by the SDK
+                    - the name of the calling function
     """
-    if nak != 0:
-        raise warning("NAK: index " + str(nak), inspect.stack()[1].function, "protocol/i2c")
+    if nak.value != 0:
+        raise warning("NAK: index " + str(nak.value), function, "protocol/i2c")
     return
 
 """-----------------------------------------------------------------------"""
@@ -53,20 +35,20 @@ def open(device_data, sda, scl, clk_rate=100e03, stretching=True):
 
     # clock stretching
     if stretching:
-        if dwf.FDwfDigitalI2cStretchSet(device_data.handle, ctypes.c_int(1)) == 0:
+        if dwf.FDwfDigitalI2cStretchSet(device_data.handle, 1) == 0:
             check_error()
     else:
-        if dwf.FDwfDigitalI2cStretchSet(device_data.handle, ctypes.c_int(0)) == 0:
+        if dwf.FDwfDigitalI2cStretchSet(device_data.handle, 0) == 0:
             check_error()
 
     # set clock frequency
-    if dwf.FDwfDigitalI2cRateSet(device_data.handle, ctypes.c_double(clk_rate)) == 0:
+    if dwf.FDwfDigitalI2cRateSet(device_data.handle, clk_rate) == 0:
         check_error()
 
     #  set communication lines
-    if dwf.FDwfDigitalI2cSclSet(device_data.handle, ctypes.c_int(scl)) == 0:
+    if dwf.FDwfDigitalI2cSclSet(device_data.handle, scl) == 0:
         check_error()
-    if dwf.FDwfDigitalI2cSdaSet(device_data.handle, ctypes.c_int(sda)) == 0:
+    if dwf.FDwfDigitalI2cSdaSet(device_data.handle, sda) == 0:
         check_error()
 
     # check bus
@@ -77,9 +59,9 @@ def open(device_data, sda, scl, clk_rate=100e03, stretching=True):
         raise warning("I2C bus lockup", "open", "protocol/i2c")
 
     # write 0 bytes
-    if dwf.FDwfDigitalI2cWrite(device_data.handle, ctypes.c_int(0), ctypes.c_int(0), ctypes.c_int(0), ctypes.byref(nak)) == 0:
+    if dwf.FDwfDigitalI2cWrite(device_data.handle, 0, None, 0, ctypes.byref(nak)) == 0:
         check_error()
-    __check_warning__(device_data, nak)
+    __check_warning__(nak, "open")
     return
 
 """-----------------------------------------------------------------------"""
@@ -106,11 +88,11 @@ def write(device_data, data, address):
 
     # send
     nak = ctypes.c_int()
-    if dwf.FDwfDigitalI2cWrite(device_data.handle, ctypes.c_int(address << 1), buffer, ctypes.c_int(ctypes.sizeof(buffer)), ctypes.byref(nak)) == 0:
+    if dwf.FDwfDigitalI2cWrite(device_data.handle, address << 1, buffer, ctypes.sizeof(buffer), ctypes.byref(nak)) == 0:
         check_error()
 
     # check for not acknowledged
-    __check_warning__(device_data, nak)
+    __check_warning__(nak, "write")
     return ""
 
 """-----------------------------------------------------------------------"""
@@ -130,14 +112,14 @@ def read(device_data, count, address):
 
     # receive
     nak = ctypes.c_int()
-    if dwf.FDwfDigitalI2cRead(device_data.handle, ctypes.c_int(address << 1), buffer, ctypes.c_int(count), ctypes.byref(nak)) == 0:
+    if dwf.FDwfDigitalI2cRead(device_data.handle, address << 1, buffer, count, ctypes.byref(nak)) == 0:
         check_error()
 
     # decode data
     data = [int(element) for element in buffer]
 
     # check for not acknowledged
-    __check_warning__(device_data, nak)
+    __check_warning__(nak, "read")
     return data
 
 """-----------------------------------------------------------------------"""
@@ -170,14 +152,14 @@ def exchange(device_data, data, count, address):
 
     # send and receive
     nak = ctypes.c_int()
-    if dwf.FDwfDigitalI2cWriteRead(device_data.handle, ctypes.c_int(address << 1), tx_buffer, ctypes.c_int(ctypes.sizeof(tx_buffer)), buffer, ctypes.c_int(count), ctypes.byref(nak)) == 0:
+    if dwf.FDwfDigitalI2cWriteRead(device_data.handle, address << 1, tx_buffer, ctypes.sizeof(tx_buffer), buffer, count, ctypes.byref(nak)) == 0:
         check_error()
 
     # decode data
     rec_data = [int(element) for element in buffer]
 
     # check for not acknowledged
-    __check_warning__(device_data, nak)
+    __check_warning__(nak, "exchange")
     return rec_data
 
 """-----------------------------------------------------------------------"""
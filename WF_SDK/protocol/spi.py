@@ -1,27 +1,7 @@
 """ PROTOCOL: SPI CONTROL FUNCTIONS: open, read, write, exchange, close """
 
 import ctypes                     # import the C compatible data types
-from sys import platform, path    # this is needed to check the OS type and get the PATH
-from os import sep                # OS specific file path separators
-
-# load the dynamic library, get constants path (the path is OS specific)
-if platform.startswith("win"):
-    # on Windows
-    dwf = ctypes.cdll.dwf
-    constants_path = "C:" + sep + "Program Files (x86)" + sep + "Digilent" + sep + "WaveFormsSDK" + sep + "samples" + sep + "py"
-elif platform.startswith("darwin"):
-    # on macOS
-    lib_path = sep + "Library" + sep + "Frameworks" + sep + "dwf.framework" + sep + "dwf"
-    dwf = ctypes.cdll.LoadLibrary(lib_path)
-    constants_path = sep + "Applications" + sep + "WaveForms.app" + sep + "Contents" + sep + "Resources" + sep + "SDK" + sep + "samples" + sep + "py"
-else:
-    # on Linux
-    dwf = ctypes.cdll.LoadLibrary("libdwf.so")
-    constants_path = sep + "usr" + sep + "share" + sep + "digilent" + sep + "waveforms" + sep + "samples" + sep + "py"
-
-# import constants
-path.append(constants_path)
-import dwfconstants as constants
+from WF_SDK.library import dwf, constants
 from WF_SDK.device import check_error
 
 """-----------------------------------------------------------------------"""
@@ -40,51 +20,51 @@ def open(device_data, cs, sck, miso=None, mosi=None, clk_frequency=1e06, mode=0,
                     - order (endianness, True means MSB first - default, False means LSB first)
     """
     # set the clock frequency
-    if dwf.FDwfDigitalSpiFrequencySet(device_data.handle, ctypes.c_double(clk_frequency)) == 0:
+    if dwf.FDwfDigitalSpiFrequencySet(device_data.handle, clk_frequency) == 0:
         check_error()
 
     # set the clock pin
-    if dwf.FDwfDigitalSpiClockSet(device_data.handle, ctypes.c_int(sck)) == 0:
+    if dwf.FDwfDigitalSpiClockSet(device_data.handle, sck) == 0:
         check_error()
 
     if mosi != None:
         # set the mosi pin
-        if dwf.FDwfDigitalSpiDataSet(device_data.handle, ctypes.c_int(0), ctypes.c_int(mosi)) == 0:
+        if dwf.FDwfDigitalSpiDataSet(device_data.handle, 0, mosi) == 0:
             check_error()
 
         # set the initial state
-        if dwf.FDwfDigitalSpiIdleSet(device_data.handle, ctypes.c_int(0), constants.DwfDigitalOutIdleZet) == 0:
+        if dwf.FDwfDigitalSpiIdleSet(device_data.handle, 0, constants.DwfDigitalOutIdleZet) == 0:
             check_error()
 
     if miso != None:
         # set the miso pin
-        if dwf.FDwfDigitalSpiDataSet(device_data.handle, ctypes.c_int(1), ctypes.c_int(miso)) == 0:
+        if dwf.FDwfDigitalSpiDataSet(device_data.handle, 1, miso) == 0:
             check_error()
 
         # set the initial state
-        if dwf.FDwfDigitalSpiIdleSet(device_data.handle, ctypes.c_int(1), constants.DwfDigitalOutIdleZet) == 0:
+        if dwf.FDwfDigitalSpiIdleSet(device_data.handle, 1, constants.DwfDigitalOutIdleZet) == 0:
             check_error()
 
     # set the SPI mode
-    if dwf.FDwfDigitalSpiModeSet(device_data.handle, ctypes.c_int(mode)) == 0:
+    if dwf.FDwfDigitalSpiModeSet(device_data.handle, mode) == 0:
         check_error()
 
     # set endianness
     if order:
         # MSB first
-        if dwf.FDwfDigitalSpiOrderSet(device_data.handle, ctypes.c_int(1)) == 0:
+        if dwf.FDwfDigitalSpiOrderSet(device_data.handle, 1) == 0:
             check_error()
     else:
         # LSB first
-        if dwf.FDwfDigitalSpiOrderSet(device_data.handle, ctypes.c_int(0)) == 0:
+        if dwf.FDwfDigitalSpiOrderSet(device_data.handle, 0) == 0:
             check_error()
 
     # set the cs pin HIGH
-    if dwf.FDwfDigitalSpiSelect(device_data.handle, ctypes.c_int(cs), ctypes.c_int(1)) == 0:
+    if dwf.FDwfDigitalSpiSelect(device_data.handle, cs, 1) == 0:
         check_error()
 
     # dummy write
-    if dwf.FDwfDigitalSpiWriteOne(device_data.handle, ctypes.c_int(1), ctypes.c_int(0), ctypes.c_int(0)) == 0:
+    if dwf.FDwfDigitalSpiWriteOne(device_data.handle, 1, 0, 0) == 0:
         check_error()
     return
 
@@ -101,18 +81,18 @@ def read(device_data, count, cs):
         return:     - integer list containing the received bytes
     """
     # enable the chip select line
-    if dwf.FDwfDigitalSpiSelect(device_data.handle, ctypes.c_int(cs), ctypes.c_int(0)) == 0:
+    if dwf.FDwfDigitalSpiSelect(device_data.handle, cs, 0) == 0:
         check_error()
 
     # create buffer to store data
     buffer = (ctypes.c_ubyte*count)()
 
     # read array of 8 bit elements
-    if dwf.FDwfDigitalSpiRead(device_data.handle, ctypes.c_int(1), ctypes.c_int(8), buffer, ctypes.c_int(len(buffer))) == 0:
+    if dwf.FDwfDigitalSpiRead(device_data.handle, 1, 8, buffer, len(buffer)) == 0:
         check_error()
 
     # disable the chip select line
-    if dwf.FDwfDigitalSpiSelect(device_data.handle, ctypes.c_int(cs), ctypes.c_int(1)) == 0:
+    if dwf.FDwfDigitalSpiSelect(device_data.handle, cs, 1) == 0:
         check_error()
 
     # decode data
@@ -137,7 +117,7 @@ def write(device_data, data, cs):
         data = "".join(chr(element) for element in data)
 
     # enable the chip select line
-    if dwf.FDwfDigitalSpiSelect(device_data.handle, ctypes.c_int(cs), ctypes.c_int(0)) == 0:
+    if dwf.FDwfDigitalSpiSelect(device_data.handle, cs, 0) == 0:
         check_error()
 
     # create buffer to write
@@ -147,11 +127,11 @@ def write(device_data, data, cs):
         buffer[index] = ctypes.c_ubyte(data[index])
 
     # write array of 8 bit elements
-    if dwf.FDwfDigitalSpiWrite(device_data.handle, ctypes.c_int(1), ctypes.c_int(8), buffer, ctypes.c_int(len(buffer))) == 0:
+    if dwf.FDwfDigitalSpiWrite(device_data.handle, 1, 8, buffer, len(buffer)) == 0:
         check_error()
 
     # disable the chip select line
-    if dwf.FDwfDigitalSpiSelect(device_data.handle, ctypes.c_int(cs), ctypes.c_int(1)) == 0:
+    if dwf.FDwfDigitalSpiSelect(device_data.handle, cs, 1) == 0:
         check_error()
 
     return
@@ -176,7 +156,7 @@ def exchange(device_data, data, count, cs):
         data = "".join(chr(element) for element in data)
 
     # enable the chip select line
-    if dwf.FDwfDigitalSpiSelect(device_data.handle, ctypes.c_int(cs), ctypes.c_int(0)) == 0:
+    if dwf.FDwfDigitalSpiSelect(device_data.handle, cs, 0) == 0:
         check_error()
 
     # create buffer to write
@@ -189,11 +169,11 @@ def exchange(device_data, data, count, cs):
     rx_buffer = (ctypes.c_ubyte*count)()
 
     # write to MOSI and read from MISO
-    if dwf.FDwfDigitalSpiWriteRead(device_data.handle, ctypes.c_int(1), ctypes.c_int(8), tx_buffer, ctypes.c_int(len(tx_buffer)), rx_buffer, ctypes.c_int(len(rx_buffer))) == 0:
+    if dwf.FDwfDigitalSpiWriteRead(device_data.handle, 1, 8, tx_buffer, len(tx_buffer), rx_buffer, len(rx_buffer)) == 0:
         check_error()
 
     # disable the chip select line
-    if dwf.FDwfDigitalSpiSelect(device_data.handle, ctypes.c_int(cs), ctypes.c_int(1)) == 0:
+    if dwf.FDwfDigitalSpiSelect(device_data.handle, cs, 1) == 0:
         check_error()
 
     # decode data
@@ -231,28 +211,28 @@ def spy(device_data, count, cs, sck, mosi=None, miso=None, word_size=8):
     if dwf.FDwfDigitalInAcquisitionModeSet(device_data.handle, constants.acqmodeRecord)
 
     # for sync mode set divider to -1 
-    if dwf.FDwfDigitalInDividerSet(device_data.handle, ctypes.c_int(-1))
+    if dwf.FDwfDigitalInDividerSet(device_data.handle, -1)
 
     # 8 bit per sample format, DIO 0-7
-    if dwf.FDwfDigitalInSampleFormatSet(device_data.handle, ctypes.c_int(8))
+    if dwf.FDwfDigitalInSampleFormatSet(device_data.handle, 8)
 
     # continuous sampling 
-    if dwf.FDwfDigitalInTriggerPositionSet(device_data.handle, ctypes.c_int(-1))
+    if dwf.FDwfDigitalInTriggerPositionSet(device_data.handle, -1)
 
     # in sync mode the trigger is used for sampling condition
     # trigger detector mask: low & high & (rising | falling)
-    if dwf.FDwfDigitalInTriggerSet(device_data.handle, ctypes.c_int(0), ctypes.c_int(0), ctypes.c_int((1 << sck) | (1 << cs)), ctypes.c_int(0))
+    if dwf.FDwfDigitalInTriggerSet(device_data.handle, 0, 0, (1 << sck) | (1 << cs), 0)
     # sample on clock rising edge for sampling bits, or CS rising edge to detect frames
 
     # start detection
-    if dwf.FDwfDigitalInConfigure(device_data.handle, ctypes.c_bool(0), ctypes.c_bool(1))
+    if dwf.FDwfDigitalInConfigure(device_data.handle, 0, 1)
 
     # fill buffer
-    status = ctypes.c_byte()
+    status = ctypes.c_ubyte()
     available = ctypes.c_int()
     lost = ctypes.c_int()
     corrupted = ctypes.c_int()
-    if dwf.FDwfDigitalInStatus(device_data.handle, ctypes.c_int(1), ctypes.byref(status))
+    if dwf.FDwfDigitalInStatus(device_data.handle, 1, ctypes.byref(status))
     if dwf.FDwfDigitalInStatusRecord(device_data.handle, ctypes.byref(available), ctypes.byref(lost), ctypes.byref(corrupted))
 
     # check data integrity
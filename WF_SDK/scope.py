@@ -1,36 +1,25 @@
-""" OSCILLOSCOPE CONTROL FUNCTIONS: open, measure, trigger, record, close """
+""" OSCILLOSCOPE CONTROL FUNCTIONS: open, measure, measure_batch, trigger, record, record_channels, record_raw, to_volts, record_segments, stream, decimate, close, instrument, session """
 
 import ctypes                     # import the C compatible data types
-from sys import platform, path    # this is needed to check the OS type and get the PATH
-from os import sep                # OS specific file path separators
-
-# load the dynamic library, get constants path (the path is OS specific)
-if platform.startswith("win"):
-    # on Windows
-    dwf = ctypes.cdll.dwf
-    constants_path = "C:" + sep + "Program Files (x86)" + sep + "Digilent" + sep + "WaveFormsSDK" + sep + "samples" + sep + "py"
-elif platform.startswith("darwin"):
-    # on macOS
-    lib_path = sep + "Library" + sep + "Frameworks" + sep + "dwf.framework" + sep + "dwf"
-    dwf = ctypes.cdll.LoadLibrary(lib_path)
-    constants_path = sep + "Applications" + sep + "WaveForms.app" + sep + "Contents" + sep + "Resources" + sep + "SDK" + sep + "samples" + sep + "py"
-else:
-    # on Linux
-    dwf = ctypes.cdll.LoadLibrary("libdwf.so")
-    constants_path = sep + "usr" + sep + "share" + sep + "digilent" + sep + "waveforms" + sep + "samples" + sep + "py"
-
-# import constants
-path.append(constants_path)
-import dwfconstants as constants
-from WF_SDK.device import check_error
+import numpy as np                # arrays for the recorded data
+import time                       # time stamps of the measurements
+from WF_SDK.library import dwf, constants
+from WF_SDK.device import check_error, error, wait_policy
+from WF_SDK import device
 
 """-----------------------------------------------------------------------"""
 
 class data:
-    """ stores the sampling frequency and the buffer size """
+    """ stores the sampling frequency, the buffer size and the wait policy """
     sampling_frequency = 20e06
     buffer_size = 8192
     max_buffer_size = 0
+    decimation = 1          # host-side decimation factor of record and record_channels
+    mode = None             # acquisition filter mode
+    wait = wait_policy()    # how the acquisitions wait for data, see device.wait_policy
+
+# the settings of new instruments, the module functions change data
+__defaults__ = device.__new_data__(data)
 
 """-----------------------------------------------------------------------"""
 
@@ -44,7 +33,41 @@ class trigger_source:
 
 """-----------------------------------------------------------------------"""
 
-def open(device_data, sampling_frequency=20e06, buffer_size=0, offset=0, amplitude_range=5):
+class filter_mode:
+    """ acquisition filter modes, used when sampling below the ADC rate """
+    decimate = constants.filterDecimate     # keep every n-th ADC sample
+    average = constants.filterAverage       # average the ADC samples of each period
+    min_max = constants.filterMinMax        # alternate the minimum and maximum of each period
+
+"""-----------------------------------------------------------------------"""
+
+class scaling:
+    """
+        converts raw 16-bit samples into volts: volts = raw * gain + offset
+
+        one gain and one offset value is stored for each recorded channel
+    """
+    def __init__(self, channels, gain, offset):
+        self.channels = list(channels)
+        self.gain = np.asarray(gain, dtype=np.float64)
+        self.offset = np.asarray(offset, dtype=np.float64)
+        return
+
+class measurement:
+    """ batch of voltage readings with their statistics """
+    def __init__(self, times, values, start=None):
+        self.times = times          # time of each reading in seconds, relative to the first reading
+        self.start = start          # host time of the first reading in seconds (time.time() scale)
+        self.values = values        # readings in Volts
+        self.mean = float(np.mean(values))
+        self.std = float(np.std(values))
+        self.min = float(np.min(values))
+        self.max = float(np.max(values))
+        return
+
+"""-----------------------------------------------------------------------"""
+
+def open(device_data, sampling_frequency=20e06, buffer_size=0, offset=0, amplitude_range=5, mode=filter_mode.decimate, decimation=1):
     """
         initialize the oscilloscope
 
@@ -53,37 +76,10 @@ def open(device_data, sampling_frequency=20e06, buffer_size=0, offset=0, amplitu
                     - buffer size, default is 0 (maximum)
                     - offset voltage in Volts, default is 0V
                     - amplitude range in Volts, default is ±5V
+                    - mode - acquisition filter: filter_mode.decimate, average or min_max, default is decimate
+                    - decimation - host-side decimation factor applied by record and record_channels, default is 1 (off)
     """
-    # set global variables
-    data.sampling_frequency = sampling_frequency
-    data.max_buffer_size = device_data.analog.input.max_buffer_size
-
-    # enable all channels
-    if dwf.FDwfAnalogInChannelEnableSet(device_data.handle, ctypes.c_int(-1), ctypes.c_bool(True)) == 0:
-        check_error()
-    
-    # set offset voltage (in Volts)
-    if dwf.FDwfAnalogInChannelOffsetSet(device_data.handle, ctypes.c_int(-1), ctypes.c_double(offset)) == 0:
-        check_error()
-    
-    # set range (maximum signal amplitude in Volts)
-    if dwf.FDwfAnalogInChannelRangeSet(device_data.handle, ctypes.c_int(-1), ctypes.c_double(amplitude_range)) == 0:
-        check_error()
-    
-    # set the buffer size (data point in a recording)
-    if buffer_size == 0:
-        buffer_size = data.max_buffer_size
-    data.buffer_size = buffer_size
-    if dwf.FDwfAnalogInBufferSizeSet(device_data.handle, ctypes.c_int(buffer_size)) == 0:
-        check_error()
-    
-    # set the acquisition frequency (in Hz)
-    if dwf.FDwfAnalogInFrequencySet(device_data.handle, ctypes.c_double(sampling_frequency)) == 0:
-        check_error()
-    
-    # disable averaging (for more info check the documentation)
-    if dwf.FDwfAnalogInChannelFilterSet(device_data.handle, ctypes.c_int(-1), constants.filterDecimate) == 0:
-        check_error()
+    instrument(device_data, data).open(sampling_frequency, buffer_size, offset, amplitude_range, mode, decimation)
     return
 
 """-----------------------------------------------------------------------"""
@@ -97,22 +93,29 @@ def measure(device_data, channel):
         
         returns:    - the measured voltage in Volts
     """
-    # set up the instrument
-    if dwf.FDwfAnalogInConfigure(device_data.handle, ctypes.c_bool(False), ctypes.c_bool(False)) == 0:
-        check_error()
-    
-    # read data to an internal buffer
-    if dwf.FDwfAnalogInStatus(device_data.handle, ctypes.c_bool(False), ctypes.c_int(0)) == 0:
-        check_error()
-    
-    # extract data from that buffer
-    voltage = ctypes.c_double()   # variable to store the measured voltage
-    if dwf.FDwfAnalogInStatusSample(device_data.handle, ctypes.c_int(channel - 1), ctypes.byref(voltage)) == 0:
-        check_error()
-    
-    # store the result as float
-    voltage = voltage.value
-    return voltage
+    return instrument(device_data, data).measure(channel)
+
+"""-----------------------------------------------------------------------"""
+
+def measure_batch(device_data, channel, count=1000, sampling_frequency=10e03):
+    """
+        measure many voltages from one acquisition
+
+        the readings are averaged in hardware over the sampling period; the
+        buffer size, the sampling frequency and the filter are restored afterwards
+
+        the times are relative to the first reading, they come from the sample
+        clock; the host time of the first reading is estimated from the moment
+        the full buffer was seen, so it is late by at most one poll interval
+
+        parameters: - device data
+                    - the selected oscilloscope channel (1-2, or 1-4)
+                    - number of readings, default is 1000 (at most the device buffer size)
+                    - sampling frequency of the readings in Hz, default is 10kHz
+
+        returns:    - a measurement with the times, the values and their statistics
+    """
+    return instrument(device_data, data).measure_batch(channel, count, sampling_frequency)
 
 """-----------------------------------------------------------------------"""
 
@@ -128,85 +131,763 @@ def trigger(device_data, enable, source=trigger_source.none, channel=1, timeout=
                     - trigger edge rising - True means rising, False means falling, default is rising
                     - trigger level in Volts, default is 0V
     """
-    if enable and source != constants.trigsrcNone:
-        # enable/disable auto triggering
-        if dwf.FDwfAnalogInTriggerAutoTimeoutSet(device_data.handle, ctypes.c_double(timeout)) == 0:
+    instrument(device_data, data).trigger(enable, source, channel, timeout, edge_rising, level)
+    return
+
+"""-----------------------------------------------------------------------"""
+
+def record(device_data, channel, as_array=False, out=None):
+    """
+        record an analog signal
+
+        parameters: - device data
+                    - the selected oscilloscope channel (1-2, or 1-4)
+                    - as_array - True returns a numpy array instead of a list, default is False
+                    - out - preallocated float64 numpy array to record into, default is None (implies as_array)
+
+        returns:    - a list, or a numpy array with the recorded voltages
+    """
+    return instrument(device_data, data).record(channel, as_array, out)
+
+"""-----------------------------------------------------------------------"""
+
+def record_channels(device_data, channels=None, out=None):
+    """
+        record several analog channels from the same acquisition
+
+        parameters: - device data
+                    - list of the selected oscilloscope channels (1-2, or 1-4), default is None (every channel)
+                    - out - preallocated float64 numpy array of shape (channels, buffer size), default is None
+
+        returns:    - a numpy array with one row of recorded voltages for each channel
+    """
+    return instrument(device_data, data).record_channels(channels, out)
+
+"""-----------------------------------------------------------------------"""
+
+def record_raw(device_data, channels=None, out=None):
+    """
+        record raw 16-bit samples, the conversion to volts is left to to_volts
+
+        parameters: - device data
+                    - list of the selected oscilloscope channels (1-2, or 1-4), default is None (every channel)
+                    - out - preallocated int16 numpy array of shape (channels, buffer size), default is None
+
+        returns:    - a numpy array with one row of raw samples for each channel
+                    - the scaling of the channels
+    """
+    return instrument(device_data, data).record_raw(channels, out)
+
+"""-----------------------------------------------------------------------"""
+
+def to_volts(raw, scale, dtype=np.float64, out=None):
+    """
+        convert raw 16-bit samples into volts
+
+        parameters: - raw samples, with one row for each channel of the scaling (or one row for a single channel)
+                    - scaling returned by record_raw
+                    - dtype - float32 or float64, default is float64
+                    - out - preallocated numpy array for the result, default is None
+
+        returns:    - a numpy array with the voltages
+    """
+    raw = np.asarray(raw)
+    gain = scale.gain
+    offset = scale.offset
+    if raw.ndim == 2:
+        gain = gain[:, np.newaxis]
+        offset = offset[:, np.newaxis]
+    elif gain.size != 1:
+        raise error("Select the row of a single channel, or convert every channel", "to_volts", "scope")
+    else:
+        gain = gain[0]
+        offset = offset[0]
+    if out is None:
+        out = np.empty(raw.shape, dtype=dtype)
+    np.multiply(raw, gain, out=out, casting="unsafe")
+    np.add(out, offset, out=out, casting="unsafe")
+    return out
+
+"""-----------------------------------------------------------------------"""
+
+def record_segments(device_data, channel, frames, out=None, period=None):
+    """
+        record many short triggered frames
+
+        set up the trigger with the trigger function first; the instrument re-arms
+        itself when a frame is fetched, so there is no configure call between frames
+
+        parameters: - device data
+                    - the selected oscilloscope channel (1-2, or 1-4)
+                    - frames - number of frames to record
+                    - out - preallocated float64 numpy array of shape (frames, buffer size), default is None
+                    - period - expected time between triggers in seconds, default is None (median of the recorded gaps)
+
+        returns:    - a numpy array with one row of recorded voltages for each frame
+                    - a numpy array with the trigger time of each frame in seconds
+                    - the number of triggers missed between the frames while the instrument re-armed
+    """
+    return instrument(device_data, data).record_segments(channel, frames, out, period)
+
+"""-----------------------------------------------------------------------"""
+
+def stream(device_data, channel, duration=0, policy=None):
+    """
+        stream an analog signal in record mode
+
+        the samples are read in chunks as they arrive, so the length of the
+        recording is not limited by the device buffer and the memory use
+        does not grow with the duration; setting the cancel event of the
+        wait policy ends the stream
+
+        parameters: - device data
+                    - the selected oscilloscope channel (1-2, or 1-4), or a list of channels
+                    - duration of the recording in seconds, default is 0 (until the generator is closed)
+                    - policy - wait policy between reads, default is None (data.wait)
+
+        yields:     - a tuple: (array with the new voltages, number of lost samples, number of corrupted samples)
+                      the array has one row for each channel if a list of channels is selected
+    """
+    return instrument(device_data, data).stream(channel, duration, policy)
+
+"""-----------------------------------------------------------------------"""
+
+def decimate(samples, factor, taps=16, out=None):
+    """
+        low-pass filter and downsample signals on the host
+
+        a windowed-sinc filter is evaluated in polyphase form, so only the
+        kept output samples are computed
+
+        parameters: - samples - a numpy array, the last axis is decimated
+                    - factor - decimation factor
+                    - taps - filter taps for each output sample, default is 16
+                    - out - preallocated float64 numpy array to write into, default is None
+                      (the same shape as samples, with at least ceil(samples / factor) points on the last axis)
+
+        returns:    - a numpy array with ceil(samples / factor) points on the last axis
+    """
+    samples = np.asarray(samples, dtype=np.float64)
+    factor = max(int(factor), 1)
+    count = samples.shape[-1]
+    result_count = -(-count // factor)
+    if out is not None:
+        if not isinstance(out, np.ndarray) or out.dtype != np.float64 or not out.flags.writeable:
+            raise error("The output must be a writeable float64 array", "decimate", "scope")
+        if out.shape[:-1] != samples.shape[:-1] or out.shape[-1] < result_count:
+            raise error("The output array must have the shape " + str(samples.shape[:-1] + (result_count,)), "decimate", "scope")
+    if factor == 1:
+        if out is None:
+            return samples.copy()
+        out[..., :count] = samples
+        return out[..., :count]
+
+    # design the anti-aliasing filter (cutoff at the new Nyquist frequency),
+    # the odd length puts a tap on the kept sample, so there is no half-sample delay
+    length = factor * taps + 1
+    index = np.arange(length) - (length - 1) / 2
+    kernel = np.sinc(index / factor) * np.hamming(length)
+    kernel /= kernel.sum()
+
+    # pad for the filter delay, so the output stays aligned with the input
+    delay = (length - 1) // 2
+    padding = max((result_count - 1) * factor + length - delay - count, 0)
+    padded = np.pad(samples, [(0, 0)] * (samples.ndim - 1) + [(delay, padding)], mode="edge")
+
+    # sum the contribution of every phase: y[m] = sum_p sum_q h[qM+p] x[(m+q)M+p]
+    flat = padded.reshape(-1, padded.shape[-1])
+    result = np.empty(samples.shape[:-1] + (result_count,)) if out is None else out[..., :result_count]
+    rows = result.reshape(flat.shape[0], result_count)     # a view of 1-D and 2-D outputs
+    rows[...] = 0
+    for phase in range(factor):
+        phase_kernel = kernel[phase::factor]
+        for row in range(flat.shape[0]):
+            rows[row] += np.correlate(flat[row, phase::factor], phase_kernel, mode="valid")[:result_count]
+    if not np.may_share_memory(rows, result):
+        result[...] = rows.reshape(result.shape)
+    return result
+
+"""-----------------------------------------------------------------------"""
+
+def close(device_data):
+    """
+        reset the scope
+    """
+    instrument(device_data, data).close()
+    return
+
+"""-----------------------------------------------------------------------"""
+
+class instrument:
+    """
+        oscilloscope of one device with its own settings
+
+        the module functions share the settings in data, while every instrument
+        keeps a separate copy, so the oscilloscopes of several devices can be
+        used from separate threads; the methods are the module functions
+        without the device data
+
+        start, done and read split a record, so the acquisition can be waited
+        for by another loop (see aio)
+
+        parameters: - device data
+                    - settings, default is None (a new copy of the default settings)
+    """
+    def __init__(self, device_data, settings=None):
+        self.device_data = device_data
+        if settings is None:
+            settings = device.__new_data__(__defaults__)
+            settings.wait = wait_policy()
+        self.data = settings
+        return
+
+    def open(self, sampling_frequency=20e06, buffer_size=0, offset=0, amplitude_range=5, mode=filter_mode.decimate, decimation=1):
+        """
+            initialize the oscilloscope, see open
+        """
+        handle = self.device_data.handle
+
+        # set the stored settings
+        self.data.sampling_frequency = sampling_frequency
+        self.data.decimation = max(int(decimation), 1)
+        self.data.mode = mode
+        self.data.max_buffer_size = self.device_data.analog.input.max_buffer_size
+
+        # enable all channels
+        if dwf.FDwfAnalogInChannelEnableSet(handle, -1, True) == 0:
+            check_error()
+
+        # set offset voltage (in Volts)
+        if dwf.FDwfAnalogInChannelOffsetSet(handle, -1, offset) == 0:
+            check_error()
+
+        # set range (maximum signal amplitude in Volts)
+        if dwf.FDwfAnalogInChannelRangeSet(handle, -1, amplitude_range) == 0:
+            check_error()
+
+        # set the buffer size (data point in a recording)
+        if buffer_size == 0:
+            buffer_size = self.data.max_buffer_size
+        self.data.buffer_size = buffer_size
+        if dwf.FDwfAnalogInBufferSizeSet(handle, buffer_size) == 0:
             check_error()
 
-        # set trigger source
-        if dwf.FDwfAnalogInTriggerSourceSet(device_data.handle, source) == 0:
+        # set the acquisition frequency (in Hz)
+        if dwf.FDwfAnalogInFrequencySet(handle, sampling_frequency) == 0:
             check_error()
 
-        # set trigger channel
-        if source == constants.trigsrcDetectorAnalogIn:
-            channel -= 1    # decrement analog channel index
-        if dwf.FDwfAnalogInTriggerChannelSet(device_data.handle, ctypes.c_int(channel)) == 0:
+        # set the acquisition filter (for more info check the documentation)
+        if dwf.FDwfAnalogInChannelFilterSet(handle, -1, mode) == 0:
             check_error()
+        return
+
+    def measure(self, channel):
+        """
+            measure a voltage, see measure
+        """
+        handle = self.device_data.handle
 
-        # set trigger type
-        if dwf.FDwfAnalogInTriggerTypeSet(device_data.handle, constants.trigtypeEdge) == 0:
+        # set up the instrument
+        if dwf.FDwfAnalogInConfigure(handle, False, False) == 0:
             check_error()
 
-        # set trigger level
-        if dwf.FDwfAnalogInTriggerLevelSet(device_data.handle, ctypes.c_double(level)) == 0:
+        # read data to an internal buffer
+        if dwf.FDwfAnalogInStatus(handle, False, None) == 0:
+            check_error("FDwfAnalogInStatus", handle)
+
+        # extract data from that buffer
+        voltage = ctypes.c_double()   # variable to store the measured voltage
+        if dwf.FDwfAnalogInStatusSample(handle, channel - 1, ctypes.byref(voltage)) == 0:
+            check_error("FDwfAnalogInStatusSample", handle)
+
+        # store the result as float
+        voltage = voltage.value
+        return voltage
+
+    def measure_batch(self, channel, count=1000, sampling_frequency=10e03):
+        """
+            measure many voltages from one acquisition, see measure_batch
+        """
+        handle = self.device_data.handle
+        count = max(1, min(int(count), self.device_data.analog.input.max_buffer_size))
+        settings = (self.data.buffer_size, self.data.sampling_frequency, self.data.decimation, self.data.mode)
+
+        # configure a single acquisition of averaged readings
+        if dwf.FDwfAnalogInBufferSizeSet(handle, count) == 0:
+            check_error()
+        if dwf.FDwfAnalogInFrequencySet(handle, sampling_frequency) == 0:
             check_error()
+        if dwf.FDwfAnalogInChannelFilterSet(handle, -1, filter_mode.average) == 0:
+            check_error()
+        self.data.buffer_size = count
+        self.data.sampling_frequency = sampling_frequency
+        self.data.decimation = 1
+
+        try:
+            # the buffer is full when the acquisition is seen done, the time is taken from that moment
+            self.__acquire__()
+            finished = time.time()
+            values = self.read(channel, True)
+        finally:
+            # restore the previous settings
+            self.data.buffer_size, self.data.sampling_frequency, self.data.decimation, self.data.mode = settings
+            if dwf.FDwfAnalogInBufferSizeSet(handle, self.data.buffer_size) == 0:
+                check_error()
+            if dwf.FDwfAnalogInFrequencySet(handle, self.data.sampling_frequency) == 0:
+                check_error()
+            if dwf.FDwfAnalogInChannelFilterSet(handle, -1, self.data.mode if self.data.mode is not None else filter_mode.decimate) == 0:
+                check_error()
+        times = np.arange(count) / sampling_frequency
+        return measurement(times, values, finished - count / sampling_frequency)
+
+    def trigger(self, enable, source=trigger_source.none, channel=1, timeout=0, edge_rising=True, level=0):
+        """
+            set up triggering, see trigger
+        """
+        handle = self.device_data.handle
+        if enable and source != constants.trigsrcNone:
+            # enable/disable auto triggering
+            if dwf.FDwfAnalogInTriggerAutoTimeoutSet(handle, timeout) == 0:
+                check_error()
+
+            # set trigger source
+            if dwf.FDwfAnalogInTriggerSourceSet(handle, source) == 0:
+                check_error()
+
+            # set trigger channel
+            if source == constants.trigsrcDetectorAnalogIn:
+                channel -= 1    # decrement analog channel index
+            if dwf.FDwfAnalogInTriggerChannelSet(handle, channel) == 0:
+                check_error()
+
+            # set trigger type
+            if dwf.FDwfAnalogInTriggerTypeSet(handle, constants.trigtypeEdge) == 0:
+                check_error()
 
-        # set trigger edge
-        if edge_rising:
-            # rising edge
-            if dwf.FDwfAnalogInTriggerConditionSet(device_data.handle, constants.trigcondRisingPositive) == 0:
+            # set trigger level
+            if dwf.FDwfAnalogInTriggerLevelSet(handle, level) == 0:
                 check_error()
+
+            # set trigger edge
+            if edge_rising:
+                # rising edge
+                if dwf.FDwfAnalogInTriggerConditionSet(handle, constants.trigcondRisingPositive) == 0:
+                    check_error()
+            else:
+                # falling edge
+                if dwf.FDwfAnalogInTriggerConditionSet(handle, constants.trigcondFallingNegative) == 0:
+                    check_error()
         else:
-            # falling edge
-            if dwf.FDwfAnalogInTriggerConditionSet(device_data.handle, constants.trigcondFallingNegative) == 0:
+            # turn off the trigger
+            if dwf.FDwfAnalogInTriggerSourceSet(handle, constants.trigsrcNone) == 0:
                 check_error()
-    else:
-        # turn off the trigger
-        if dwf.FDwfAnalogInTriggerSourceSet(device_data.handle, constants.trigsrcNone) == 0:
+        return
+
+    def record(self, channel, as_array=False, out=None):
+        """
+            record an analog signal, see record
+        """
+        # check the output array before starting the acquisition
+        if out is not None:
+            __check_out__(out, np.float64, self.__record_size__(), "record")
+
+        # acquire a full buffer
+        self.__acquire__()
+        return self.read(channel, as_array, out)
+
+    def record_channels(self, channels=None, out=None):
+        """
+            record several analog channels from the same acquisition, see record_channels
+        """
+        # check the output array before starting the acquisition
+        channels, out = self.__channels_out__(channels, out, "record_channels")
+
+        # acquire a full buffer once, for every channel
+        self.__acquire__()
+        return self.read_channels(channels, out)
+
+    def record_raw(self, channels=None, out=None):
+        """
+            record raw 16-bit samples, see record_raw
+        """
+        handle = self.device_data.handle
+        buffer_size = self.data.buffer_size
+        if channels is None:
+            channels = range(1, self.device_data.analog.input.channel_count + 1)
+        channels = list(channels)
+
+        # check the output array before starting the acquisition
+        if out is None:
+            out = np.empty((len(channels), buffer_size), dtype=np.int16)
+        else:
+            __check_out__(out, np.int16, len(channels) * buffer_size, "record_raw")
+            if out.ndim != 2 or out.shape[0] != len(channels) or out.shape[1] < buffer_size:
+                raise error("The output array must have the shape (" + str(len(channels)) + ", " + str(buffer_size) + ")", "record_raw", "scope")
+
+        # acquire a full buffer once, for every channel
+        self.__acquire__()
+
+        # copy the raw samples and read the range and offset of each channel
+        gain = []
+        offset = []
+        channel_range = ctypes.c_double()
+        channel_offset = ctypes.c_double()
+        for row, channel in enumerate(channels):
+            if dwf.FDwfAnalogInStatusData16(handle, channel - 1, out[row].ctypes.data_as(ctypes.POINTER(ctypes.c_short)), 0, buffer_size) == 0:
+                check_error("FDwfAnalogInStatusData16", handle)
+            if dwf.FDwfAnalogInChannelRangeGet(handle, channel - 1, ctypes.byref(channel_range)) == 0:
+                check_error()
+            if dwf.FDwfAnalogInChannelOffsetGet(handle, channel - 1, ctypes.byref(channel_offset)) == 0:
+                check_error()
+            # the 16-bit range covers the whole input range
+            gain.append(channel_range.value / 65536)
+            offset.append(channel_offset.value)
+        return out[:, :buffer_size], scaling(channels, gain, offset)
+
+    def record_segments(self, channel, frames, out=None, period=None):
+        """
+            record many short triggered frames, see record_segments
+        """
+        handle = self.device_data.handle
+        buffer_size = self.data.buffer_size
+
+        # check the output array before starting the acquisition
+        if out is None:
+            out = np.empty((frames, buffer_size), dtype=np.float64)
+        else:
+            __check_out__(out, np.float64, frames * buffer_size, "record_segments")
+            if out.ndim != 2 or out.shape[0] != frames or out.shape[1] < buffer_size:
+                raise error("The output array must have the shape (" + str(frames) + ", " + str(buffer_size) + ")", "record_segments", "scope")
+        timestamps = np.empty(frames, dtype=np.float64)
+
+        # re-arm automatically after every fetched frame
+        if dwf.FDwfAnalogInAcquisitionModeSet(handle, constants.acqmodeSingle1) == 0:
             check_error()
-    return
+
+        status = ctypes.c_ubyte()       # variable to store buffer status
+        seconds = ctypes.c_uint()       # trigger time: UTC seconds
+        ticks = ctypes.c_uint()         # trigger time: ticks in the second
+        tick_rate = ctypes.c_uint()     # trigger time: ticks per second
+        def ready():
+            if dwf.FDwfAnalogInStatus(handle, True, ctypes.byref(status)) == 0:
+                check_error("FDwfAnalogInStatus", handle)
+            return status.value == constants.DwfStateDone.value
+
+        try:
+            # start the acquisition
+            if dwf.FDwfAnalogInConfigure(handle, False, True) == 0:
+                check_error()
+
+            for frame in range(frames):
+                # wait for the next trigger
+                device.wait(ready, self.data.wait, buffer_size / self.data.sampling_frequency, "record_segments", "scope")
+
+                # copy the frame and its trigger time
+                if dwf.FDwfAnalogInStatusData(handle, channel - 1, out[frame].ctypes.data_as(ctypes.POINTER(ctypes.c_double)), buffer_size) == 0:
+                    check_error("FDwfAnalogInStatusData", handle)
+                if dwf.FDwfAnalogInStatusTime(handle, ctypes.byref(seconds), ctypes.byref(ticks), ctypes.byref(tick_rate)) == 0:
+                    check_error("FDwfAnalogInStatusTime", handle)
+                timestamps[frame] = seconds.value + ticks.value / max(tick_rate.value, 1)
+        finally:
+            # stop the acquisition and switch back to single acquisitions
+            if dwf.FDwfAnalogInConfigure(handle, False, False) == 0:
+                check_error()
+            if dwf.FDwfAnalogInAcquisitionModeSet(handle, constants.acqmodeSingle) == 0:
+                check_error()
+
+        # count the trigger periods without a frame
+        missed = 0
+        if frames > 1:
+            gaps = np.diff(timestamps)
+            if period is None:
+                period = float(np.median(gaps))
+            if period > 0:
+                missed = int(np.sum(np.maximum(np.rint(gaps / period) - 1, 0)))
+        return out[:, :buffer_size], timestamps, missed
+
+    def stream(self, channel, duration=0, policy=None):
+        """
+            stream an analog signal in record mode, see stream
+        """
+        handle = self.device_data.handle
+        if policy is None:
+            policy = self.data.wait
+        single = not isinstance(channel, (list, tuple, range))
+        channels = [channel] if single else list(channel)
+
+        # the chunk buffer is allocated once and reused for every read,
+        # a read never returns more samples than the device buffer holds
+        chunk_size = self.data.max_buffer_size if self.data.max_buffer_size > 0 else self.data.buffer_size
+        fill_size = min(self.data.buffer_size, chunk_size)
+        samples = np.empty((len(channels), chunk_size), dtype=np.float64)
+
+        # set up record mode
+        if dwf.FDwfAnalogInAcquisitionModeSet(handle, constants.acqmodeRecord) == 0:
+            check_error()
+        if dwf.FDwfAnalogInRecordLengthSet(handle, duration) == 0:
+            check_error()
+
+        try:
+            # start the acquisition
+            if dwf.FDwfAnalogInConfigure(handle, False, True) == 0:
+                check_error()
+
+            status = ctypes.c_ubyte()       # variable to store buffer status
+            available = ctypes.c_int()      # number of new samples
+            lost = ctypes.c_int()           # number of samples overwritten before they were read
+            corrupted = ctypes.c_int()      # number of samples which may have been overwritten during the read
+            while True:
+                # read data to an internal buffer
+                if dwf.FDwfAnalogInStatus(handle, True, ctypes.byref(status)) == 0:
+                    check_error("FDwfAnalogInStatus", handle)
+
+                # check the number of new samples
+                if dwf.FDwfAnalogInStatusRecord(handle, ctypes.byref(available), ctypes.byref(lost), ctypes.byref(corrupted)) == 0:
+                    check_error("FDwfAnalogInStatusRecord", handle)
+
+                # copy the new samples
+                count = min(available.value, chunk_size)
+                if count > 0 or lost.value > 0 or corrupted.value > 0:
+                    for row, index in enumerate(channels):
+                        if count > 0:
+                            if dwf.FDwfAnalogInStatusData(handle, index - 1, samples[row].ctypes.data_as(ctypes.POINTER(ctypes.c_double)), count) == 0:
+                                check_error("FDwfAnalogInStatusData", handle)
+                    if single:
+                        chunk = samples[0, :count].copy()
+                    else:
+                        chunk = samples[:, :count].copy()
+                    yield chunk, lost.value + available.value - count, corrupted.value
+
+                # exit loop when the recording is finished
+                if status.value == constants.DwfStateDone.value:
+                    break
+
+                # stop when the wait is cancelled, even if the reads never sleep
+                if policy.cancel is not None and policy.cancel.is_set():
+                    break
+
+                # let the device buffer fill up to about a quarter before the next read
+                if count < fill_size / 4:
+                    delay = min(fill_size / self.data.sampling_frequency / 4, policy.max_interval)
+                    if not device.sleep(policy, delay):
+                        break
+        finally:
+            # stop the acquisition and switch back to single acquisitions
+            if dwf.FDwfAnalogInConfigure(handle, False, False) == 0:
+                check_error()
+            if dwf.FDwfAnalogInAcquisitionModeSet(handle, constants.acqmodeSingle) == 0:
+                check_error()
+        return
+
+    def close(self):
+        """
+            reset the scope
+        """
+        if dwf.FDwfAnalogInReset(self.device_data.handle) == 0:
+            check_error()
+        return
+
+    def __acquire__(self):
+        """
+            start a single acquisition and wait until the buffer is full
+        """
+        self.start()
+        try:
+            device.wait(self.done, self.data.wait, self.data.buffer_size / self.data.sampling_frequency, "record", "scope")
+        except error:
+            # stop the acquisition on timeout or cancellation
+            self.stop()
+            raise
+        return
+
+    def start(self):
+        """
+            start a single acquisition, read the channels when done returns True
+        """
+        if dwf.FDwfAnalogInConfigure(self.device_data.handle, False, True) == 0:
+            check_error()
+        return
+
+    def done(self):
+        """
+            read the instrument status, returns True when the buffer is full
+        """
+        status = ctypes.c_ubyte()    # variable to store buffer status
+        if dwf.FDwfAnalogInStatus(self.device_data.handle, True, ctypes.byref(status)) == 0:
+            check_error("FDwfAnalogInStatus", self.device_data.handle)
+        return status.value == constants.DwfStateDone.value
+
+    def stop(self):
+        """
+            stop the running acquisition
+        """
+        if dwf.FDwfAnalogInConfigure(self.device_data.handle, False, False) == 0:
+            check_error()
+        return
+
+    def read(self, channel, as_array=False, out=None):
+        """
+            copy a channel from the finished acquisition, the parameters are the same as for record
+        """
+        buffer_size = self.data.buffer_size
+        if out is not None:
+            __check_out__(out, np.float64, self.__record_size__(), "read")
+
+        # copy the buffer directly into a numpy array, decimated samples are filtered into out
+        if out is not None or as_array:
+            samples = out
+            if samples is None or self.data.decimation > 1:
+                samples = np.empty(buffer_size, dtype=np.float64)
+            if dwf.FDwfAnalogInStatusData(self.device_data.handle, channel - 1, samples.ctypes.data_as(ctypes.POINTER(ctypes.c_double)), buffer_size) == 0:
+                check_error("FDwfAnalogInStatusData", self.device_data.handle)
+            if self.data.decimation > 1:
+                return decimate(samples[:buffer_size], self.data.decimation, out=out)
+            return samples[:buffer_size]
+
+        # copy buffer
+        buffer = (ctypes.c_double * buffer_size)()   # create an empty buffer
+        if dwf.FDwfAnalogInStatusData(self.device_data.handle, channel - 1, buffer, buffer_size) == 0:
+            check_error("FDwfAnalogInStatusData", self.device_data.handle)
+
+        # convert into list
+        if self.data.decimation > 1:
+            return decimate(np.ctypeslib.as_array(buffer), self.data.decimation).tolist()
+        buffer = [float(element) for element in buffer]
+        return buffer
+
+    def __channels_out__(self, channels, out, function):
+        """
+            select every channel by default and check, or allocate the output array of record_channels
+        """
+        size = self.__record_size__()
+        if channels is None:
+            channels = range(1, self.device_data.analog.input.channel_count + 1)
+        channels = list(channels)
+        if out is None:
+            out = np.empty((len(channels), size), dtype=np.float64)
+        else:
+            __check_out__(out, np.float64, len(channels) * size, function)
+            if out.ndim != 2 or out.shape[0] != len(channels) or out.shape[1] < size:
+                raise error("The output array must have the shape (" + str(len(channels)) + ", " + str(size) + ")", function, "scope")
+        return channels, out
+
+    def read_channels(self, channels=None, out=None):
+        """
+            copy several channels from the finished acquisition, the parameters are the same as for record_channels
+        """
+        channels, out = self.__channels_out__(channels, out, "read_channels")
+        buffer_size = self.data.buffer_size
+        samples = out
+        if self.data.decimation > 1:
+            samples = np.empty((len(channels), buffer_size), dtype=np.float64)
+
+        # copy each channel into its row, decimated samples are filtered into out
+        for row, channel in enumerate(channels):
+            if dwf.FDwfAnalogInStatusData(self.device_data.handle, channel - 1, samples[row].ctypes.data_as(ctypes.POINTER(ctypes.c_double)), buffer_size) == 0:
+                check_error("FDwfAnalogInStatusData", self.device_data.handle)
+        if self.data.decimation > 1:
+            return decimate(samples, self.data.decimation, out=out)
+        return samples[:, :buffer_size]
+
+    def __record_size__(self):
+        """
+            number of samples returned by record and record_channels, after the decimation
+        """
+        return -(-self.data.buffer_size // self.data.decimation)
 
 """-----------------------------------------------------------------------"""
 
-def record(device_data, channel):
+class session(instrument):
     """
-        record an analog signal
+        keeps the oscilloscope configured between captures
+
+        the applied settings are cached, configure only sends the settings
+        which changed, and the instrument is not reset between captures;
+        the cache doesn't know about changes made with the module functions or
+        other instruments, call close after using them on the same device
 
         parameters: - device data
-                    - the selected oscilloscope channel (1-2, or 1-4)
+                    - settings, default is None (a new copy of the default settings)
+    """
+    def __init__(self, device_data, settings=None):
+        instrument.__init__(self, device_data, settings)
+        self.settings = {}      # the settings applied to the instrument
+        return
+
+    def configure(self, sampling_frequency=20e06, buffer_size=0, offset=0, amplitude_range=5, mode=filter_mode.decimate, decimation=1):
+        """
+            apply the changed settings, the parameters are the same as for open
+        """
+        handle = self.device_data.handle
+        self.data.max_buffer_size = self.device_data.analog.input.max_buffer_size
+        if buffer_size == 0:
+            buffer_size = self.data.max_buffer_size
+
+        # the first call initializes every setting
+        if not self.settings:
+            self.open(sampling_frequency, buffer_size, offset, amplitude_range, mode, decimation)
+            self.settings = {"sampling_frequency": sampling_frequency, "buffer_size": buffer_size, "offset": offset, "amplitude_range": amplitude_range, "mode": getattr(mode, "value", mode)}
+            return
+
+        # set offset voltage (in Volts)
+        if self.settings["offset"] != offset:
+            if dwf.FDwfAnalogInChannelOffsetSet(handle, -1, offset) == 0:
+                check_error()
+            self.settings["offset"] = offset
+
+        # set range (maximum signal amplitude in Volts)
+        if self.settings["amplitude_range"] != amplitude_range:
+            if dwf.FDwfAnalogInChannelRangeSet(handle, -1, amplitude_range) == 0:
+                check_error()
+            self.settings["amplitude_range"] = amplitude_range
 
-        returns:    - a list with the recorded voltages
-    """
-    # set up the instrument
-    if dwf.FDwfAnalogInConfigure(device_data.handle, ctypes.c_bool(False), ctypes.c_bool(True)) == 0:
-        check_error()
-    
-    # read data to an internal buffer
-    while True:
-        status = ctypes.c_byte()    # variable to store buffer status
-        if dwf.FDwfAnalogInStatus(device_data.handle, ctypes.c_bool(True), ctypes.byref(status)) == 0:
-            check_error()
-    
-        # check internal buffer status
-        if status.value == constants.DwfStateDone.value:
-                # exit loop when ready
-                break
-    
-    # copy buffer
-    buffer = (ctypes.c_double * data.buffer_size)()   # create an empty buffer
-    if dwf.FDwfAnalogInStatusData(device_data.handle, ctypes.c_int(channel - 1), buffer, ctypes.c_int(data.buffer_size)) == 0:
-        check_error()
-    
-    # convert into list
-    buffer = [float(element) for element in buffer]
-    return buffer
+        # set the buffer size (data point in a recording)
+        if self.settings["buffer_size"] != buffer_size:
+            if dwf.FDwfAnalogInBufferSizeSet(handle, buffer_size) == 0:
+                check_error()
+            self.settings["buffer_size"] = buffer_size
+
+        # set the acquisition frequency (in Hz)
+        if self.settings["sampling_frequency"] != sampling_frequency:
+            if dwf.FDwfAnalogInFrequencySet(handle, sampling_frequency) == 0:
+                check_error()
+            self.settings["sampling_frequency"] = sampling_frequency
+
+        # set the acquisition filter
+        if self.settings["mode"] != getattr(mode, "value", mode):
+            if dwf.FDwfAnalogInChannelFilterSet(handle, -1, mode) == 0:
+                check_error()
+            self.settings["mode"] = getattr(mode, "value", mode)
+        self.data.mode = mode
+
+        # the recordings read these values
+        self.data.sampling_frequency = sampling_frequency
+        self.data.buffer_size = buffer_size
+        self.data.decimation = max(int(decimation), 1)
+        return
+
+    def record(self, channel, as_array=True, out=None):
+        """
+            record an analog signal with the current settings, see record
+        """
+        return instrument.record(self, channel, as_array, out)
+
+    def close(self):
+        """
+            reset the scope and forget the cached settings
+        """
+        self.settings = {}
+        instrument.close(self)
+        return
 
 """-----------------------------------------------------------------------"""
 
-def close(device_data):
+def __check_out__(out, dtype, size, function):
     """
-        reset the scope
+        check that a preallocated array can be written by the SDK
     """
-    if dwf.FDwfAnalogInReset(device_data.handle) == 0:
-        check_error()
+    if not isinstance(out, np.ndarray) or out.dtype != dtype or not out.flags.c_contiguous or not out.flags.writeable:
+        raise error("The output must be a writeable, contiguous " + np.dtype(dtype).name + " array", function, "scope")
+    if out.size < size:
+        raise error("The output array is smaller than the buffer (" + str(size) + " samples)", function, "scope")
     return
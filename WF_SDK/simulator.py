@@ -0,0 +1,1638 @@
+""" SIMULATOR: NumPy model of the libdwf functions used by the package, select it with library.select("simulator") """
+
+import ctypes                     # the arguments are C compatible data types
+import math                       # scalar math of the signal models
+import threading                  # the calls are serialized, like in libdwf
+import time                       # the device clock
+import numpy as np                # vectorized signal models
+
+"""-----------------------------------------------------------------------"""
+
+class settings:
+    """
+        the simulated hardware, change it before the first device is opened
+
+        every simulated device is an Analog Discovery 2 with the AnalogIO channels
+        of the other devices (digital supply, DMM, system monitor), so every module
+        of the package can be used; wavegen channel 1 and 2 are looped back into
+        scope channel 1 and 2, the digital outputs and the static I/O into the
+        logic analyzer, UART TX into RX and SPI MOSI into MISO when they use the
+        same DIO line, and I2C memories answer at the listed addresses
+    """
+    device_count = 1            # number of connected devices
+    realtime = True             # False: the device clock jumps ahead instead of waiting for acquisitions
+    noise = 1e-03               # RMS noise of the oscilloscope inputs in Volts
+    seed = None                 # seed of the noise, None is random
+    i2c_addresses = [0x50]      # 7-bit addresses of the simulated 256 byte I2C memories
+
+"""-----------------------------------------------------------------------"""
+
+class constants:
+    """ the values of dwfconstants used by the package """
+    hdwfNone = ctypes.c_int(0)
+    enumfilterAll = ctypes.c_int(0)
+    devidEExplorer = ctypes.c_int(1)
+    devidDiscovery = ctypes.c_int(2)
+    devidDiscovery2 = ctypes.c_int(3)
+    devidDDiscovery = ctypes.c_int(4)
+    devidADP3X50 = ctypes.c_int(6)
+    devidADP5250 = ctypes.c_int(8)
+    DwfStateReady = ctypes.c_ubyte(0)
+    DwfStateConfig = ctypes.c_ubyte(4)
+    DwfStatePrefill = ctypes.c_ubyte(5)
+    DwfStateArmed = ctypes.c_ubyte(1)
+    DwfStateWait = ctypes.c_ubyte(7)
+    DwfStateTriggered = ctypes.c_ubyte(3)
+    DwfStateRunning = ctypes.c_ubyte(3)
+    DwfStateDone = ctypes.c_ubyte(2)
+    stsRdy = ctypes.c_ubyte(0)
+    stsArm = ctypes.c_ubyte(1)
+    stsDone = ctypes.c_ubyte(2)
+    stsTrig = ctypes.c_ubyte(3)
+    stsCfg = ctypes.c_ubyte(4)
+    stsPrefill = ctypes.c_ubyte(5)
+    stsNotDone = ctypes.c_ubyte(6)
+    stsTrigDly = ctypes.c_ubyte(7)
+    stsError = ctypes.c_ubyte(8)
+    stsBusy = ctypes.c_ubyte(9)
+    stsStop = ctypes.c_ubyte(10)
+    trigsrcNone = ctypes.c_ubyte(0)
+    trigsrcPC = ctypes.c_ubyte(1)
+    trigsrcDetectorAnalogIn = ctypes.c_ubyte(2)
+    trigsrcDetectorDigitalIn = ctypes.c_ubyte(3)
+    trigsrcAnalogIn = ctypes.c_ubyte(4)
+    trigsrcDigitalIn = ctypes.c_ubyte(5)
+    trigsrcDigitalOut = ctypes.c_ubyte(6)
+    trigsrcAnalogOut1 = ctypes.c_ubyte(7)
+    trigsrcAnalogOut2 = ctypes.c_ubyte(8)
+    trigsrcAnalogOut3 = ctypes.c_ubyte(9)
+    trigsrcAnalogOut4 = ctypes.c_ubyte(10)
+    trigsrcExternal1 = ctypes.c_ubyte(11)
+    trigsrcExternal2 = ctypes.c_ubyte(12)
+    trigsrcExternal3 = ctypes.c_ubyte(13)
+    trigsrcExternal4 = ctypes.c_ubyte(14)
+    acqmodeSingle = ctypes.c_int(0)
+    acqmodeScanShift = ctypes.c_int(1)
+    acqmodeScanScreen = ctypes.c_int(2)
+    acqmodeRecord = ctypes.c_int(3)
+    acqmodeOvers = ctypes.c_int(4)
+    acqmodeSingle1 = ctypes.c_int(5)
+    filterDecimate = ctypes.c_int(0)
+    filterAverage = ctypes.c_int(1)
+    filterMinMax = ctypes.c_int(2)
+    trigtypeEdge = ctypes.c_int(0)
+    trigtypePulse = ctypes.c_int(1)
+    trigtypeTransition = ctypes.c_int(2)
+    trigtypeWindow = ctypes.c_int(3)
+    trigcondRisingPositive = ctypes.c_int(0)
+    trigcondFallingNegative = ctypes.c_int(1)
+    DwfTriggerSlopeRise = ctypes.c_int(0)
+    DwfTriggerSlopeFall = ctypes.c_int(1)
+    DwfTriggerSlopeEither = ctypes.c_int(2)
+    funcDC = ctypes.c_ubyte(0)
+    funcSine = ctypes.c_ubyte(1)
+    funcSquare = ctypes.c_ubyte(2)
+    funcTriangle = ctypes.c_ubyte(3)
+    funcRampUp = ctypes.c_ubyte(4)
+    funcRampDown = ctypes.c_ubyte(5)
+    funcNoise = ctypes.c_ubyte(6)
+    funcPulse = ctypes.c_ubyte(7)
+    funcTrapezium = ctypes.c_ubyte(8)
+    funcSinePower = ctypes.c_ubyte(9)
+    funcCustom = ctypes.c_ubyte(30)
+    funcPlay = ctypes.c_ubyte(31)
+    AnalogOutNodeCarrier = ctypes.c_int(0)
+    AnalogOutNodeFM = ctypes.c_int(1)
+    AnalogOutNodeAM = ctypes.c_int(2)
+    DwfAnalogOutIdleDisable = ctypes.c_int(0)
+    DwfAnalogOutIdleOffset = ctypes.c_int(1)
+    DwfAnalogOutIdleInitial = ctypes.c_int(2)
+    DwfDigitalOutTypePulse = ctypes.c_int(0)
+    DwfDigitalOutTypeCustom = ctypes.c_int(1)
+    DwfDigitalOutTypeRandom = ctypes.c_int(2)
+    DwfDigitalOutTypeROM = ctypes.c_int(3)
+    DwfDigitalOutIdleInit = ctypes.c_int(0)
+    DwfDigitalOutIdleLow = ctypes.c_int(1)
+    DwfDigitalOutIdleHigh = ctypes.c_int(2)
+    DwfDigitalOutIdleZet = ctypes.c_int(3)
+    DwfWindowRectangular = ctypes.c_int(0)
+    DwfWindowTriangular = ctypes.c_int(1)
+    DwfWindowHamming = ctypes.c_int(2)
+    DwfWindowHann = ctypes.c_int(3)
+    DwfWindowCosine = ctypes.c_int(4)
+    DwfWindowBlackmanHarris = ctypes.c_int(5)
+    DwfWindowFlatTop = ctypes.c_int(6)
+    DwfWindowKaiser = ctypes.c_int(7)
+    DwfDmmResistance = ctypes.c_double(1)
+    DwfDmmContinuity = ctypes.c_double(2)
+    DwfDmmDiode = ctypes.c_double(3)
+    DwfDmmDCVoltage = ctypes.c_double(4)
+    DwfDmmACVoltage = ctypes.c_double(5)
+    DwfDmmDCCurrent = ctypes.c_double(6)
+    DwfDmmACCurrent = ctypes.c_double(7)
+    DwfDmmDCLowCurrent = ctypes.c_double(8)
+    DwfDmmACLowCurrent = ctypes.c_double(9)
+    DwfDmmTemperature = ctypes.c_double(10)
+    dwfercNoErc = ctypes.c_int(0)
+    dwfercUnknownError = ctypes.c_int(1)
+    dwfercApiLockTimeout = ctypes.c_int(2)
+    dwfercAlreadyOpened = ctypes.c_int(3)
+    dwfercNotSupported = ctypes.c_int(4)
+    dwfercInvalidParameter0 = ctypes.c_int(0x10)
+    dwfercInvalidParameter1 = ctypes.c_int(0x11)
+    dwfercInvalidParameter2 = ctypes.c_int(0x12)
+    dwfercInvalidParameter3 = ctypes.c_int(0x13)
+    dwfercInvalidParameter4 = ctypes.c_int(0x14)
+
+"""-----------------------------------------------------------------------"""
+
+class hardware:
+    """ limits of the simulated device """
+    version = "3.22.2 simulator"
+    device_id = constants.devidDiscovery2.value
+    device_revision = 4
+    clock = 100e06                  # ADC, DAC and digital clock frequency
+    scope_channels = 2
+    scope_buffer = 8192
+    scope_bits = 14
+    scope_ranges = [5.0, 50.0]      # input ranges in Volts (peak to peak)
+    wavegen_channels = 2
+    wavegen_buffer = 4096
+    wavegen_play_buffer = 16384     # device buffer of the play mode
+    wavegen_limit = 5.0             # output amplitude + offset limit in Volts
+    wavegen_frequency = 12e06
+    digital_channels = 16
+    logic_buffer = 4096
+    pattern_counter = 32768
+    pattern_buffer = 16384
+
+"""-----------------------------------------------------------------------"""
+
+class library:
+    """
+        the simulated libdwf, the functions are created on first access
+
+        the functions behave like the ctypes functions of libdwf: the arguments
+        are checked against argtypes, errcheck is called, they return 0 on failure
+        and the error is read with FDwfGetLastError and FDwfGetLastErrorMsg
+    """
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.devices = {}       # handle: simulated device
+        self.opened = {}        # enumeration index: handle
+        self.next_handle = 1
+        self.error = (constants.dwfercNoErc.value, "")
+        self.random = np.random.default_rng(settings.seed)
+        return
+
+    def __getattr__(self, name):
+        if not name.startswith("FDwf"):
+            raise AttributeError(name)
+        if hasattr(self, "__" + name + "__"):
+            method = getattr(self, "__" + name + "__")
+        elif hasattr(__device__, name):
+            method = self.__dispatch__(name)
+        else:
+            raise AttributeError(name)
+        function = __function__(name, method, self)
+        setattr(self, name, function)
+        return function
+
+    def __dispatch__(self, name):
+        """
+            call a device function with the device of the handle
+        """
+        def method(handle, *arguments):
+            device = self.devices.get(__value__(handle))
+            if device is None:
+                raise __failure__(constants.dwfercInvalidParameter0.value, "Invalid device handle")
+            return getattr(device, name)(*arguments)
+        return method
+
+    # system and device
+    def __FDwfGetLastError__(self, code):
+        __store__(code, self.error[0])
+
+    def __FDwfGetLastErrorMsg__(self, message):
+        __text__(message, self.error[1])
+
+    def __FDwfGetVersion__(self, version):
+        __text__(version, hardware.version)
+
+    def __FDwfEnum__(self, device_type, count):
+        device_type = __value__(device_type)
+        if device_type in (constants.enumfilterAll.value, hardware.device_id):
+            __store__(count, settings.device_count)
+        else:
+            __store__(count, 0)
+        return settings.device_count
+
+    def __FDwfEnumDeviceType__(self, index, device_id, revision):
+        self.__check_index__(index)
+        __store__(device_id, hardware.device_id)
+        __store__(revision, hardware.device_revision)
+
+    def __FDwfEnumDeviceIsOpened__(self, index, opened):
+        self.__check_index__(index)
+        __store__(opened, int(__value__(index) in self.opened))
+
+    def __FDwfEnumSN__(self, index, serial):
+        self.__check_index__(index)
+        __text__(serial, "SN:SIM%06d" % __value__(index))
+
+    def __FDwfDeviceOpen__(self, index, handle):
+        return self.__FDwfDeviceConfigOpen__(index, 0, handle)
+
+    def __FDwfDeviceConfigOpen__(self, index, config, handle):
+        __store__(handle, 0)
+        index = __value__(index)
+        if index == -1:
+            # the first free device
+            free = [device for device in range(settings.device_count) if device not in self.opened]
+            index = free[0] if len(free) > 0 else settings.device_count
+        self.__check_index__(index)
+        if index in self.opened:
+            raise __failure__(constants.dwfercAlreadyOpened.value, "Device is busy, used by another application")
+        device_handle = self.next_handle
+        self.next_handle += 1
+        self.devices[device_handle] = __device__(self.random)
+        self.opened[index] = device_handle
+        __store__(handle, device_handle)
+
+    def __FDwfDeviceClose__(self, handle):
+        handle = __value__(handle)
+        if self.devices.pop(handle, None) is None:
+            raise __failure__(constants.dwfercInvalidParameter0.value, "Invalid device handle")
+        for index, device_handle in list(self.opened.items()):
+            if device_handle == handle:
+                del self.opened[index]
+
+    def __check_index__(self, index):
+        """
+            check an enumeration index
+        """
+        if not 0 <= __value__(index) < settings.device_count:
+            raise __failure__(constants.dwfercInvalidParameter0.value, "Device index out of range")
+        return
+
+    # tools
+    def __FDwfSpectrumWindow__(self, window, count, window_type, beta, nebw):
+        count = __value__(count)
+        window = __array__(window, ctypes.c_double, count)
+        window[:] = __window__(__value__(window_type), count, __value__(beta))
+        if nebw is not None:
+            __store__(nebw, float(count * np.sum(window ** 2) / max(np.sum(window) ** 2, 1e-300)))
+
+    def __FDwfSpectrumTransform__(self, buffer, count, magnitude, phase, bins, first, last):
+        count = __value__(count)
+        bins = __value__(bins)
+        samples = __array__(buffer, ctypes.c_double, count)
+        # evaluate the DFT at the requested bins of the normalized frequency range
+        frequencies = np.linspace(__value__(first), __value__(last), bins) / 2
+        spectrum = np.exp(-2j * np.pi * np.outer(frequencies, np.arange(count))) @ samples * 2 / count
+        if magnitude is not None:
+            __array__(magnitude, ctypes.c_double, bins)[:] = np.abs(spectrum)
+        if phase is not None:
+            __array__(phase, ctypes.c_double, bins)[:] = np.angle(spectrum)
+
+"""-----------------------------------------------------------------------"""
+
+class __function__:
+    """
+        a simulated library function, called like a ctypes function
+    """
+    def __init__(self, name, method, library):
+        self.__name__ = name
+        self.method = method
+        self.library = library
+        self.argtypes = None
+        self.restype = ctypes.c_int
+        self.errcheck = None
+        return
+
+    def __call__(self, *arguments):
+        # check the arguments like ctypes does
+        if self.argtypes is not None:
+            if len(arguments) != len(self.argtypes):
+                raise TypeError("this function takes " + str(len(self.argtypes)) + " arguments (" + str(len(arguments)) + " given)")
+            for position, (argtype, argument) in enumerate(zip(self.argtypes, arguments)):
+                try:
+                    argtype.from_param(argument)
+                except Exception as exception:
+                    raise ctypes.ArgumentError("argument " + str(position + 1) + ": " + type(exception).__name__ + ": " + str(exception))
+
+        # call the model, the failures set the last error
+        with self.library.lock:
+            try:
+                result = self.method(*arguments)
+                result = 1 if result is None else int(result)
+            except __failure__ as failure:
+                self.library.error = (failure.code, failure.message)
+                result = 0
+        if self.errcheck is not None:
+            result = self.errcheck(result, self, arguments)
+        return result
+
+class __failure__(Exception):
+    """ a failed simulated call, the code and the message are returned by FDwfGetLastError(Msg) """
+    def __init__(self, code, message):
+        self.code = code
+        self.message = message
+        return
+
+"""-----------------------------------------------------------------------"""
+
+class __node__:
+    """ a node of a wavegen channel """
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.function = constants.funcDC.value
+        self.frequency = 1e03
+        self.amplitude = 1.0        # Volts for the carrier, percentage for AM and FM
+        self.offset = 0.0
+        self.symmetry = 50.0
+        self.data = np.zeros(1)
+        return
+
+class __output__:
+    """ a wavegen channel """
+    def __init__(self, random):
+        self.random = random
+        self.reset()
+        return
+
+    def reset(self):
+        """
+            reset the channel to the default settings
+        """
+        self.nodes = [__node__(True), __node__(), __node__()]
+        self.running = False
+        self.start = 0.0
+        self.wait = 0.0
+        self.run = 0.0
+        self.repeat = 0
+        self.play = {"data": np.zeros(0), "first": 0, "written": 0, "lost": 0}
+        return
+
+    def consumed(self, now):
+        """
+            number of samples the play mode has taken from the buffer
+        """
+        carrier = self.nodes[0]
+        if not self.running:
+            return 0
+        return int(max(now - self.start - self.wait, 0) * carrier.frequency)
+
+    def voltage(self, times):
+        """
+            the output voltage at the given device times
+        """
+        times = np.asarray(times, dtype=np.float64)
+        carrier, fm, am = self.nodes
+        if not self.running or not carrier.enabled:
+            return np.zeros(times.shape)
+
+        # wait, run and repeat
+        local = times - self.start
+        if self.run > 0:
+            period = self.wait + self.run
+            cycle = np.floor(local / period)
+            local = local - cycle * period - self.wait
+            active = (local >= 0) & (cycle >= 0)
+            if self.repeat > 0:
+                active &= cycle < self.repeat
+        else:
+            local = local - self.wait
+            active = local >= 0
+
+        # the phase of the carrier, with frequency modulation
+        phase = carrier.frequency * local
+        if fm.enabled and fm.amplitude != 0:
+            deviation = carrier.frequency * fm.amplitude / 100
+            if fm.function == constants.funcSine.value:
+                phase = phase + deviation * (1 - np.cos(2 * np.pi * fm.frequency * local)) / (2 * np.pi * max(fm.frequency, 1e-300))
+            else:
+                modulation = deviation * __shape__(fm, fm.frequency * local, self.random)
+                steps = np.diff(local, prepend=local[..., :1]) if local.ndim > 0 else 0
+                phase = phase + np.cumsum(modulation * steps, axis=-1)
+        if carrier.function == constants.funcPlay.value:
+            # the streamed samples, the output is 0 where they weren't written in time
+            play = self.play
+            index = np.floor(np.maximum(local, 0) * carrier.frequency).astype(np.int64) - play["first"]
+            valid = (index >= 0) & (index < play["data"].size)
+            signal = carrier.amplitude * np.where(valid, play["data"][np.clip(index, 0, max(play["data"].size - 1, 0))] if play["data"].size > 0 else 0.0, 0.0)
+        else:
+            signal = carrier.amplitude * __shape__(carrier, phase, self.random)
+
+        # amplitude modulation
+        if am.enabled and am.amplitude != 0:
+            signal = signal * (1 + am.amplitude / 100 * __shape__(am, am.frequency * local, self.random))
+        signal = np.where(active, carrier.offset + signal, carrier.offset)
+        return np.clip(signal, -hardware.wavegen_limit, hardware.wavegen_limit)
+
+"""-----------------------------------------------------------------------"""
+
+class __device__:
+    """ a simulated device, the methods are the functions which get a device handle """
+    def __init__(self, random):
+        self.random = random
+        self.epoch = time.perf_counter()
+        self.utc = time.time()
+        self.virtual = 0.0
+        self.outputs = [__output__(random) for _ in range(hardware.wavegen_channels)]
+        self.__analog_in_reset__()
+        self.__analog_io_reset__()
+        self.__digital_in_reset__()
+        self.__digital_out_reset__()
+        self.__digital_io_reset__()
+        self.uart = {"rate": 9600.0, "bits": 8, "parity": 0, "stop": 1.0, "tx": 0, "rx": 0, "received": bytearray()}
+        self.spi = {"frequency": 1e06, "clock": 0, "data": {}, "mode": 0, "order": 1, "select": {}}
+        self.i2c = {"rate": 100e03, "stretch": 1, "scl": 0, "sda": 1, "memory": {}}
+        return
+
+    def now(self):
+        """
+            the device time in seconds since the device was opened
+        """
+        if settings.realtime:
+            return time.perf_counter() - self.epoch
+        return self.virtual
+
+    def __advance__(self, moment):
+        """
+            move the virtual device clock forward
+        """
+        if not settings.realtime:
+            self.virtual = max(self.virtual, moment)
+        return
+
+    # analog input
+    def __analog_in_reset__(self):
+        """
+            reset the oscilloscope to the default settings
+        """
+        self.scope = {"frequency": 100e06, "buffer": hardware.scope_buffer, "mode": constants.acqmodeSingle.value,
+                      "length": 0.0, "enabled": [True] * hardware.scope_channels, "range": [hardware.scope_ranges[0]] * hardware.scope_channels,
+                      "offset": [0.0] * hardware.scope_channels, "filter": [constants.filterDecimate.value] * hardware.scope_channels,
+                      "source": constants.trigsrcNone.value, "channel": 0, "level": 0.0, "condition": constants.trigcondRisingPositive.value,
+                      "timeout": 0.0, "state": constants.DwfStateReady.value, "armed": 0.0, "trigger": None, "searched": 0.0,
+                      "data": np.zeros((hardware.scope_channels, 0)), "read": 0, "record": (0, 0, 0)}
+        return
+
+    def FDwfAnalogInReset(self):
+        self.__analog_in_reset__()
+
+    def FDwfAnalogInChannelCount(self, count):
+        __store__(count, hardware.scope_channels)
+
+    def FDwfAnalogInBufferSizeInfo(self, minimum, maximum):
+        __store__(minimum, 16)
+        __store__(maximum, hardware.scope_buffer)
+
+    def FDwfAnalogInBufferSizeSet(self, size):
+        self.scope["buffer"] = int(min(max(__value__(size), 16), hardware.scope_buffer))
+
+    def FDwfAnalogInBitsInfo(self, bits):
+        __store__(bits, hardware.scope_bits)
+
+    def FDwfAnalogInFrequencyInfo(self, minimum, maximum):
+        __store__(minimum, hardware.clock / (1 << 30))
+        __store__(maximum, hardware.clock)
+
+    def FDwfAnalogInFrequencySet(self, frequency):
+        # the sample rate is the ADC clock divided by an integer
+        divider = max(round(hardware.clock / max(__value__(frequency), 1e-03)), 1)
+        self.scope["frequency"] = hardware.clock / divider
+
+    def FDwfAnalogInFrequencyGet(self, frequency):
+        __store__(frequency, self.scope["frequency"])
+
+    def FDwfAnalogInAcquisitionModeSet(self, mode):
+        self.scope["mode"] = __value__(mode)
+
+    def FDwfAnalogInRecordLengthSet(self, length):
+        self.scope["length"] = max(float(__value__(length)), 0.0)
+
+    def FDwfAnalogInChannelEnableSet(self, channel, enable):
+        for index in self.__scope_channels__(channel):
+            self.scope["enabled"][index] = bool(__value__(enable))
+
+    def FDwfAnalogInChannelFilterSet(self, channel, mode):
+        for index in self.__scope_channels__(channel):
+            self.scope["filter"][index] = __value__(mode)
+
+    def FDwfAnalogInChannelRangeInfo(self, minimum, maximum, steps):
+        __store__(minimum, hardware.scope_ranges[0])
+        __store__(maximum, hardware.scope_ranges[-1])
+        __store__(steps, len(hardware.scope_ranges))
+
+    def FDwfAnalogInChannelRangeSet(self, channel, voltage_range):
+        # the smallest range which covers the requested one
+        voltage_range = __value__(voltage_range)
+        selected = hardware.scope_ranges[-1]
+        for step in hardware.scope_ranges:
+            if step >= voltage_range * 0.999:
+                selected = step
+                break
+        for index in self.__scope_channels__(channel):
+            self.scope["range"][index] = selected
+
+    def FDwfAnalogInChannelRangeGet(self, channel, voltage_range):
+        __store__(voltage_range, self.scope["range"][self.__scope_channels__(channel)[0]])
+
+    def FDwfAnalogInChannelOffsetInfo(self, minimum, maximum, steps):
+        __store__(minimum, -hardware.scope_ranges[-1] / 2)
+        __store__(maximum, hardware.scope_ranges[-1] / 2)
+        __store__(steps, 1024)
+
+    def FDwfAnalogInChannelOffsetSet(self, channel, offset):
+        for index in self.__scope_channels__(channel):
+            limit = self.scope["range"][index] / 2
+            self.scope["offset"][index] = min(max(float(__value__(offset)), -limit), limit)
+
+    def FDwfAnalogInChannelOffsetGet(self, channel, offset):
+        __store__(offset, self.scope["offset"][self.__scope_channels__(channel)[0]])
+
+    def FDwfAnalogInTriggerSourceSet(self, source):
+        self.scope["source"] = __value__(source)
+
+    def FDwfAnalogInTriggerAutoTimeoutSet(self, timeout):
+        self.scope["timeout"] = max(float(__value__(timeout)), 0.0)
+
+    def FDwfAnalogInTriggerChannelSet(self, channel):
+        self.scope["channel"] = __value__(channel)
+
+    def FDwfAnalogInTriggerTypeSet(self, trigger_type):
+        if __value__(trigger_type) != constants.trigtypeEdge.value:
+            raise __failure__(constants.dwfercNotSupported.value, "Only edge triggers are simulated")
+
+    def FDwfAnalogInTriggerLevelSet(self, level):
+        self.scope["level"] = float(__value__(level))
+
+    def FDwfAnalogInTriggerConditionSet(self, condition):
+        self.scope["condition"] = __value__(condition)
+
+    def FDwfAnalogInConfigure(self, reconfigure, start):
+        if __value__(start):
+            # arm the instrument
+            self.scope["state"] = constants.DwfStateArmed.value
+            self.scope["armed"] = self.now()
+            self.scope["trigger"] = None
+            self.scope["searched"] = self.scope["armed"] + self.__prefill__()
+            self.scope["read"] = 0
+            self.scope["record"] = (0, 0, 0)
+        else:
+            self.scope["state"] = constants.DwfStateReady.value
+
+    def FDwfAnalogInStatus(self, read, status):
+        scope = self.scope
+        if scope["mode"] == constants.acqmodeRecord.value:
+            self.__record_status__(__value__(read))
+        elif scope["state"] in (constants.DwfStateArmed.value, constants.DwfStateTriggered.value):
+            self.__single_status__(__value__(read))
+        elif scope["state"] == constants.DwfStateDone.value and scope["mode"] == constants.acqmodeSingle1.value and __value__(read):
+            # re-arm after the previous frame was fetched
+            scope["state"] = constants.DwfStateArmed.value
+            scope["armed"] = scope["trigger"] + self.__prefill__()
+            scope["trigger"] = None
+            scope["searched"] = scope["armed"] + self.__prefill__()
+            self.__single_status__(True)
+        __store__(status, scope["state"])
+
+    def FDwfAnalogInStatusRecord(self, available, lost, corrupted):
+        __store__(available, self.scope["record"][0])
+        __store__(lost, self.scope["record"][1])
+        __store__(corrupted, self.scope["record"][2])
+
+    def FDwfAnalogInStatusData(self, channel, buffer, count):
+        count = __value__(count)
+        samples = self.scope["data"][self.__scope_channels__(channel)[0]]
+        if count > samples.size:
+            raise __failure__(constants.dwfercInvalidParameter2.value, "The buffer holds only " + str(samples.size) + " samples")
+        __array__(buffer, ctypes.c_double, count)[:] = samples[:count]
+
+    def FDwfAnalogInStatusData16(self, channel, buffer, first, count):
+        index = self.__scope_channels__(channel)[0]
+        first = __value__(first)
+        count = __value__(count)
+        samples = self.scope["data"][index][first:first + count]
+        raw = np.rint((samples - self.scope["offset"][index]) / self.scope["range"][index] * 65536)
+        __array__(buffer, ctypes.c_short, count)[:samples.size] = np.clip(raw, -32768, 32767)
+
+    def FDwfAnalogInStatusSample(self, channel, voltage):
+        index = self.__scope_channels__(channel)[0]
+        __store__(voltage, float(self.__sample__(index, np.array([self.now()]))[0]))
+
+    def FDwfAnalogInStatusTime(self, seconds, ticks, tick_rate):
+        moment = self.utc + (self.scope["trigger"] if self.scope["trigger"] is not None else self.scope["armed"])
+        whole = math.floor(moment)
+        __store__(seconds, int(whole))
+        __store__(ticks, int((moment - whole) * hardware.clock))
+        __store__(tick_rate, int(hardware.clock))
+
+    def __scope_channels__(self, channel):
+        """
+            the channel indices selected by a channel argument, -1 selects every channel
+        """
+        channel = __value__(channel)
+        if channel == -1:
+            return list(range(hardware.scope_channels))
+        if not 0 <= channel < hardware.scope_channels:
+            raise __failure__(constants.dwfercInvalidParameter1.value, "Channel index out of range")
+        return [channel]
+
+    def __prefill__(self):
+        """
+            the time before the trigger, the trigger is in the middle of the buffer
+        """
+        if self.scope["source"] == constants.trigsrcNone.value:
+            return 0.0
+        return self.scope["buffer"] / 2 / self.scope["frequency"]
+
+    def __single_status__(self, read):
+        """
+            find the trigger of a single acquisition and fill the buffer when it is done
+        """
+        scope = self.scope
+        length = scope["buffer"] / scope["frequency"]
+        if scope["trigger"] is None:
+            scope["trigger"] = self.__find_trigger__()
+            if scope["trigger"] is None:
+                return
+            scope["state"] = constants.DwfStateTriggered.value
+        end = scope["trigger"] + length - self.__prefill__()
+        self.__advance__(end)
+        if self.now() < end:
+            return
+        scope["state"] = constants.DwfStateDone.value
+        if read:
+            times = scope["trigger"] - self.__prefill__() + np.arange(scope["buffer"]) / scope["frequency"]
+            scope["data"] = np.array([self.__sample__(index, times) for index in range(hardware.scope_channels)])
+        return
+
+    def __find_trigger__(self):
+        """
+            search the trigger event between the last search and now
+
+            returns:    - the device time of the trigger, or None
+        """
+        scope = self.scope
+        source = scope["source"]
+        earliest = scope["armed"] + self.__prefill__()
+        if source == constants.trigsrcNone.value:
+            return scope["armed"]
+
+        # the virtual clock moves ahead while waiting for the trigger
+        if not settings.realtime:
+            step = max(scope["buffer"] / scope["frequency"], 1e-03)
+            if scope["timeout"] > 0:
+                step = min(step, scope["timeout"])
+            self.virtual = max(self.virtual, scope["searched"]) + step
+        now = self.now()
+
+        moment = None
+        if source == constants.trigsrcDetectorAnalogIn.value and 0 <= scope["channel"] < hardware.scope_channels:
+            moment = self.__find_edge__(scope["searched"], now)
+        elif source in (constants.trigsrcAnalogOut1.value, constants.trigsrcAnalogOut2.value):
+            # the wavegen start is the trigger event
+            output = self.outputs[source - constants.trigsrcAnalogOut1.value]
+            if output.running and output.start >= earliest and output.start <= now:
+                moment = output.start
+        scope["searched"] = max(scope["searched"], now)
+
+        # auto trigger
+        if moment is None and scope["timeout"] > 0 and now - earliest >= scope["timeout"]:
+            moment = earliest + scope["timeout"]
+        return moment
+
+    def __find_edge__(self, start, stop):
+        """
+            find the first edge crossing the trigger level between two device times
+        """
+        scope = self.scope
+        output = self.outputs[scope["channel"]] if scope["channel"] < len(self.outputs) else None
+        if output is None or stop <= start:
+            return None
+        step = 1 / scope["frequency"]
+        chunk = 1 << 16
+        begin = start
+        while begin < stop:
+            count = int(min(chunk, math.ceil((stop - begin) / step))) + 1
+            times = begin + np.arange(count) * step
+            signal = output.voltage(times)
+            if scope["condition"] == constants.trigcondFallingNegative.value:
+                crossing = np.nonzero((signal[:-1] > scope["level"]) & (signal[1:] <= scope["level"]))[0]
+            else:
+                crossing = np.nonzero((signal[:-1] < scope["level"]) & (signal[1:] >= scope["level"]))[0]
+            if crossing.size > 0:
+                return float(times[crossing[0] + 1])
+            begin = float(times[-1])
+        return None
+
+    def __record_status__(self, read):
+        """
+            deliver the samples recorded since the previous status call
+        """
+        scope = self.scope
+        if scope["state"] not in (constants.DwfStateArmed.value, constants.DwfStateTriggered.value, constants.DwfStateRunning.value):
+            scope["record"] = (0, 0, 0)
+            return
+        scope["state"] = constants.DwfStateRunning.value
+        start = scope["armed"]
+        frequency = scope["frequency"]
+        end = start + scope["length"] if scope["length"] > 0 else math.inf
+        self.__advance__(min(self.virtual + scope["buffer"] / frequency / 2, end))
+        now = min(self.now(), end)
+        total = int((now - start) * frequency)
+        new = total - scope["read"]
+        available = min(new, scope["buffer"])
+        lost = new - available
+        if read and available > 0:
+            times = start + np.arange(total - available, total) / frequency
+            scope["data"] = np.array([self.__sample__(index, times) for index in range(hardware.scope_channels)])
+        scope["read"] = total
+        scope["record"] = (available, lost, 0)
+        if now >= end:
+            scope["state"] = constants.DwfStateDone.value
+        return
+
+    def __sample__(self, index, times):
+        """
+            the digitized oscilloscope samples of a channel at the given device times
+        """
+        scope = self.scope
+        output = self.outputs[index] if index < len(self.outputs) else None
+        ratio = int(min(max(round(hardware.clock / scope["frequency"]), 1), 16))
+        mode = scope["filter"][index]
+        if ratio > 1 and mode != constants.filterDecimate.value:
+            # evaluate the ADC samples inside every sample period
+            times = times[:, np.newaxis] + np.arange(ratio) / hardware.clock
+        signal = output.voltage(times) if output is not None else np.zeros(np.shape(times))
+        signal = signal + self.random.normal(0, settings.noise, np.shape(times))
+        if np.ndim(signal) == 2:
+            if mode == constants.filterAverage.value:
+                signal = signal.mean(axis=1)
+            else:
+                minimum = signal.min(axis=1)
+                maximum = signal.max(axis=1)
+                signal = np.where(np.arange(signal.shape[0]) % 2 == 0, minimum, maximum)
+
+        # clip to the input range and quantize
+        offset = scope["offset"][index]
+        half_range = scope["range"][index] / 2
+        resolution = scope["range"][index] / (1 << hardware.scope_bits)
+        signal = np.clip(signal, offset - half_range, offset + half_range)
+        return offset + np.rint((signal - offset) / resolution) * resolution
+
+    # analog output
+    def FDwfAnalogOutCount(self, count):
+        __store__(count, hardware.wavegen_channels)
+
+    def FDwfAnalogOutReset(self, channel):
+        for output in self.__outputs__(channel):
+            output.reset()
+
+    def FDwfAnalogOutConfigure(self, channel, start):
+        start = __value__(start)
+        for output in self.__outputs__(channel):
+            if start == 3:
+                # apply the new settings, a running signal isn't restarted
+                continue
+            if start:
+                output.running = True
+                output.start = self.now()
+            else:
+                output.running = False
+
+    def FDwfAnalogOutRunSet(self, channel, run):
+        for output in self.__outputs__(channel):
+            output.run = max(float(__value__(run)), 0.0)
+
+    def FDwfAnalogOutWaitSet(self, channel, wait):
+        for output in self.__outputs__(channel):
+            output.wait = max(float(__value__(wait)), 0.0)
+
+    def FDwfAnalogOutRepeatSet(self, channel, repeat):
+        for output in self.__outputs__(channel):
+            output.repeat = max(int(__value__(repeat)), 0)
+
+    def FDwfAnalogOutNodeInfo(self, channel, nodes):
+        self.__outputs__(channel)
+        __store__(nodes, 0b111)     # carrier, FM and AM
+
+    def FDwfAnalogOutNodeEnableSet(self, channel, node, enable):
+        for output_node in self.__output_nodes__(channel, node):
+            output_node.enabled = bool(__value__(enable))
+
+    def FDwfAnalogOutNodeFunctionSet(self, channel, node, function):
+        for output_node in self.__output_nodes__(channel, node):
+            output_node.function = __value__(function)
+
+    def FDwfAnalogOutNodeFrequencyInfo(self, channel, node, minimum, maximum):
+        self.__output_nodes__(channel, node)
+        __store__(minimum, 0.0)
+        __store__(maximum, hardware.wavegen_frequency)
+
+    def FDwfAnalogOutNodeFrequencySet(self, channel, node, frequency):
+        for output_node in self.__output_nodes__(channel, node):
+            output_node.frequency = min(max(float(__value__(frequency)), 0.0), hardware.wavegen_frequency)
+
+    def FDwfAnalogOutNodeAmplitudeInfo(self, channel, node, minimum, maximum):
+        nodes = self.__output_nodes__(channel, node)
+        __store__(minimum, 0.0 if nodes[0] is self.outputs[0].nodes[0] or __value__(node) == 0 else -100.0)
+        __store__(maximum, hardware.wavegen_limit if __value__(node) == 0 else 100.0)
+
+    def FDwfAnalogOutNodeAmplitudeSet(self, channel, node, amplitude):
+        limit = hardware.wavegen_limit if __value__(node) == 0 else 100.0
+        for output_node in self.__output_nodes__(channel, node):
+            output_node.amplitude = min(max(float(__value__(amplitude)), -limit), limit)
+
+    def FDwfAnalogOutNodeOffsetInfo(self, channel, node, minimum, maximum):
+        self.__output_nodes__(channel, node)
+        limit = hardware.wavegen_limit if __value__(node) == 0 else 100.0
+        __store__(minimum, -limit)
+        __store__(maximum, limit)
+
+    def FDwfAnalogOutNodeOffsetSet(self, channel, node, offset):
+        limit = hardware.wavegen_limit if __value__(node) == 0 else 100.0
+        for output_node in self.__output_nodes__(channel, node):
+            output_node.offset = min(max(float(__value__(offset)), -limit), limit)
+
+    def FDwfAnalogOutNodeSymmetrySet(self, channel, node, symmetry):
+        for output_node in self.__output_nodes__(channel, node):
+            output_node.symmetry = min(max(float(__value__(symmetry)), 0.0), 100.0)
+
+    def FDwfAnalogOutNodeDataInfo(self, channel, node, minimum, maximum):
+        nodes = self.__output_nodes__(channel, node)
+        __store__(minimum, 1)
+        __store__(maximum, self.__data_size__(nodes[0]))
+
+    def FDwfAnalogOutNodeDataSet(self, channel, node, data, count):
+        count = __value__(count)
+        nodes = self.__output_nodes__(channel, node)
+        size = self.__data_size__(nodes[0])
+        if not 0 < count <= size:
+            raise __failure__(constants.dwfercInvalidParameter4.value, "The data must have 1 to " + str(size) + " samples")
+        samples = np.clip(np.array(__array__(data, ctypes.c_double, count)), -1, 1)
+        for output in self.__outputs__(channel):
+            if output.nodes[__value__(node)].function == constants.funcPlay.value:
+                # the first samples of the play mode
+                output.play = {"data": samples, "first": 0, "written": count, "lost": 0}
+            else:
+                output.nodes[__value__(node)].data = samples
+
+    def FDwfAnalogOutStatus(self, channel, status):
+        output = self.__outputs__(channel)[0]
+        carrier = output.nodes[0]
+        if output.running and carrier.function == constants.funcPlay.value and carrier.frequency > 0:
+            # the virtual clock moves a quarter of the play buffer between polls
+            self.__advance__(self.virtual + hardware.wavegen_play_buffer / 4 / carrier.frequency)
+        now = self.now()
+        if not output.running:
+            state = constants.DwfStateReady.value
+        elif output.run > 0 and now >= output.start + output.wait + output.run * max(output.repeat, 1):
+            state = constants.DwfStateDone.value
+        else:
+            state = constants.DwfStateRunning.value
+        __store__(status, state)
+
+    def FDwfAnalogOutNodePlayStatus(self, channel, node, free, lost, corrupted):
+        output = self.__outputs__(channel)[0]
+        self.__output_nodes__(channel, node)
+        play = output.play
+        consumed = output.consumed(self.now())
+        # the samples which were due before they were written are lost
+        lost_total = max(consumed - play["written"], 0)
+        __store__(lost, lost_total - play["lost"])
+        play["lost"] = lost_total
+        __store__(free, hardware.wavegen_play_buffer - (play["written"] - min(consumed, play["written"])))
+        __store__(corrupted, 0)
+
+    def FDwfAnalogOutNodePlayData(self, channel, node, data, count):
+        count = __value__(count)
+        output = self.__outputs__(channel)[0]
+        self.__output_nodes__(channel, node)
+        play = output.play
+        free = hardware.wavegen_play_buffer - (play["written"] - min(output.consumed(self.now()), play["written"]))
+        if not 0 < count <= free:
+            raise __failure__(constants.dwfercInvalidParameter4.value, "Only " + str(free) + " samples fit in the play buffer")
+        samples = np.clip(np.array(__array__(data, ctypes.c_double, count)), -1, 1)
+        # keep the samples which can still be played
+        buffered = np.concatenate((play["data"], samples))[-hardware.wavegen_play_buffer:]
+        play["written"] += count
+        play["first"] = play["written"] - buffered.size
+        play["data"] = buffered
+
+    def __data_size__(self, node):
+        """
+            the buffer size of a node, larger in play mode
+        """
+        if node.function == constants.funcPlay.value:
+            return hardware.wavegen_play_buffer
+        return hardware.wavegen_buffer
+
+    def __outputs__(self, channel):
+        """
+            the wavegen channels selected by a channel argument, -1 selects every channel
+        """
+        channel = __value__(channel)
+        if channel == -1:
+            return self.outputs
+        if not 0 <= channel < len(self.outputs):
+            raise __failure__(constants.dwfercInvalidParameter1.value, "Channel index out of range")
+        return [self.outputs[channel]]
+
+    def __output_nodes__(self, channel, node):
+        """
+            the nodes selected by a channel and a node argument
+        """
+        node = __value__(node)
+        if not 0 <= node < 3:
+            raise __failure__(constants.dwfercInvalidParameter2.value, "Node index out of range")
+        return [output.nodes[node] for output in self.__outputs__(channel)]
+
+    # analog IO
+    def __analog_io_reset__(self):
+        """
+            reset the AnalogIO channels: name, label and nodes (name, unit, set range, read range, default value)
+        """
+        mask = float((1 << hardware.digital_channels) - 1)
+        self.io_channels = [
+            ("Positive Supply", "V+", [["Enable", "", 0, 1, 0], ["Voltage", "V", 0.5, 5, 0], ["Current", "A", 0, 0.7, 0.7]]),
+            ("Negative Supply", "V-", [["Enable", "", 0, 1, 0], ["Voltage", "V", -5, -0.5, 0], ["Current", "A", -0.7, 0, -0.7]]),
+            ("Digital Supply", "VDD", [["Enable", "", 0, 1, 0], ["Voltage", "V", 1.2, 3.3, 3.3], ["Current", "A", 0, 0.1, 0.1],
+                                       ["Drive", "mA", 2, 16, 8], ["DIOPE", "", 0, mask, 0], ["DIOPP", "", 0, mask, 0], ["DINPP", "", 0, mask, 0]]),
+            ("Multimeter", "DMM", [["Enable", "", 0, 1, 0], ["Mode", "", 1, 10, 4], ["Range", "", 0, 1000, 0],
+                                   ["Meas", "", -1e09, 1e09, 0], ["Raw", "", -1e09, 1e09, 0], ["Input", "", 0, 1, 0]]),
+            ("System Monitor", "System", [["Temp", "degC", -40, 125, 0], ["USB Voltage", "V", 0, 6, 0], ["USB Current", "A", 0, 1, 0]]),
+        ]
+        self.io_enabled = False
+        self.io_readings = {}
+        return
+
+    def FDwfAnalogIOReset(self):
+        self.__analog_io_reset__()
+
+    def FDwfAnalogIOEnableSet(self, enable):
+        self.io_enabled = bool(__value__(enable))
+
+    def FDwfAnalogIOChannelCount(self, count):
+        __store__(count, len(self.io_channels))
+
+    def FDwfAnalogIOChannelName(self, channel, name, label):
+        channel = self.__io_channel__(channel)
+        __text__(name, channel[0])
+        __text__(label, channel[1])
+
+    def FDwfAnalogIOChannelInfo(self, channel, count):
+        __store__(count, len(self.__io_channel__(channel)[2]))
+
+    def FDwfAnalogIOChannelNodeName(self, channel, node, name, unit):
+        node = self.__io_node__(channel, node)
+        __text__(name, node[0])
+        __text__(unit, node[1])
+
+    def FDwfAnalogIOChannelNodeSetInfo(self, channel, node, minimum, maximum, steps):
+        node = self.__io_node__(channel, node)
+        __store__(minimum, float(node[2]))
+        __store__(maximum, float(node[3]))
+        __store__(steps, 2 if node[1] == "" and node[3] == 1 else 1024)
+
+    def FDwfAnalogIOChannelNodeStatusInfo(self, channel, node, minimum, maximum, steps):
+        self.FDwfAnalogIOChannelNodeSetInfo(channel, node, minimum, maximum, steps)
+
+    def FDwfAnalogIOChannelNodeSet(self, channel, node, value):
+        node = self.__io_node__(channel, node)
+        node[4] = min(max(float(__value__(value)), node[2]), node[3])
+
+    def FDwfAnalogIOChannelNodeGet(self, channel, node, value):
+        __store__(value, self.__io_node__(channel, node)[4])
+
+    def FDwfAnalogIOStatus(self):
+        # latch the readings of every node
+        now = self.now()
+        readings = {}
+        for channel_index, (name, label, nodes) in enumerate(self.io_channels):
+            settings_of = {node[0]: node[4] for node in nodes}
+            enabled = self.io_enabled and settings_of.get("Enable", 0) > 0.5
+            for node_index, node in enumerate(nodes):
+                value = node[4]
+                if label in ("V+", "V-", "VDD"):
+                    if node[0] == "Voltage":
+                        value = node[4] if enabled else 0.0
+                    elif node[0] == "Current":
+                        value = 0.01 * math.copysign(1, node[3] + node[2]) if enabled else 0.0
+                elif label == "DMM" and node[0] in ("Meas", "Raw"):
+                    value = self.__multimeter__(settings_of, now)
+                elif label == "System":
+                    value = {"Temp": 40.0, "USB Voltage": 5.0, "USB Current": 0.25}[node[0]] + self.random.normal(0, 0.01)
+                readings[(channel_index, node_index)] = value
+        self.io_readings = readings
+
+    def FDwfAnalogIOChannelNodeStatus(self, channel, node, value):
+        self.__io_node__(channel, node)
+        __store__(value, float(self.io_readings.get((__value__(channel), __value__(node)), 0.0)))
+
+    def __io_channel__(self, channel):
+        """
+            an AnalogIO channel: name, label, nodes
+        """
+        channel = __value__(channel)
+        if not 0 <= channel < len(self.io_channels):
+            raise __failure__(constants.dwfercInvalidParameter1.value, "Channel index out of range")
+        return self.io_channels[channel]
+
+    def __io_node__(self, channel, node):
+        """
+            an AnalogIO node: name, unit, minimum, maximum, value
+        """
+        nodes = self.__io_channel__(channel)[2]
+        node = __value__(node)
+        if not 0 <= node < len(nodes):
+            raise __failure__(constants.dwfercInvalidParameter2.value, "Node index out of range")
+        return nodes[node]
+
+    def __multimeter__(self, dmm, now):
+        """
+            the multimeter reading, the input is connected to wavegen channel 1
+        """
+        if dmm.get("Enable", 0) < 0.5:
+            return 0.0
+        mode = round(dmm.get("Mode", constants.DwfDmmDCVoltage.value))
+        signal = self.outputs[0].voltage(now - np.arange(1000) * 1e-04) + self.random.normal(0, settings.noise, 1000)
+        if mode == constants.DwfDmmDCVoltage.value:
+            return float(np.mean(signal))
+        if mode == constants.DwfDmmACVoltage.value:
+            return float(np.std(signal))
+        if mode == constants.DwfDmmResistance.value:
+            return 1e03
+        if mode == constants.DwfDmmContinuity.value:
+            return 0.5
+        if mode == constants.DwfDmmDiode.value:
+            return 0.6
+        if mode == constants.DwfDmmTemperature.value:
+            return 25.0
+        return 0.0
+
+    # digital IO
+    def __digital_io_reset__(self):
+        """
+            reset the static I/O
+        """
+        self.dio_enable = 0
+        self.dio_output = 0
+        self.dio_input = 0
+        return
+
+    def FDwfDigitalIOReset(self):
+        self.__digital_io_reset__()
+
+    def FDwfDigitalIOOutputEnableSet(self, mask):
+        self.dio_enable = __value__(mask) & ((1 << hardware.digital_channels) - 1)
+
+    def FDwfDigitalIOOutputEnableGet(self, mask):
+        __store__(mask, self.dio_enable)
+
+    def FDwfDigitalIOOutputSet(self, mask):
+        self.dio_output = __value__(mask) & ((1 << hardware.digital_channels) - 1)
+
+    def FDwfDigitalIOOutputGet(self, mask):
+        __store__(mask, self.dio_output)
+
+    def FDwfDigitalIOStatus(self):
+        self.dio_input = int(self.__lines__(np.array([self.now()]))[0])
+
+    def FDwfDigitalIOInputStatus(self, mask):
+        __store__(mask, self.dio_input)
+
+    def __lines__(self, times):
+        """
+            the state of the DIO lines at the given device times: pattern generator, static outputs, pulls
+        """
+        nodes = {node[0]: int(node[4]) for node in self.io_channels[2][2]}
+        lines = np.full(np.shape(times), (nodes["DIOPE"] & nodes["DIOPP"]) & ~self.dio_enable, dtype=np.int64)
+        lines |= self.dio_output & self.dio_enable
+        for channel in range(hardware.digital_channels):
+            if self.pattern["channels"][channel]["enabled"] and self.pattern["running"]:
+                bit = self.__pattern_line__(channel, times)
+                lines = (lines & ~(1 << channel)) | (bit << channel)
+        return lines
+
+    # digital input
+    def __digital_in_reset__(self):
+        """
+            reset the logic analyzer
+        """
+        self.logic = {"divider": 1, "format": 16, "buffer": hardware.logic_buffer, "mode": constants.acqmodeSingle.value,
+                      "state": constants.DwfStateReady.value, "armed": 0.0, "data": np.zeros(0, dtype=np.uint32)}
+        return
+
+    def FDwfDigitalInReset(self):
+        self.__digital_in_reset__()
+
+    def FDwfDigitalInInternalClockInfo(self, frequency):
+        __store__(frequency, hardware.clock)
+
+    def FDwfDigitalInDividerSet(self, divider):
+        self.logic["divider"] = max(int(__value__(divider)), 1)
+
+    def FDwfDigitalInBitsInfo(self, bits):
+        __store__(bits, hardware.digital_channels)
+
+    def FDwfDigitalInSampleFormatSet(self, bits):
+        bits = __value__(bits)
+        if bits not in (8, 16, 32):
+            raise __failure__(constants.dwfercInvalidParameter1.value, "The sample format must be 8, 16 or 32 bits")
+        self.logic["format"] = bits
+
+    def FDwfDigitalInBufferSizeInfo(self, size):
+        __store__(size, hardware.logic_buffer)
+
+    def FDwfDigitalInBufferSizeSet(self, size):
+        self.logic["buffer"] = int(min(max(__value__(size), 1), hardware.logic_buffer))
+
+    def FDwfDigitalInAcquisitionModeSet(self, mode):
+        self.logic["mode"] = __value__(mode)
+
+    def FDwfDigitalInTriggerSourceSet(self, source):
+        pass
+
+    def FDwfDigitalInTriggerPositionSet(self, position):
+        pass
+
+    def FDwfDigitalInTriggerPrefillSet(self, prefill):
+        pass
+
+    def FDwfDigitalInTriggerAutoTimeoutSet(self, timeout):
+        pass
+
+    def FDwfDigitalInTriggerSet(self, low, high, rise, fall):
+        pass
+
+    def FDwfDigitalInTriggerResetSet(self, low, high, rise, fall):
+        pass
+
+    def FDwfDigitalInTriggerCountSet(self, count, restart):
+        pass
+
+    def FDwfDigitalInTriggerLengthSet(self, minimum, maximum, sync):
+        pass
+
+    def FDwfDigitalInConfigure(self, reconfigure, start):
+        if __value__(start):
+            self.logic["state"] = constants.stsArm.value
+            self.logic["armed"] = self.now()
+        else:
+            self.logic["state"] = constants.stsRdy.value
+
+    def FDwfDigitalInStatus(self, read, status):
+        logic = self.logic
+        if logic["state"] == constants.stsArm.value:
+            # the triggers are not simulated, the acquisition starts when armed
+            period = logic["divider"] / hardware.clock
+            end = logic["armed"] + logic["buffer"] * period
+            self.__advance__(end)
+            if self.now() >= end:
+                logic["state"] = constants.stsDone.value
+                if __value__(read):
+                    logic["data"] = self.__lines__(logic["armed"] + np.arange(logic["buffer"]) * period).astype(np.uint32)
+        __store__(status, logic["state"])
+
+    def FDwfDigitalInStatusData(self, buffer, size):
+        size = __value__(size)
+        dtype = {8: np.uint8, 16: np.uint16, 32: np.uint32}[self.logic["format"]]
+        count = min(size // np.dtype(dtype).itemsize, self.logic["data"].size)
+        target = np.frombuffer((ctypes.c_char * size).from_address(__address__(buffer)), dtype=dtype, count=count)
+        target[:] = self.logic["data"][:count].astype(dtype)
+
+    def FDwfDigitalInStatusRecord(self, available, lost, corrupted):
+        __store__(available, 0)
+        __store__(lost, 0)
+        __store__(corrupted, 0)
+
+    # digital output
+    def __digital_out_reset__(self):
+        """
+            reset the pattern generator
+        """
+        self.pattern = {"running": False, "start": 0.0, "wait": 0.0, "run": 0.0, "repeat": 0,
+                        "channels": [{"enabled": False, "type": constants.DwfDigitalOutTypePulse.value, "idle": constants.DwfDigitalOutIdleInit.value,
+                                      "divider": 1, "low": 1, "high": 1, "data": np.zeros(1, dtype=np.int64)} for _ in range(hardware.digital_channels)]}
+        return
+
+    def FDwfDigitalOutReset(self):
+        self.__digital_out_reset__()
+
+    def FDwfDigitalOutCount(self, count):
+        __store__(count, hardware.digital_channels)
+
+    def FDwfDigitalOutInternalClockInfo(self, frequency):
+        __store__(frequency, hardware.clock)
+
+    def FDwfDigitalOutConfigure(self, start):
+        self.pattern["running"] = bool(__value__(start))
+        self.pattern["start"] = self.now()
+
+    def FDwfDigitalOutEnableSet(self, channel, enable):
+        self.__pattern_channel__(channel)["enabled"] = bool(__value__(enable))
+
+    def FDwfDigitalOutTypeSet(self, channel, output_type):
+        self.__pattern_channel__(channel)["type"] = __value__(output_type)
+
+    def FDwfDigitalOutIdleSet(self, channel, idle):
+        self.__pattern_channel__(channel)["idle"] = __value__(idle)
+
+    def FDwfDigitalOutDividerSet(self, channel, divider):
+        self.__pattern_channel__(channel)["divider"] = max(int(__value__(divider)), 1)
+
+    def FDwfDigitalOutCounterInfo(self, channel, minimum, maximum):
+        self.__pattern_channel__(channel)
+        __store__(minimum, 0)
+        __store__(maximum, hardware.pattern_counter)
+
+    def FDwfDigitalOutCounterSet(self, channel, low, high):
+        pattern_channel = self.__pattern_channel__(channel)
+        pattern_channel["low"] = min(int(__value__(low)), hardware.pattern_counter)
+        pattern_channel["high"] = min(int(__value__(high)), hardware.pattern_counter)
+
+    def FDwfDigitalOutDataInfo(self, channel, size):
+        self.__pattern_channel__(channel)
+        __store__(size, hardware.pattern_buffer)
+
+    def FDwfDigitalOutDataSet(self, channel, data, count):
+        count = __value__(count)
+        if not 0 < count <= hardware.pattern_buffer:
+            raise __failure__(constants.dwfercInvalidParameter3.value, "The data must have 1 to " + str(hardware.pattern_buffer) + " bits")
+        packed = __array__(data, ctypes.c_ubyte, (count + 7) >> 3)
+        self.__pattern_channel__(channel)["data"] = np.unpackbits(packed, bitorder="little")[:count].astype(np.int64)
+
+    def FDwfDigitalOutWaitSet(self, wait):
+        self.pattern["wait"] = max(float(__value__(wait)), 0.0)
+
+    def FDwfDigitalOutRepeatSet(self, repeat):
+        self.pattern["repeat"] = max(int(__value__(repeat)), 0)
+
+    def FDwfDigitalOutRunSet(self, run):
+        self.pattern["run"] = max(float(__value__(run)), 0.0)
+
+    def FDwfDigitalOutRepeatTriggerSet(self, enable):
+        pass
+
+    def FDwfDigitalOutTriggerSourceSet(self, source):
+        pass
+
+    def FDwfDigitalOutTriggerSlopeSet(self, slope):
+        pass
+
+    def __pattern_channel__(self, channel):
+        """
+            the settings of a pattern generator channel
+        """
+        channel = __value__(channel)
+        if not 0 <= channel < hardware.digital_channels:
+            raise __failure__(constants.dwfercInvalidParameter1.value, "Channel index out of range")
+        return self.pattern["channels"][channel]
+
+    def __pattern_line__(self, channel, times):
+        """
+            the output of a pattern generator channel at the given device times
+        """
+        pattern = self.pattern
+        settings_of = pattern["channels"][channel]
+        idle = 1 if settings_of["idle"] == constants.DwfDigitalOutIdleHigh.value else 0
+        local = np.asarray(times) - pattern["start"]
+        if pattern["run"] > 0:
+            period = pattern["wait"] + pattern["run"]
+            cycle = np.floor(local / period)
+            local = local - cycle * period - pattern["wait"]
+            active = (local >= 0) & (cycle >= 0)
+            if pattern["repeat"] > 0:
+                active &= cycle < pattern["repeat"]
+        else:
+            local = local - pattern["wait"]
+            active = local >= 0
+        ticks = np.floor(np.maximum(local, 0) * hardware.clock / settings_of["divider"]).astype(np.int64)
+        if settings_of["type"] == constants.DwfDigitalOutTypePulse.value:
+            period = max(settings_of["low"] + settings_of["high"], 1)
+            bit = (ticks % period >= settings_of["low"]).astype(np.int64)
+        elif settings_of["type"] == constants.DwfDigitalOutTypeCustom.value:
+            bit = settings_of["data"][ticks % settings_of["data"].size]
+        else:
+            # a deterministic pseudo random sequence
+            bit = ((ticks * 2654435761 + channel * 40503) >> 13) & 1
+        return np.where(active, bit, idle)
+
+    # UART
+    def FDwfDigitalUartReset(self):
+        self.uart["received"] = bytearray()
+
+    def FDwfDigitalUartRateSet(self, rate):
+        self.uart["rate"] = float(__value__(rate))
+
+    def FDwfDigitalUartBitsSet(self, bits):
+        self.uart["bits"] = __value__(bits)
+
+    def FDwfDigitalUartParitySet(self, parity):
+        self.uart["parity"] = __value__(parity)
+
+    def FDwfDigitalUartStopSet(self, stop):
+        self.uart["stop"] = float(__value__(stop))
+
+    def FDwfDigitalUartTxSet(self, channel):
+        self.uart["tx"] = __value__(channel)
+
+    def FDwfDigitalUartRxSet(self, channel):
+        self.uart["rx"] = __value__(channel)
+
+    def FDwfDigitalUartTx(self, data, count):
+        count = __value__(count)
+        sent = bytes(__array__(data, ctypes.c_ubyte, count)) if count > 0 else b""
+        # the transmitted bytes are received on the same line
+        if self.uart["rx"] == self.uart["tx"]:
+            self.uart["received"] += sent
+
+    def FDwfDigitalUartRx(self, data, size, count, parity):
+        size = __value__(size)
+        received = self.uart["received"]
+        if size == 0:
+            # start the receiver
+            received.clear()
+            __store__(count, 0)
+        else:
+            length = min(size, len(received))
+            __array__(data, ctypes.c_ubyte, size)[:length] = np.frombuffer(bytes(received[:length]), dtype=np.uint8)
+            del received[:length]
+            __store__(count, length)
+        __store__(parity, 0)
+
+    # SPI
+    def FDwfDigitalSpiReset(self):
+        self.spi["data"] = {}
+        self.spi["select"] = {}
+
+    def FDwfDigitalSpiFrequencySet(self, frequency):
+        self.spi["frequency"] = float(__value__(frequency))
+
+    def FDwfDigitalSpiClockSet(self, channel):
+        self.spi["clock"] = __value__(channel)
+
+    def FDwfDigitalSpiDataSet(self, line, channel):
+        self.spi["data"][__value__(line)] = __value__(channel)
+
+    def FDwfDigitalSpiIdleSet(self, line, idle):
+        pass
+
+    def FDwfDigitalSpiModeSet(self, mode):
+        self.spi["mode"] = __value__(mode)
+
+    def FDwfDigitalSpiOrderSet(self, order):
+        self.spi["order"] = __value__(order)
+
+    def FDwfDigitalSpiSelect(self, channel, level):
+        self.spi["select"][__value__(channel)] = __value__(level)
+
+    def FDwfDigitalSpiWriteRead(self, mode, bits, transmit, transmit_count, receive, receive_count):
+        transmit_count = __value__(transmit_count)
+        receive_count = __value__(receive_count)
+        sent = np.array(__array__(transmit, ctypes.c_ubyte, transmit_count)) if transmit_count > 0 else np.zeros(0, dtype=np.uint8)
+        if receive_count > 0:
+            __array__(receive, ctypes.c_ubyte, receive_count)[:] = self.__miso__(sent, receive_count)
+
+    def FDwfDigitalSpiRead(self, mode, bits, data, count):
+        count = __value__(count)
+        if count > 0:
+            __array__(data, ctypes.c_ubyte, count)[:] = self.__miso__(np.zeros(0, dtype=np.uint8), count)
+
+    def FDwfDigitalSpiWrite(self, mode, bits, data, count):
+        pass
+
+    def FDwfDigitalSpiWriteOne(self, mode, bits, data):
+        pass
+
+    def __miso__(self, sent, count):
+        """
+            the received bytes: MOSI when MISO is the same line, otherwise the idle high line
+        """
+        received = np.full(count, 0xFF, dtype=np.uint8)
+        mosi = self.spi["data"].get(0)
+        if mosi is not None and self.spi["data"].get(1) == mosi:
+            length = min(count, sent.size)
+            received[:length] = sent[:length]
+        return received
+
+    # I2C
+    def FDwfDigitalI2cReset(self):
+        pass
+
+    def FDwfDigitalI2cClear(self, free):
+        __store__(free, 1)
+
+    def FDwfDigitalI2cStretchSet(self, enable):
+        self.i2c["stretch"] = __value__(enable)
+
+    def FDwfDigitalI2cRateSet(self, rate):
+        self.i2c["rate"] = float(__value__(rate))
+
+    def FDwfDigitalI2cSclSet(self, channel):
+        self.i2c["scl"] = __value__(channel)
+
+    def FDwfDigitalI2cSdaSet(self, channel):
+        self.i2c["sda"] = __value__(channel)
+
+    def FDwfDigitalI2cWrite(self, address, data, count, nak):
+        count = __value__(count)
+        sent = bytes(__array__(data, ctypes.c_ubyte, count)) if count > 0 else b""
+        __store__(nak, self.__i2c_write__(__value__(address) >> 1, sent))
+
+    def FDwfDigitalI2cRead(self, address, data, count, nak):
+        count = __value__(count)
+        received, result = self.__i2c_read__(__value__(address) >> 1, count)
+        if count > 0:
+            __array__(data, ctypes.c_ubyte, count)[:] = received
+        __store__(nak, result)
+
+    def FDwfDigitalI2cWriteRead(self, address, transmit, transmit_count, receive, receive_count, nak):
+        transmit_count = __value__(transmit_count)
+        receive_count = __value__(receive_count)
+        sent = bytes(__array__(transmit, ctypes.c_ubyte, transmit_count)) if transmit_count > 0 else b""
+        result = self.__i2c_write__(__value__(address) >> 1, sent)
+        if result == 0:
+            received, result = self.__i2c_read__(__value__(address) >> 1, receive_count)
+            if receive_count > 0:
+                __array__(receive, ctypes.c_ubyte, receive_count)[:] = received
+        __store__(nak, result)
+
+    def FDwfDigitalI2cSpyStart(self):
+        pass
+
+    def FDwfDigitalI2cSpyStatus(self, start, stop, data, count, nak):
+        __store__(start, 0)
+        __store__(stop, 0)
+        __store__(count, 0)
+        __store__(nak, 0)
+
+    def __i2c_memory__(self, address):
+        """
+            the memory at a 7-bit address: [pointer, 256 bytes], or None if nothing answers
+        """
+        if address not in settings.i2c_addresses:
+            return None
+        return self.i2c["memory"].setdefault(address, [0, bytearray(256)])
+
+    def __i2c_write__(self, address, sent):
+        """
+            write to a memory, the first byte sets the pointer
+
+            returns:    - 0, or the index of the first NAK (1 is the address)
+        """
+        if address == 0:
+            # general call, acknowledged by every device
+            return 0
+        memory = self.__i2c_memory__(address)
+        if memory is None:
+            return 1
+        if len(sent) > 0:
+            memory[0] = sent[0]
+            for value in sent[1:]:
+                memory[1][memory[0]] = value
+                memory[0] = (memory[0] + 1) & 0xFF
+        return 0
+
+    def __i2c_read__(self, address, count):
+        """
+            read from a memory at the pointer
+
+            returns:    - the bytes, and 0 or the index of the first NAK
+        """
+        memory = self.__i2c_memory__(address)
+        if memory is None:
+            return np.full(count, 0xFF, dtype=np.uint8), 1
+        received = np.empty(count, dtype=np.uint8)
+        for index in range(count):
+            received[index] = memory[1][memory[0]]
+            memory[0] = (memory[0] + 1) & 0xFF
+        return received, 0
+
+"""-----------------------------------------------------------------------"""
+
+def __value__(argument):
+    """
+        the value of a ctypes object, or the argument itself
+    """
+    return getattr(argument, "value", argument)
+
+"""-----------------------------------------------------------------------"""
+
+def __store__(pointer, value):
+    """
+        write the value of an output argument: byref(), a ctypes pointer, or None
+    """
+    if pointer is None:
+        return
+    target = getattr(pointer, "_obj", None)
+    if target is not None:
+        target.value = value
+    else:
+        pointer[0] = value
+    return
+
+"""-----------------------------------------------------------------------"""
+
+def __address__(pointer):
+    """
+        the memory address of a buffer argument
+    """
+    target = getattr(pointer, "_obj", None)
+    if target is not None:
+        return ctypes.addressof(target)
+    if isinstance(pointer, ctypes.Array):
+        return ctypes.addressof(pointer)
+    if isinstance(pointer, int):
+        return pointer
+    return ctypes.cast(pointer, ctypes.c_void_p).value
+
+"""-----------------------------------------------------------------------"""
+
+def __array__(pointer, ctype, count):
+    """
+        a numpy view of a buffer argument
+    """
+    if count <= 0:
+        return np.zeros(0, dtype=np.dtype(ctype))
+    return np.ctypeslib.as_array(ctypes.cast(__address__(pointer), ctypes.POINTER(ctype)), shape=(count,))
+
+"""-----------------------------------------------------------------------"""
+
+def __text__(buffer, text):
+    """
+        write a string into a character buffer
+    """
+    if buffer is not None:
+        buffer.value = text.encode("ascii")[:ctypes.sizeof(buffer) - 1]
+    return
+
+"""-----------------------------------------------------------------------"""
+
+def __shape__(node, phase, random):
+    """
+        the normalized waveform of a wavegen node at the given phases (in periods)
+    """
+    function = node.function
+    phase = np.asarray(phase, dtype=np.float64)
+    fraction = phase - np.floor(phase)
+    symmetry = node.symmetry / 100
+    # stretch the first half period to the symmetry
+    if symmetry <= 0:
+        warped = 0.5 + fraction / 2
+    elif symmetry >= 1:
+        warped = fraction / 2
+    else:
+        warped = np.where(fraction < symmetry, fraction / symmetry / 2, 0.5 + (fraction - symmetry) / (1 - symmetry) / 2)
+    if function == constants.funcDC.value:
+        return np.zeros(phase.shape)
+    if function == constants.funcSine.value:
+        return np.sin(2 * np.pi * warped)
+    if function == constants.funcSquare.value:
+        return np.where(fraction < symmetry, 1.0, -1.0)
+    if function == constants.funcTriangle.value:
+        return 1 - 4 * np.abs(np.mod(warped + 0.25, 1) - 0.5)
+    if function == constants.funcRampUp.value:
+        return 2 * fraction - 1
+    if function == constants.funcRampDown.value:
+        return 1 - 2 * fraction
+    if function == constants.funcNoise.value:
+        return random.uniform(-1, 1, phase.shape)
+    if function == constants.funcPulse.value:
+        return np.where(fraction < symmetry, 1.0, 0.0)
+    if function == constants.funcTrapezium.value:
+        return np.clip(2 - 8 * np.abs(np.mod(warped + 0.25, 1) - 0.5), -1, 1)
+    if function == constants.funcSinePower.value:
+        sine = np.sin(2 * np.pi * fraction)
+        return np.sign(sine) * np.abs(sine) ** (1 + 4 * abs(symmetry - 0.5))
+    if function == constants.funcCustom.value:
+        return node.data[np.minimum((fraction * node.data.size).astype(np.int64), node.data.size - 1)]
+    return np.zeros(phase.shape)
+
+"""-----------------------------------------------------------------------"""
+
+def __window__(window_type, count, beta):
+    """
+        the samples of a spectrum window
+    """
+    index = np.arange(count)
+    position = index / max(count - 1, 1)
+    if window_type == constants.DwfWindowTriangular.value:
+        return 1 - np.abs(2 * position - 1)
+    if window_type == constants.DwfWindowHamming.value:
+        return 0.54 - 0.46 * np.cos(2 * np.pi * position)
+    if window_type == constants.DwfWindowHann.value:
+        return 0.5 - 0.5 * np.cos(2 * np.pi * position)
+    if window_type == constants.DwfWindowCosine.value:
+        return np.sin(np.pi * position)
+    if window_type == constants.DwfWindowBlackmanHarris.value:
+        return 0.35875 - 0.48829 * np.cos(2 * np.pi * position) + 0.14128 * np.cos(4 * np.pi * position) - 0.01168 * np.cos(6 * np.pi * position)
+    if window_type == constants.DwfWindowFlatTop.value:
+        return 0.21557895 - 0.41663158 * np.cos(2 * np.pi * position) + 0.277263158 * np.cos(4 * np.pi * position) - 0.083578947 * np.cos(6 * np.pi * position) + 0.006947368 * np.cos(8 * np.pi * position)
+    if window_type == constants.DwfWindowKaiser.value:
+        return np.kaiser(count, beta)
+    return np.ones(count)
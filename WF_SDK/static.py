@@ -1,28 +1,9 @@
-""" STATIC I/O CONTROL FUNCTIONS: set_mode, get_state, set_state, set_current, set_pull, close """
+""" STATIC I/O CONTROL FUNCTIONS: set_mode, get_state, set_state, set_current, set_pull, close, instrument """
 
 import ctypes                     # import the C compatible data types
-from sys import platform, path    # this is needed to check the OS type and get the PATH
-from os import sep                # OS specific file path separators
-
-# load the dynamic library, get constants path (the path is OS specific)
-if platform.startswith("win"):
-    # on Windows
-    dwf = ctypes.cdll.dwf
-    constants_path = "C:" + sep + "Program Files (x86)" + sep + "Digilent" + sep + "WaveFormsSDK" + sep + "samples" + sep + "py"
-elif platform.startswith("darwin"):
-    # on macOS
-    lib_path = sep + "Library" + sep + "Frameworks" + sep + "dwf.framework" + sep + "dwf"
-    dwf = ctypes.cdll.LoadLibrary(lib_path)
-    constants_path = sep + "Applications" + sep + "WaveForms.app" + sep + "Contents" + sep + "Resources" + sep + "SDK" + sep + "samples" + sep + "py"
-else:
-    # on Linux
-    dwf = ctypes.cdll.LoadLibrary("libdwf.so")
-    constants_path = sep + "usr" + sep + "share" + sep + "digilent" + sep + "waveforms" + sep + "samples" + sep + "py"
-
-# import constants
-path.append(constants_path)
-import dwfconstants as constants
+from WF_SDK.library import dwf, constants
 from WF_SDK.device import check_error
+from WF_SDK import device
 
 """-----------------------------------------------------------------------"""
 
@@ -36,6 +17,9 @@ class data:
         pull_direction = -1
         pull_weak = -1
 
+# the settings of new instruments, the module functions change data
+__defaults__ = device.__new_data__(data)
+
 """-----------------------------------------------------------------------"""
 
 class pull:
@@ -54,29 +38,7 @@ def set_mode(device_data, channel, output):
                     - selected DIO channel number
                     - True means output, False means input
     """
-    if device_data.name == "Digital Discovery":
-        channel = channel - 24
-
-    # count the DIO channels
-    global data
-    data.count = min(device_data.digital.input.channel_count, device_data.digital.output.channel_count)
-
-    # load current state of the output enable buffer
-    mask = ctypes.c_uint16()
-    if dwf.FDwfDigitalIOOutputEnableGet(device_data.handle, ctypes.byref(mask)) == 0:
-        check_error()
-    mask = mask.value
-    
-    # set bit in mask
-    if output == True:
-        mask |= __rotate_left__(1, channel, data.count)
-    else:
-        bits = pow(2, data.count) - 2
-        mask &= __rotate_left__(bits, channel, data.count)
-    
-    # set the pin to output
-    if dwf.FDwfDigitalIOOutputEnableSet(device_data.handle, ctypes.c_int(mask)) == 0:
-        check_error()
+    instrument(device_data, data).set_mode(channel, output)
     return
 
 """-----------------------------------------------------------------------"""
@@ -90,25 +52,7 @@ def get_state(device_data, channel):
 
         returns:    - True if the channel is HIGH, or False, if the channel is LOW
     """
-    if device_data.name == "Digital Discovery":
-        channel = channel - 24
-
-    # load internal buffer with current state of the pins
-    if dwf.FDwfDigitalIOStatus(device_data.handle) == 0:
-        check_error()
-    
-    # get the current state of the pins
-    data = ctypes.c_uint32()  # variable for this current state
-    if dwf.FDwfDigitalIOInputStatus(device_data.handle, ctypes.byref(data)) == 0:
-        check_error()
-    data = data.value
-    
-    # check the required bit
-    if data & (1 << channel) != 0:
-        value = True
-    else:
-        value = False
-    return value
+    return instrument(device_data, data).get_state(channel)
 
 """-----------------------------------------------------------------------"""
 
@@ -120,28 +64,7 @@ def set_state(device_data, channel, value):
                     - selected DIO channel number
                     - True means HIGH, False means LOW
     """
-    if device_data.name == "Digital Discovery":
-        channel = channel - 24
-
-    # count the DIO channels
-    global data
-    data.count = min(device_data.digital.input.channel_count, device_data.digital.output.channel_count)
-
-    # load current state of the output state buffer
-    mask = ctypes.c_uint16()
-    if dwf.FDwfDigitalIOOutputGet(device_data.handle, ctypes.byref(mask)) == 0:
-        check_error()
-    
-    # set bit in mask
-    if value == True:
-        mask |= __rotate_left__(1, channel, data.count)
-    else:
-        bits = pow(2, data.count) - 2
-        mask &= __rotate_left__(bits, channel, data.count)
-    
-    # set the pin state
-    if dwf.FDwfDigitalIOOutputSet(device_data.handle, ctypes.c_int(mask)) == 0:
-        check_error()
+    instrument(device_data, data).set_state(channel, value)
     return
 
 """-----------------------------------------------------------------------"""
@@ -153,25 +76,7 @@ def set_current(device_data, current):
         parameters: - device data
                     - current limit in mA: possible values are 2, 4, 6, 8, 12 and 16mA
     """
-    # search for the digital voltage channel
-    global data
-    for channel_index in range(device_data.analog.IO.channel_count):
-        if device_data.analog.IO.channel_label[channel_index] == "VDD":
-            data.channel = channel_index
-            break
-
-    # search for the drive node
-    if data.channel >= 0:
-        for node_index in range(device_data.analog.IO.node_count[data.channel]):
-            if device_data.analog.IO.node_name[data.channel][node_index] == "Drive":
-                data.nodes.current = node_index
-                break
-
-    # set limit
-    if data.channel >= 0 and data.nodes.current >= 0:
-        current = max(min(current, device_data.analog.IO.max_set_range[data.channel][data.nodes.current]), device_data.analog.IO.min_set_range[data.channel][data.nodes.current])
-        if dwf.FDwfAnalogIOChannelNodeSet(device_data.handle, data.channel, data.nodes.current, ctypes.c_double(current)) == 0:
-            check_error()
+    instrument(device_data, data).set_current(current)
     return
 
 """-----------------------------------------------------------------------"""
@@ -184,67 +89,7 @@ def set_pull(device_data, channel, direction):
                     - selected DIO channel number
                     - direction: pull.up, pull.idle, or pull.down
     """
-    if device_data.name == "Digital Discovery":
-        channel = channel - 24
-        
-    # count the DIO channels
-    global data
-    data.count = min(device_data.digital.input.channel_count, device_data.digital.output.channel_count)
-
-    # search for the digital voltage channel
-    for channel_index in range(device_data.analog.IO.channel_count):
-        if device_data.analog.IO.channel_label[channel_index] == "VDD":
-            data.channel = channel_index
-            break
-
-    # search for the pull enable node
-    if data.channel >= 0:
-        for node_index in range(device_data.analog.IO.node_count[data.channel]):
-            if device_data.analog.IO.node_name[data.channel][node_index] == "DIOPE":
-                data.nodes.pull_enable = node_index
-                break
-
-    # search for the pull direction node
-    if data.channel >= 0:
-        for node_index in range(device_data.analog.IO.node_count[data.channel]):
-            if device_data.analog.IO.node_name[data.channel][node_index] == "DIOPP":
-                data.nodes.pull_direction = node_index
-                break
-
-    # search for the weak pull node
-    if data.channel >= 0:
-        for node_index in range(device_data.analog.IO.node_count[data.channel]):
-            if device_data.analog.IO.node_name[data.channel][node_index] == "DINPP":
-                data.nodes.pull_weak = node_index
-                break
-
-    # set pull enable mask
-    mask = ctypes.c_uint16()
-    if dwf.FDwfAnalogIOChannelNodeGet(device_data.handle, data.channel, data.nodes.pull_enable, ctypes.byref(mask)) == 0:
-        check_error()
-    bitmask = int(mask)
-    if direction == pull.idle:
-        bitmask |= __rotate_left__(1, channel, data.count)
-    else:
-        bits = int(pow(2, data.count) - 2)
-        bitmask &= __rotate_left__(bits, channel, data.count)
-    if dwf.FDwfAnalogIOChannelNodeSet(device_data.handle, data.channel, data.nodes.pull_enable, bitmask) == 0:
-        check_error()
-
-    # set direction if necessary
-    if direction != pull.idle:
-        # set direction mask
-        mask = ctypes.c_uint16()
-        if dwf.FDwfAnalogIOChannelNodeGet(device_data.handle, data.channel, data.nodes.pull_direction, ctypes.byref(mask)) == 0:
-            check_error()
-        bitmask = int(mask)
-        if direction == pull.up:
-            bitmask |= __rotate_left__(1, channel, data.count)
-        else:
-            bits = int(pow(2, data.count) - 2)
-            bitmask &= __rotate_left__(bits, channel, data.count)
-        if dwf.FDwfAnalogIOChannelNodeSet(device_data.handle, data.channel, data.nodes.pull_direction, bitmask) == 0:
-            check_error()
+    instrument(device_data, data).set_pull(channel, direction)
     return
 
 """-----------------------------------------------------------------------"""
@@ -253,12 +98,203 @@ def close(device_data):
     """
         reset the instrument
     """
-    if dwf.FDwfDigitalIOReset(device_data.handle) == 0:
-        check_error()
+    instrument(device_data, data).close()
     return
 
 """-----------------------------------------------------------------------"""
 
+class instrument:
+    """
+        static I/O of one device with its own channel and node indices
+
+        the module functions share the indices in data, while every instrument
+        keeps a separate copy; the methods are the module functions without
+        the device data
+
+        parameters: - device data
+                    - settings, default is None (a new copy of the default settings)
+    """
+    def __init__(self, device_data, settings=None):
+        self.device_data = device_data
+        if settings is None:
+            settings = device.__new_data__(__defaults__)
+        self.data = settings
+        return
+
+    def set_mode(self, channel, output):
+        """
+            set a DIO line as input, or as output, see set_mode
+        """
+        handle = self.device_data.handle
+        if self.device_data.name == "Digital Discovery":
+            channel = channel - 24
+
+        # count the DIO channels
+        count = self.__count__()
+
+        # load current state of the output enable buffer
+        mask = ctypes.c_uint()
+        if dwf.FDwfDigitalIOOutputEnableGet(handle, ctypes.byref(mask)) == 0:
+            check_error()
+        mask = mask.value
+
+        # set bit in mask
+        if output == True:
+            mask |= __rotate_left__(1, channel, count)
+        else:
+            bits = pow(2, count) - 2
+            mask &= __rotate_left__(bits, channel, count)
+
+        # set the pin to output
+        if dwf.FDwfDigitalIOOutputEnableSet(handle, mask) == 0:
+            check_error()
+        return
+
+    def get_state(self, channel):
+        """
+            get the state of a DIO line, see get_state
+        """
+        handle = self.device_data.handle
+        if self.device_data.name == "Digital Discovery":
+            channel = channel - 24
+
+        # load internal buffer with current state of the pins
+        if dwf.FDwfDigitalIOStatus(handle) == 0:
+            check_error("FDwfDigitalIOStatus", handle)
+
+        # get the current state of the pins
+        state = ctypes.c_uint()  # variable for this current state
+        if dwf.FDwfDigitalIOInputStatus(handle, ctypes.byref(state)) == 0:
+            check_error("FDwfDigitalIOInputStatus", handle)
+        state = state.value
+
+        # check the required bit
+        if state & (1 << channel) != 0:
+            value = True
+        else:
+            value = False
+        return value
+
+    def set_state(self, channel, value):
+        """
+            set a DIO line HIGH, or LOW, see set_state
+        """
+        handle = self.device_data.handle
+        if self.device_data.name == "Digital Discovery":
+            channel = channel - 24
+
+        # count the DIO channels
+        count = self.__count__()
+
+        # load current state of the output state buffer
+        mask = ctypes.c_uint()
+        if dwf.FDwfDigitalIOOutputGet(handle, ctypes.byref(mask)) == 0:
+            check_error()
+        mask = mask.value
+
+        # set bit in mask
+        if value == True:
+            mask |= __rotate_left__(1, channel, count)
+        else:
+            bits = pow(2, count) - 2
+            mask &= __rotate_left__(bits, channel, count)
+
+        # set the pin state
+        if dwf.FDwfDigitalIOOutputSet(handle, mask) == 0:
+            check_error()
+        return
+
+    def set_current(self, current):
+        """
+            limit the output current of the DIO lines, see set_current
+        """
+        analog_io = self.device_data.analog.IO
+        nodes = self.data.nodes
+
+        # find the digital voltage channel and the drive node
+        self.__find__("current", "Drive")
+
+        # set limit
+        if self.data.channel >= 0 and nodes.current >= 0:
+            current = max(min(current, analog_io.max_set_range[self.data.channel][nodes.current]), analog_io.min_set_range[self.data.channel][nodes.current])
+            if dwf.FDwfAnalogIOChannelNodeSet(self.device_data.handle, self.data.channel, nodes.current, current) == 0:
+                check_error()
+        return
+
+    def set_pull(self, channel, direction):
+        """
+            pull a DIO line up, or down, see set_pull
+        """
+        handle = self.device_data.handle
+        nodes = self.data.nodes
+        if self.device_data.name == "Digital Discovery":
+            channel = channel - 24
+
+        # count the DIO channels
+        count = self.__count__()
+
+        # find the digital voltage channel and the pull nodes
+        self.__find__("pull_enable", "DIOPE")
+        self.__find__("pull_direction", "DIOPP")
+        self.__find__("pull_weak", "DINPP")
+
+        # set pull enable mask
+        mask = ctypes.c_double()
+        if dwf.FDwfAnalogIOChannelNodeGet(handle, self.data.channel, nodes.pull_enable, ctypes.byref(mask)) == 0:
+            check_error()
+        bitmask = int(mask.value)
+        if direction == pull.idle:
+            bitmask |= __rotate_left__(1, channel, count)
+        else:
+            bits = int(pow(2, count) - 2)
+            bitmask &= __rotate_left__(bits, channel, count)
+        if dwf.FDwfAnalogIOChannelNodeSet(handle, self.data.channel, nodes.pull_enable, bitmask) == 0:
+            check_error()
+
+        # set direction if necessary
+        if direction != pull.idle:
+            # set direction mask
+            mask = ctypes.c_double()
+            if dwf.FDwfAnalogIOChannelNodeGet(handle, self.data.channel, nodes.pull_direction, ctypes.byref(mask)) == 0:
+                check_error()
+            bitmask = int(mask.value)
+            if direction == pull.up:
+                bitmask |= __rotate_left__(1, channel, count)
+            else:
+                bits = int(pow(2, count) - 2)
+                bitmask &= __rotate_left__(bits, channel, count)
+            if dwf.FDwfAnalogIOChannelNodeSet(handle, self.data.channel, nodes.pull_direction, bitmask) == 0:
+                check_error()
+        return
+
+    def close(self):
+        """
+            reset the instrument
+        """
+        if dwf.FDwfDigitalIOReset(self.device_data.handle) == 0:
+            check_error()
+        return
+
+    def __count__(self):
+        """
+            count the DIO channels and store the number
+        """
+        self.data.count = min(self.device_data.digital.input.channel_count, self.device_data.digital.output.channel_count)
+        return self.data.count
+
+    def __find__(self, node, name):
+        """
+            find the digital voltage channel and one of its nodes, store the indices
+        """
+        channel, node_index = device.__node__(self.device_data, "VDD", name)
+        if channel >= 0:
+            self.data.channel = channel
+        if node_index >= 0:
+            setattr(self.data.nodes, node, node_index)
+        return
+
+"""-----------------------------------------------------------------------"""
+
 def __rotate_left__(number, position, size=16):
     """
         rotate left a number bitwise
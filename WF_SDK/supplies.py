@@ -1,28 +1,8 @@
-""" POWER SUPPLIES CONTROL FUNCTIONS: switch, switch_fixed, switch_variable, switch_digital, close """
-
-import ctypes                     # import the C compatible data types
-from sys import platform, path    # this is needed to check the OS type and get the PATH
-from os import sep                # OS specific file path separators
-
-# load the dynamic library, get constants path (the path is OS specific)
-if platform.startswith("win"):
-    # on Windows
-    dwf = ctypes.cdll.dwf
-    constants_path = "C:" + sep + "Program Files (x86)" + sep + "Digilent" + sep + "WaveFormsSDK" + sep + "samples" + sep + "py"
-elif platform.startswith("darwin"):
-    # on macOS
-    lib_path = sep + "Library" + sep + "Frameworks" + sep + "dwf.framework" + sep + "dwf"
-    dwf = ctypes.cdll.LoadLibrary(lib_path)
-    constants_path = sep + "Applications" + sep + "WaveForms.app" + sep + "Contents" + sep + "Resources" + sep + "SDK" + sep + "samples" + sep + "py"
-else:
-    # on Linux
-    dwf = ctypes.cdll.LoadLibrary("libdwf.so")
-    constants_path = sep + "usr" + sep + "share" + sep + "digilent" + sep + "waveforms" + sep + "samples" + sep + "py"
-
-# import constants
-path.append(constants_path)
-import dwfconstants as constants
+""" POWER SUPPLIES CONTROL FUNCTIONS: switch, switch_fixed, switch_variable, switch_digital, close, instrument """
+
+from WF_SDK.library import dwf, constants
 from WF_SDK.device import check_error
+from WF_SDK import device
 
 """-----------------------------------------------------------------------"""
 
@@ -39,6 +19,9 @@ class data:
     negative_current = 0    # negative supply current
     current = 0             # digital/6V supply current
 
+# the settings of new instruments
+__defaults__ = device.__new_data__(data)
+
 """-----------------------------------------------------------------------"""
 
 def switch(device_data, supplies_data):
@@ -52,170 +35,93 @@ def switch(device_data, supplies_data):
                         - voltage and/or positive_voltage and negative_voltage
                         - current and/or positive_current and negative_current
     """
-    # find the positive supply
-    channel = -1
-    for channel_index in range(device_data.analog.IO.channel_count):
-        if device_data.analog.IO.channel_label[channel_index] == "V+" or device_data.analog.IO.channel_label[channel_index] == "p25V":
-            channel = channel_index
-            break
-    if channel != -1:
-        # set enable
-        try:
-            node = -1
-            # find the voltage node
-            for node_index in range(device_data.analog.IO.node_count[channel]):
-                if device_data.analog.IO.node_name[channel][node_index] == "Enable":
-                    node = node_index
-                    break
-            if node != -1:
-                enable = ctypes.c_int(supplies_data.positive_state)
-                if dwf.FDwfAnalogIOChannelNodeSet(device_data.handle, ctypes.c_int(channel), ctypes.c_int(node), enable) == 0:
-                    check_error()
-        except:
-            pass
-        # set voltage
-        try:
-            node = -1
-            # find the voltage node
-            for node_index in range(device_data.analog.IO.node_count[channel]):
-                if device_data.analog.IO.node_name[channel][node_index] == "Voltage":
-                    node = node_index
-                    break
-            if node != -1:
-                voltage = min(max(supplies_data.positive_voltage, device_data.analog.IO.min_set_range[channel][node]), device_data.analog.IO.max_set_range[channel][node])
-                if dwf.FDwfAnalogIOChannelNodeSet(device_data.handle, ctypes.c_int(channel), ctypes.c_int(node), ctypes.c_double(voltage)) == 0:
-                    check_error()
-        except:
-            pass
-        # set current
-        try:
-            node = -1
-            # find the voltage node
-            for node_index in range(device_data.analog.IO.node_count[channel]):
-                if device_data.analog.IO.node_name[channel][node_index] == "Current":
-                    node = node_index
-                    break
-            if node != -1:
-                current = min(max(supplies_data.positive_current, device_data.analog.IO.min_set_range[channel][node]), device_data.analog.IO.max_set_range[channel][node])
-                if dwf.FDwfAnalogIOChannelNodeSet(device_data.handle, ctypes.c_int(channel), ctypes.c_int(node), ctypes.c_double(current)) == 0:
-                    check_error()
-        except:
-            pass
-    
-    # find the negative supply
-    channel = -1
-    for channel_index in range(device_data.analog.IO.channel_count):
-        if device_data.analog.IO.channel_label[channel_index] == "V-" or device_data.analog.IO.channel_label[channel_index] == "n25V":
-            channel = channel_index
-            break
-    if channel != -1:
-        # set enable
-        try:
-            node = -1
-            # find the voltage node
-            for node_index in range(device_data.analog.IO.node_count[channel]):
-                if device_data.analog.IO.node_name[channel][node_index] == "Enable":
-                    node = node_index
-                    break
-            if node != -1:
-                enable = ctypes.c_int(supplies_data.negative_state)
-                if dwf.FDwfAnalogIOChannelNodeSet(device_data.handle, ctypes.c_int(channel), ctypes.c_int(node), enable) == 0:
-                    check_error()
-        except:
-            pass
-        # set voltage
-        try:
-            node = -1
-            # find the voltage node
-            for node_index in range(device_data.analog.IO.node_count[channel]):
-                if device_data.analog.IO.node_name[channel][node_index] == "Voltage":
-                    node = node_index
-                    break
-            if node != -1:
-                voltage = min(max(supplies_data.negative_voltage, device_data.analog.IO.min_set_range[channel][node]), device_data.analog.IO.max_set_range[channel][node])
-                if dwf.FDwfAnalogIOChannelNodeSet(device_data.handle, ctypes.c_int(channel), ctypes.c_int(node), ctypes.c_double(voltage)) == 0:
-                    check_error()
-        except:
-            pass
-        # set current
-        try:
-            node = -1
-            # find the voltage node
-            for node_index in range(device_data.analog.IO.node_count[channel]):
-                if device_data.analog.IO.node_name[channel][node_index] == "Current":
-                    node = node_index
-                    break
-            if node != -1:
-                current = min(max(supplies_data.negative_current, device_data.analog.IO.min_set_range[channel][node]), device_data.analog.IO.max_set_range[channel][node])
-                if dwf.FDwfAnalogIOChannelNodeSet(device_data.handle, ctypes.c_int(channel), ctypes.c_int(node), ctypes.c_double(current)) == 0:
-                    check_error()
-        except:
-            pass
-    
-    # find the digital/6V supply
-    channel = -1
-    for channel_index in range(device_data.analog.IO.channel_count):
-        if device_data.analog.IO.channel_label[channel_index] == "VDD" or device_data.analog.IO.channel_label[channel_index] == "p6V":
-            channel = channel_index
-            break
-    if channel != -1:
-        # set enable
-        try:
-            node = -1
-            # find the voltage node
-            for node_index in range(device_data.analog.IO.node_count[channel]):
-                if device_data.analog.IO.node_name[channel][node_index] == "Enable":
-                    node = node_index
-                    break
-            if node != -1:
-                enable = ctypes.c_int(supplies_data.state)
-                if dwf.FDwfAnalogIOChannelNodeSet(device_data.handle, ctypes.c_int(channel), ctypes.c_int(node), enable) == 0:
-                    check_error()
-        except:
-            pass
-        # set voltage
-        try:
-            node = -1
-            # find the voltage node
-            for node_index in range(device_data.analog.IO.node_count[channel]):
-                if device_data.analog.IO.node_name[channel][node_index] == "Voltage":
-                    node = node_index
-                    break
-            if node != -1:
-                voltage = min(max(supplies_data.voltage, device_data.analog.IO.min_set_range[channel][node]), device_data.analog.IO.max_set_range[channel][node])
-                if dwf.FDwfAnalogIOChannelNodeSet(device_data.handle, ctypes.c_int(channel), ctypes.c_int(node), ctypes.c_double(voltage)) == 0:
-                    check_error()
-        except:
-            pass
-        # set current
+    instrument(device_data, supplies_data).switch()
+    return
+
+"""-----------------------------------------------------------------------"""
+
+def close(device_data):
+    """
+        reset the supplies
+    """
+    instrument(device_data, data).close()
+    return
+
+"""-----------------------------------------------------------------------"""
+
+class instrument:
+    """
+        power supplies of one device with their own settings
+
+        the module functions use the supplies data they get, while every instrument
+        keeps a separate copy, so setting the supplies of one device doesn't change
+        the settings of another; the methods are the module functions without the
+        device data and the supplies data (set the attributes of data instead)
+
+        parameters: - device data
+                    - settings, default is None (a new copy of the default settings)
+    """
+    def __init__(self, device_data, settings=None):
+        self.device_data = device_data
+        if settings is None:
+            settings = device.__new_data__(__defaults__)
+        self.data = settings
+        return
+
+    def switch(self):
+        """
+            turn the power supplies on/off, see switch
+        """
+        # set the positive supply
+        __set__(self.device_data, ("V+", "p25V"), "Enable", self.data, "positive_state")
+        __set__(self.device_data, ("V+", "p25V"), "Voltage", self.data, "positive_voltage")
+        __set__(self.device_data, ("V+", "p25V"), "Current", self.data, "positive_current")
+
+        # set the negative supply
+        __set__(self.device_data, ("V-", "n25V"), "Enable", self.data, "negative_state")
+        __set__(self.device_data, ("V-", "n25V"), "Voltage", self.data, "negative_voltage")
+        __set__(self.device_data, ("V-", "n25V"), "Current", self.data, "negative_current")
+
+        # set the digital/6V supply
+        __set__(self.device_data, ("VDD", "p6V"), "Enable", self.data, "state")
+        __set__(self.device_data, ("VDD", "p6V"), "Voltage", self.data, "voltage")
+        __set__(self.device_data, ("VDD", "p6V"), "Current", self.data, "current")
+
+        # turn all supplies on/off
         try:
-            node = -1
-            # find the voltage node
-            for node_index in range(device_data.analog.IO.node_count[channel]):
-                if device_data.analog.IO.node_name[channel][node_index] == "Current":
-                    node = node_index
-                    break
-            if node != -1:
-                current = min(max(supplies_data.current, device_data.analog.IO.min_set_range[channel][node]), device_data.analog.IO.max_set_range[channel][node])
-                if dwf.FDwfAnalogIOChannelNodeSet(device_data.handle, ctypes.c_int(channel), ctypes.c_int(node), ctypes.c_double(current)) == 0:
-                    check_error()
+            if dwf.FDwfAnalogIOEnableSet(self.device_data.handle, self.data.master_state) == 0:
+                check_error()
         except:
             pass
+        return
 
-    # turn all supplies on/off
-    try:
-        if dwf.FDwfAnalogIOEnableSet(device_data.handle, ctypes.c_int(supplies_data.master_state)) == 0:
+    def close(self):
+        """
+            reset the supplies
+        """
+        if dwf.FDwfAnalogIOReset(self.device_data.handle) == 0:
             check_error()
-    except:
-        pass
-    return
+        return
 
 """-----------------------------------------------------------------------"""
 
-def close(device_data):
+def __set__(device_data, labels, node_name, supplies_data, attribute):
     """
-        reset the supplies
+        set a node of a supply, the voltage and the current are limited to the node range
+
+        the supplies which are missing on the device, or in the supplies data are skipped
     """
-    if dwf.FDwfAnalogIOReset(device_data.handle) == 0:
-        check_error()
+    channel, node = device.__node__(device_data, labels, node_name)
+    if node < 0:
+        return
+    try:
+        value = getattr(supplies_data, attribute)
+        if node_name == "Enable":
+            value = float(value)
+        else:
+            value = min(max(value, device_data.analog.IO.min_set_range[channel][node]), device_data.analog.IO.max_set_range[channel][node])
+        if dwf.FDwfAnalogIOChannelNodeSet(device_data.handle, channel, node, value) == 0:
+            check_error()
+    except:
+        pass
     return
@@ -0,0 +1,202 @@
+""" TRACE: record the libdwf calls of a session and replay them later without the device """
+
+import collections                # call queues of the replayed devices
+import ctypes                     # the arguments are C compatible data types
+import pickle                     # format of the trace files
+import threading                  # the calls can come from several threads
+import time                       # timestamps of the calls
+import numpy as np                # copies of the returned buffers
+from WF_SDK import library, simulator
+
+"""-----------------------------------------------------------------------"""
+
+class settings:
+    """
+        replay settings
+
+        a trace is a pickle file, replay only the traces you recorded
+    """
+    realtime = False            # True: every call returns at the time it returned during the recording
+
+"""-----------------------------------------------------------------------"""
+
+# buffers filled by the library: function name: [(argument index, element type, index of the element count)]
+__buffers__ = {
+    "FDwfAnalogInStatusData": [(2, ctypes.c_double, 3)],
+    "FDwfAnalogInStatusData16": [(2, ctypes.c_short, 4)],
+    "FDwfDigitalInStatusData": [(1, ctypes.c_ubyte, 2)],
+    "FDwfDigitalUartRx": [(1, ctypes.c_ubyte, 2)],
+    "FDwfDigitalSpiWriteRead": [(5, ctypes.c_ubyte, 6)],
+    "FDwfDigitalSpiRead": [(3, ctypes.c_ubyte, 4)],
+    "FDwfDigitalI2cWriteRead": [(4, ctypes.c_ubyte, 5)],
+    "FDwfDigitalI2cRead": [(2, ctypes.c_ubyte, 3)],
+    "FDwfDigitalI2cSpyStatus": [(3, ctypes.c_ubyte, 4)],
+    "FDwfSpectrumWindow": [(0, ctypes.c_double, 1)],
+    "FDwfSpectrumTransform": [(2, ctypes.c_double, 4), (3, ctypes.c_double, 4)],
+}
+
+# functions without a device handle, their calls are replayed in a common queue
+__unbound__ = library.__unbound__
+
+"""-----------------------------------------------------------------------"""
+
+class recorder:
+    """
+        wraps a library and writes every call, the returned values and the filled buffers to a trace file
+
+        parameters: - the library (libdwf or the simulator) with declared prototypes
+                    - path of the trace file, it is overwritten
+    """
+    def __init__(self, dwf, path):
+        self.dwf = dwf
+        self.file = open(path, "wb")
+        self.lock = threading.Lock()
+        self.start = time.perf_counter()
+        return
+
+    def __getattr__(self, name):
+        if not name.startswith("FDwf"):
+            raise AttributeError(name)
+        function = getattr(self.dwf, name)
+
+        def call(*arguments):
+            # the sizes of in/out counts are read before the call
+            sizes = [(index, ctype, int(__value__(arguments[count]))) for index, ctype, count in __buffers__.get(name, [])]
+            result = function(*arguments)
+            buffers = {}
+            for index, ctype, size in sizes:
+                if arguments[index] is not None and size > 0:
+                    buffers[index] = np.array(simulator.__array__(arguments[index], ctype, size))
+            entry = (time.perf_counter() - self.start, name, __key__(name, arguments), result, __outputs__(name, arguments), buffers)
+            with self.lock:
+                pickle.dump(entry, self.file, pickle.HIGHEST_PROTOCOL)
+            return result
+
+        call.__name__ = name
+        setattr(self, name, call)
+        return call
+
+    def close(self):
+        """
+            write the rest of the trace to the file
+        """
+        with self.lock:
+            self.file.close()
+        return
+
+"""-----------------------------------------------------------------------"""
+
+class player:
+    """
+        a library which replays a trace file, the calls must come in the recorded order
+
+        the calls of every device handle are replayed in their own order, so the
+        devices of a manager.pool can be used from several threads
+
+        parameters: - path of the trace file
+    """
+    def __init__(self, path):
+        self.queues = collections.defaultdict(collections.deque)
+        self.position = collections.Counter()
+        with open(path, "rb") as file:
+            while True:
+                try:
+                    entry = pickle.load(file)
+                except EOFError:
+                    break
+                self.queues[entry[2]].append(entry)
+        self.lock = threading.Lock()
+        self.start = None
+        return
+
+    def __getattr__(self, name):
+        if not name.startswith("FDwf"):
+            raise AttributeError(name)
+        function = __function__(name, self)
+        setattr(self, name, function)
+        return function
+
+    def __replay__(self, name, arguments):
+        """
+            return the next recorded call of a device and fill the output arguments
+        """
+        key = __key__(name, arguments)
+        with self.lock:
+            queue = self.queues.get(key)
+            if not queue:
+                raise RuntimeError("the trace has no more calls for " + ("handle " + str(key) if key is not None else "the library") + ", " + name + " was called")
+            moment, recorded_name, _, result, outputs, buffers = queue[0]
+            if recorded_name != name:
+                raise RuntimeError("the replay diverged from the trace at call " + str(self.position[key]) + ": " + recorded_name + " was recorded, " + name + " was called")
+            queue.popleft()
+            self.position[key] += 1
+            if self.start is None:
+                self.start = time.perf_counter() - moment
+
+        # reproduce the timing of the recording
+        if settings.realtime:
+            delay = self.start + moment - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+        for index, value in outputs.items():
+            target = getattr(arguments[index], "_obj", arguments[index])
+            if value is not None and target is not None:
+                target.value = value
+        for index, samples in buffers.items():
+            simulator.__array__(arguments[index], np.ctypeslib.as_ctypes_type(samples.dtype), samples.size)[:] = samples
+        return result
+
+class __function__:
+    """
+        a replayed library function, called like a ctypes function
+    """
+    def __init__(self, name, player):
+        self.__name__ = name
+        self.player = player
+        self.argtypes = None
+        self.restype = ctypes.c_int
+        self.errcheck = None
+        return
+
+    def __call__(self, *arguments):
+        result = self.player.__replay__(self.__name__, arguments)
+        if self.errcheck is not None:
+            result = self.errcheck(result, self, arguments)
+        return result
+
+"""-----------------------------------------------------------------------"""
+
+def __value__(argument):
+    """
+        the value of an argument, byref() arguments are dereferenced
+    """
+    argument = getattr(argument, "_obj", argument)
+    return getattr(argument, "value", argument)
+
+"""-----------------------------------------------------------------------"""
+
+def __key__(name, arguments):
+    """
+        the queue of a call: the device handle, or None for the functions without handle
+    """
+    if name in __unbound__ or len(arguments) == 0:
+        return None
+    return __value__(arguments[0])
+
+"""-----------------------------------------------------------------------"""
+
+def __outputs__(name, arguments):
+    """
+        the values of the pointer and string arguments after a call: {argument index: value}
+    """
+    outputs = {}
+    buffers = [index for index, _, _ in __buffers__.get(name, [])]
+    for index, argtype in enumerate(library.__prototypes__.get(name, [])):
+        if index in buffers or index >= len(arguments) or arguments[index] is None:
+            continue
+        if argtype is library.STRING or issubclass(argtype, ctypes._Pointer):
+            target = getattr(arguments[index], "_obj", arguments[index])
+            if isinstance(target, (ctypes._SimpleCData, ctypes.Array)) and hasattr(target, "value"):
+                outputs[index] = target.value
+    return outputs
@@ -1,28 +1,10 @@
-""" WAVEFORM GENERATOR CONTROL FUNCTIONS: generate, close, enable, disable """
+""" WAVEFORM GENERATOR CONTROL FUNCTIONS: generate, modulate, play, close, enable, disable, instrument, output """
 
 import ctypes                     # import the C compatible data types
-from sys import platform, path    # this is needed to check the OS type and get the PATH
-from os import sep                # OS specific file path separators
-
-# load the dynamic library, get constants path (the path is OS specific)
-if platform.startswith("win"):
-    # on Windows
-    dwf = ctypes.cdll.dwf
-    constants_path = "C:" + sep + "Program Files (x86)" + sep + "Digilent" + sep + "WaveFormsSDK" + sep + "samples" + sep + "py"
-elif platform.startswith("darwin"):
-    # on macOS
-    lib_path = sep + "Library" + sep + "Frameworks" + sep + "dwf.framework" + sep + "dwf"
-    dwf = ctypes.cdll.LoadLibrary(lib_path)
-    constants_path = sep + "Applications" + sep + "WaveForms.app" + sep + "Contents" + sep + "Resources" + sep + "SDK" + sep + "samples" + sep + "py"
-else:
-    # on Linux
-    dwf = ctypes.cdll.LoadLibrary("libdwf.so")
-    constants_path = sep + "usr" + sep + "share" + sep + "digilent" + sep + "waveforms" + sep + "samples" + sep + "py"
-
-# import constants
-path.append(constants_path)
-import dwfconstants as constants
-from WF_SDK.device import check_error
+import numpy as np                # custom data is passed to the SDK without copies
+from WF_SDK import device
+from WF_SDK.library import dwf, constants
+from WF_SDK.device import check_error, error, wait_policy
 
 """-----------------------------------------------------------------------"""
 
@@ -40,9 +22,15 @@ class function:
     ramp_up = constants.funcRampUp
     ramp_down = constants.funcRampDown
 
+class node:
+    """ node names """
+    carrier = constants.AnalogOutNodeCarrier
+    am = constants.AnalogOutNodeAM      # amplitude modulation
+    fm = constants.AnalogOutNodeFM      # frequency modulation
+
 """-----------------------------------------------------------------------"""
 
-def generate(device_data, channel, function, offset, frequency=1e03, amplitude=1, symmetry=50, wait=0, run_time=0, repeat=0, data=[]):
+def generate(device_data, channel, function, offset, frequency=1e03, amplitude=1, symmetry=50, wait=0, run_time=0, repeat=0, data=[], normalize=False):
     """
         generate an analog signal
 
@@ -56,11 +44,13 @@ def generate(device_data, channel, function, offset, frequency=1e03, amplitude=1
                     - wait time in seconds, default is 0s
                     - run time in seconds, default is infinite (0)
                     - repeat count, default is infinite (0)
-                    - data - list of voltages, used only if function=custom, default is empty
+                    - data - samples between -1 and 1 (scaled by the amplitude), used only if function=custom,
+                      a list, a numpy array or any buffer of numbers, default is empty
+                    - normalize - if True, the custom data is scaled to a peak of 1, default is False
     """
     # enable channel
-    channel = ctypes.c_int(channel - 1)
-    if dwf.FDwfAnalogOutNodeEnableSet(device_data.handle, channel, constants.AnalogOutNodeCarrier, ctypes.c_bool(True)) == 0:
+    channel = channel - 1
+    if dwf.FDwfAnalogOutNodeEnableSet(device_data.handle, channel, constants.AnalogOutNodeCarrier, True) == 0:
         check_error()
     
     # set function type
@@ -69,53 +59,212 @@ def generate(device_data, channel, function, offset, frequency=1e03, amplitude=1
     
     # load data if the function type is custom
     if function == constants.funcCustom:
-        data_length = len(data)
-        buffer = (ctypes.c_double * data_length)()
-        for index in range(0, len(buffer)):
-            buffer[index] = ctypes.c_double(data[index])
-        if dwf.FDwfAnalogOutNodeDataSet(device_data.handle, channel, constants.AnalogOutNodeCarrier, buffer, ctypes.c_int(data_length)) == 0:
+        samples = __custom_data__(device_data, channel, data, normalize)
+        buffer = samples.ctypes.data_as(ctypes.POINTER(ctypes.c_double))
+        if dwf.FDwfAnalogOutNodeDataSet(device_data.handle, channel, constants.AnalogOutNodeCarrier, buffer, samples.size) == 0:
             check_error()
     
     # set frequency
-    if dwf.FDwfAnalogOutNodeFrequencySet(device_data.handle, channel, constants.AnalogOutNodeCarrier, ctypes.c_double(frequency)) == 0:
+    if dwf.FDwfAnalogOutNodeFrequencySet(device_data.handle, channel, constants.AnalogOutNodeCarrier, frequency) == 0:
         check_error()
     
     # set amplitude or DC voltage
-    if dwf.FDwfAnalogOutNodeAmplitudeSet(device_data.handle, channel, constants.AnalogOutNodeCarrier, ctypes.c_double(amplitude)) == 0:
+    if dwf.FDwfAnalogOutNodeAmplitudeSet(device_data.handle, channel, constants.AnalogOutNodeCarrier, amplitude) == 0:
         check_error()
     
     # set offset
-    if dwf.FDwfAnalogOutNodeOffsetSet(device_data.handle, channel, constants.AnalogOutNodeCarrier, ctypes.c_double(offset)) == 0:
+    if dwf.FDwfAnalogOutNodeOffsetSet(device_data.handle, channel, constants.AnalogOutNodeCarrier, offset) == 0:
         check_error()
     
     # set symmetry
-    if dwf.FDwfAnalogOutNodeSymmetrySet(device_data.handle, channel, constants.AnalogOutNodeCarrier, ctypes.c_double(symmetry)) == 0:
+    if dwf.FDwfAnalogOutNodeSymmetrySet(device_data.handle, channel, constants.AnalogOutNodeCarrier, symmetry) == 0:
         check_error()
     
     # set running time limit
-    if dwf.FDwfAnalogOutRunSet(device_data.handle, channel, ctypes.c_double(run_time)) == 0:
+    if dwf.FDwfAnalogOutRunSet(device_data.handle, channel, run_time) == 0:
         check_error()
     
     # set wait time before start
-    if dwf.FDwfAnalogOutWaitSet(device_data.handle, channel, ctypes.c_double(wait)) == 0:
+    if dwf.FDwfAnalogOutWaitSet(device_data.handle, channel, wait) == 0:
         check_error()
     
     # set number of repeating cycles
-    if dwf.FDwfAnalogOutRepeatSet(device_data.handle, channel, ctypes.c_int(repeat)) == 0:
+    if dwf.FDwfAnalogOutRepeatSet(device_data.handle, channel, repeat) == 0:
         check_error()
     
     # start
-    if dwf.FDwfAnalogOutConfigure(device_data.handle, channel, ctypes.c_bool(True)) == 0:
+    if dwf.FDwfAnalogOutConfigure(device_data.handle, channel, True) == 0:
         check_error()
     return
 
 """-----------------------------------------------------------------------"""
 
+def modulate(device_data, channel, node, function=function.sine, frequency=1e03, percentage=100, offset=0, symmetry=50, data=[], normalize=False, enable=True):
+    """
+        modulate the signal of a channel in hardware, call it after generate
+
+        the AM node scales the carrier amplitude by (1 + percentage/100 * modulation),
+        the FM node shifts the carrier frequency by percentage/100 * modulation,
+        so no custom buffer has to be computed and uploaded for a modulated signal
+
+        parameters: - device data
+                    - the selected wavegen channel (1-2)
+                    - node - possible: am, fm
+                    - function of the modulation - possible: custom, sine, square, triangle, noise, dc, pulse, trapezium, sine_power, ramp_up, ramp_down
+                    - modulation frequency in Hz, default is 1KHz
+                    - modulation depth (AM) or frequency deviation (FM) in percentage, default is 100%
+                    - offset of the modulation in percentage, default is 0%
+                    - signal symmetry in percentage, default is 50%
+                    - data - samples between -1 and 1, used only if function=custom, default is empty
+                    - normalize - if True, the custom data is scaled to a peak of 1, default is False
+                    - enable - False turns the modulation off, default is True
+    """
+    channel = channel - 1
+    handle = device_data.handle
+    node_index = __node_index__(node)
+
+    # enable or disable the node
+    if dwf.FDwfAnalogOutNodeEnableSet(handle, channel, node, enable) == 0:
+        check_error()
+
+    if enable:
+        # set function type
+        if dwf.FDwfAnalogOutNodeFunctionSet(handle, channel, node, function) == 0:
+            check_error()
+
+        # load data if the function type is custom
+        if function == constants.funcCustom:
+            samples = __custom_data__(device_data, channel, data, normalize, node_index)
+            if dwf.FDwfAnalogOutNodeDataSet(handle, channel, node, samples.ctypes.data_as(ctypes.POINTER(ctypes.c_double)), samples.size) == 0:
+                check_error()
+
+        # set frequency
+        if dwf.FDwfAnalogOutNodeFrequencySet(handle, channel, node, frequency) == 0:
+            check_error()
+
+        # set modulation depth or deviation
+        if dwf.FDwfAnalogOutNodeAmplitudeSet(handle, channel, node, percentage) == 0:
+            check_error()
+
+        # set offset
+        if dwf.FDwfAnalogOutNodeOffsetSet(handle, channel, node, offset) == 0:
+            check_error()
+
+        # set symmetry
+        if dwf.FDwfAnalogOutNodeSymmetrySet(handle, channel, node, symmetry) == 0:
+            check_error()
+
+    # restart, so the carrier and the modulation start in phase
+    if dwf.FDwfAnalogOutConfigure(handle, channel, True) == 0:
+        check_error()
+    return
+
+"""-----------------------------------------------------------------------"""
+
+def __node_index__(node):
+    """
+        check that a node is a modulation node and return its index
+    """
+    node_index = getattr(node, "value", node)
+    if node_index not in (constants.AnalogOutNodeAM.value, constants.AnalogOutNodeFM.value):
+        raise error("The node must be am or fm", "modulate", "wavegen")
+    return node_index
+
+"""-----------------------------------------------------------------------"""
+
+def __custom_data__(device_data, channel, data, normalize, node_index=0):
+    """
+        check the custom data of a channel (0-based index) and a node (carrier by default)
+
+        returns:    - contiguous float64 array, the data itself if it is already one
+    """
+    samples = np.ascontiguousarray(data, dtype=np.float64)
+    if samples.ndim != 1 or samples.size == 0:
+        raise error("The custom data must be a non-empty list of samples", "generate", "wavegen")
+
+    # the buffer size of the node, if the device was queried (the lists hold only the nodes of the channel)
+    output = device_data.analog.output
+    name = {constants.AnalogOutNodeCarrier.value: "carrier", constants.AnalogOutNodeFM.value: "FM", constants.AnalogOutNodeAM.value: "AM"}[node_index]
+    if channel < len(output.node_type) and channel < len(output.max_buffer_size):
+        if name not in output.node_type[channel]:
+            raise error("The channel has no " + name + " node", "generate", "wavegen")
+        buffer_size = output.max_buffer_size[channel][output.node_type[channel].index(name)]
+        if samples.size > buffer_size:
+            raise error("The custom data has " + str(samples.size) + " samples, the node holds at most " + str(buffer_size), "generate", "wavegen")
+
+    peak = np.max(np.abs(samples))
+    if not np.isfinite(peak):
+        raise error("The custom data contains NaN or infinite values", "generate", "wavegen")
+    if normalize:
+        if peak > 0:
+            samples = samples / peak
+    elif peak > 1:
+        raise error("The custom data must be between -1 and 1, use normalize=True to scale it", "generate", "wavegen")
+    return samples
+
+"""-----------------------------------------------------------------------"""
+
+class __source__:
+    """
+        reads the samples of play in chunks: from an array (or memmap), or from an iterable of chunks
+    """
+    def __init__(self, samples):
+        self.done = False
+        self.pending = np.zeros(0)
+        # arrays and buffers are sliced, only the read chunks are loaded
+        if isinstance(samples, (np.ndarray, list, tuple)):
+            self.array = np.asarray(samples)
+        else:
+            try:
+                self.array = np.asarray(memoryview(samples))
+            except TypeError:
+                self.array = None
+        if self.array is not None:
+            if self.array.ndim != 1:
+                raise error("The samples must be a one dimensional array", "play", "wavegen")
+            self.length = self.array.size
+            self.position = 0
+        else:
+            self.chunks = iter(samples)
+            self.length = None
+        return
+
+    def read(self, count):
+        """
+            returns:    - contiguous float64 array of at most count samples, empty at the end
+        """
+        if self.array is not None:
+            chunk = self.array[self.position:self.position + count]
+            self.position += chunk.size
+            self.done = self.position >= self.length
+        else:
+            # collect chunks until the count is reached, the rest is kept for the next read
+            parts = [self.pending]
+            size = self.pending.size
+            while size < count:
+                try:
+                    part = np.ravel(np.asarray(next(self.chunks), dtype=np.float64))
+                except StopIteration:
+                    break
+                parts.append(part)
+                size += part.size
+            chunk = np.concatenate(parts)
+            self.pending = chunk[count:]
+            chunk = chunk[:count]
+        chunk = np.ascontiguousarray(chunk, dtype=np.float64)
+        if chunk.size == 0:
+            self.done = True
+        elif not np.all(np.abs(chunk) <= 1):
+            raise error("The samples must be between -1 and 1", "play", "wavegen")
+        return chunk
+
+"""-----------------------------------------------------------------------"""
+
 def close(device_data, channel=0):
     """
         reset a wavegen channel, or all channels (channel=0)
     """
-    channel = ctypes.c_int(channel - 1)
+    channel = channel - 1
     if dwf.FDwfAnalogOutReset(device_data.handle, channel) == 0:
         check_error()
     return
@@ -124,8 +273,8 @@ def close(device_data, channel=0):
 
 def enable(device_data, channel):
     """ enables an analog output channel """
-    channel = ctypes.c_int(channel - 1)
-    if dwf.FDwfAnalogOutConfigure(device_data.handle, channel, ctypes.c_bool(True)) == 0:
+    channel = channel - 1
+    if dwf.FDwfAnalogOutConfigure(device_data.handle, channel, True) == 0:
         check_error()
     return
 
@@ -133,7 +282,361 @@ def enable(device_data, channel):
 
 def disable(device_data, channel):
     """ disables an analog output channel """
-    channel = ctypes.c_int(channel - 1)
-    if dwf.FDwfAnalogOutConfigure(device_data.handle, channel, ctypes.c_bool(False)) == 0:
+    channel = channel - 1
+    if dwf.FDwfAnalogOutConfigure(device_data.handle, channel, False) == 0:
         check_error()
     return
+
+"""-----------------------------------------------------------------------"""
+
+def play(device_data, channel, samples, sample_rate, amplitude=1, offset=0, allow_underrun=False, policy=None):
+    """
+        stream samples to the waveform generator (play mode)
+
+        the samples are sent in chunks while the device plays them, so the memory use
+        does not depend on the length of the sequence; a NumPy memmap is read one
+        chunk at a time; the function returns when the last sample was played, setting
+        the cancel event of the wait policy stops the playback
+
+        parameters: - device data
+                    - the selected wavegen channel (1-2)
+                    - samples between -1 and 1 (scaled by the amplitude): a NumPy array, a memmap,
+                      any buffer of numbers, or an iterable (generator) of such chunks
+                    - sample rate in Hz
+                    - amplitude in Volts, default is 1V
+                    - offset voltage in Volts, default is 0V
+                    - allow_underrun - if False, an error is raised when the device buffer runs empty,
+                      default is False
+                    - policy - wait policy between writes, default is None (adaptive, no timeout)
+
+        returns:    - number of played samples, number of lost samples (underrun), number of corrupted samples
+    """
+    handle = device_data.handle
+    index = channel - 1
+    carrier = constants.AnalogOutNodeCarrier
+    if policy is None:
+        policy = wait_policy()
+    source = __source__(samples)
+
+    # set up the play mode, the sample rate is the frequency of the carrier
+    if dwf.FDwfAnalogOutNodeEnableSet(handle, index, carrier, True) == 0:
+        check_error()
+    if dwf.FDwfAnalogOutNodeFunctionSet(handle, index, carrier, constants.funcPlay) == 0:
+        check_error()
+    if dwf.FDwfAnalogOutNodeFrequencySet(handle, index, carrier, sample_rate) == 0:
+        check_error()
+    if dwf.FDwfAnalogOutNodeAmplitudeSet(handle, index, carrier, amplitude) == 0:
+        check_error()
+    if dwf.FDwfAnalogOutNodeOffsetSet(handle, index, carrier, offset) == 0:
+        check_error()
+    # a known length stops the generator after the last sample
+    if dwf.FDwfAnalogOutRunSet(handle, index, source.length / sample_rate if source.length is not None else 0) == 0:
+        check_error()
+    if dwf.FDwfAnalogOutWaitSet(handle, index, 0) == 0:
+        check_error()
+    if dwf.FDwfAnalogOutRepeatSet(handle, index, 1) == 0:
+        check_error()
+
+    # the play buffer size is known after the function is set
+    buffer_size = ctypes.c_int()
+    if dwf.FDwfAnalogOutNodeDataInfo(handle, index, carrier, None, ctypes.byref(buffer_size)) == 0:
+        check_error()
+    buffer_size = buffer_size.value
+
+    # fill the device buffer before the start
+    chunk = source.read(buffer_size)
+    if chunk.size == 0:
+        raise error("There are no samples to play", "play", "wavegen")
+    if dwf.FDwfAnalogOutNodeDataSet(handle, index, carrier, chunk.ctypes.data_as(ctypes.POINTER(ctypes.c_double)), chunk.size) == 0:
+        check_error()
+    played = chunk.size
+    total_lost = 0
+    total_corrupted = 0
+
+    try:
+        if dwf.FDwfAnalogOutConfigure(handle, index, True) == 0:
+            check_error()
+
+        status = ctypes.c_ubyte()       # state of the generator
+        free = ctypes.c_int()           # free space in the device buffer
+        lost = ctypes.c_int()           # samples which were due before they arrived
+        corrupted = ctypes.c_int()      # samples which may have been overwritten
+        while True:
+            if dwf.FDwfAnalogOutStatus(handle, index, ctypes.byref(status)) == 0:
+                check_error("FDwfAnalogOutStatus", handle)
+            if status.value != constants.DwfStateRunning.value:
+                break
+            if dwf.FDwfAnalogOutNodePlayStatus(handle, index, carrier, ctypes.byref(free), ctypes.byref(lost), ctypes.byref(corrupted)) == 0:
+                check_error("FDwfAnalogOutNodePlayStatus", handle)
+            if source.done:
+                # the last samples are playing, stop when the buffer is empty
+                if free.value >= buffer_size:
+                    break
+            else:
+                total_lost += lost.value
+                total_corrupted += corrupted.value
+                if lost.value > 0 and not allow_underrun:
+                    raise error("Underrun: " + str(total_lost) + " samples were lost after " + str(played) + " samples", "play", "wavegen")
+
+                # send as many samples as fit in the buffer
+                chunk = source.read(free.value)
+                if chunk.size > 0:
+                    if dwf.FDwfAnalogOutNodePlayData(handle, index, carrier, chunk.ctypes.data_as(ctypes.POINTER(ctypes.c_double)), chunk.size) == 0:
+                        check_error()
+                    played += chunk.size
+
+            # stop when the wait is cancelled, even if the writes never sleep
+            if policy.cancel is not None and policy.cancel.is_set():
+                break
+
+            # let the device play about a quarter of the buffer before the next write
+            if source.done or free.value - chunk.size < buffer_size / 4:
+                delay = min(buffer_size / sample_rate / 4, policy.max_interval)
+                if not device.sleep(policy, delay):
+                    break
+    finally:
+        # stop the generator, also after an underrun or an error
+        if dwf.FDwfAnalogOutConfigure(handle, index, False) == 0:
+            check_error()
+    return played, total_lost, total_corrupted
+
+"""-----------------------------------------------------------------------"""
+
+class instrument:
+    """
+        waveform generator of one device
+
+        the generator keeps no settings on the host, the methods are the
+        module functions without the device data
+
+        parameters: - device data
+    """
+    def __init__(self, device_data):
+        self.device_data = device_data
+        return
+
+    def generate(self, channel, function, offset, frequency=1e03, amplitude=1, symmetry=50, wait=0, run_time=0, repeat=0, data=[], normalize=False):
+        """
+            generate an analog signal, see generate
+        """
+        generate(self.device_data, channel, function, offset, frequency, amplitude, symmetry, wait, run_time, repeat, data, normalize)
+        return
+
+    def modulate(self, channel, node, function=function.sine, frequency=1e03, percentage=100, offset=0, symmetry=50, data=[], normalize=False, enable=True):
+        """
+            modulate the signal of a channel in hardware, see modulate
+        """
+        modulate(self.device_data, channel, node, function, frequency, percentage, offset, symmetry, data, normalize, enable)
+        return
+
+    def play(self, channel, samples, sample_rate, amplitude=1, offset=0, allow_underrun=False, policy=None):
+        """
+            stream samples to the waveform generator, see play
+        """
+        return play(self.device_data, channel, samples, sample_rate, amplitude, offset, allow_underrun, policy)
+
+    def close(self, channel=0):
+        """
+            reset a wavegen channel, or all channels (channel=0)
+        """
+        close(self.device_data, channel)
+        return
+
+    def enable(self, channel):
+        """ enables an analog output channel """
+        enable(self.device_data, channel)
+        return
+
+    def disable(self, channel):
+        """ disables an analog output channel """
+        disable(self.device_data, channel)
+        return
+
+"""-----------------------------------------------------------------------"""
+
+class output:
+    """
+        a waveform generator channel which remembers its settings and sends only the changes
+
+        while the channel runs, frequency, amplitude, offset and symmetry changes are
+        applied on the fly, without restarting the signal; changing the function,
+        the custom data, the wait, the run time or the repeat count restarts it;
+        the AM and FM nodes (see modulate) follow the same rules
+
+        a frequency or amplitude step costs two SDK calls (the setting and the apply),
+        instead of the eleven calls and the restart of generate; with the simulator
+        backend (no USB, Python 3.11, one CPU core) benchmarks/wavegen_update.py
+        measured about 80000 steps/s for set and 19000 steps/s for generate, so the
+        Python side is not the limit, on a device the rate is set by the USB round
+        trip of the two calls (run the benchmark with --backend libdwf to measure it)
+
+        the channel doesn't know about changes made with the module functions,
+        call close (or create a new output) after using them on the same channel
+
+        parameters: - device data
+                    - the selected wavegen channel (1-2)
+    """
+    def __init__(self, device_data, channel):
+        self.device_data = device_data
+        self.channel = channel
+        self.running = False
+        self.__sent__ = {}      # the settings on the device
+        return
+
+    def generate(self, function, offset, frequency=1e03, amplitude=1, symmetry=50, wait=0, run_time=0, repeat=0, data=[], normalize=False):
+        """
+            generate an analog signal, see generate, only the changed settings are sent
+        """
+        self.set(function=function, offset=offset, frequency=frequency, amplitude=amplitude, symmetry=symmetry,
+                 wait=wait, run_time=run_time, repeat=repeat, data=data, normalize=normalize)
+        return
+
+    def set(self, function=None, offset=None, frequency=None, amplitude=None, symmetry=None, wait=None, run_time=None, repeat=None, data=None, normalize=False):
+        """
+            change some settings and start the signal, the others are kept
+
+            parameters: - the settings of generate, None keeps the current value
+        """
+        handle = self.device_data.handle
+        index = self.channel - 1
+        carrier = constants.AnalogOutNodeCarrier
+        restart = not self.running
+
+        # enable the carrier once
+        if "enabled" not in self.__sent__:
+            if dwf.FDwfAnalogOutNodeEnableSet(handle, index, carrier, True) == 0:
+                check_error()
+            self.__sent__["enabled"] = True
+
+        # a new function needs its custom data again
+        if function is not None and not self.__same__("function", function):
+            if dwf.FDwfAnalogOutNodeFunctionSet(handle, index, carrier, function) == 0:
+                check_error()
+            self.__sent__["function"] = function
+            self.__sent__.pop("data", None)
+            restart = True
+        if data is not None and self.__same__("function", constants.funcCustom):
+            samples = __custom_data__(self.device_data, index, data, normalize)
+            if not self.__same__("data", samples):
+                if dwf.FDwfAnalogOutNodeDataSet(handle, index, carrier, samples.ctypes.data_as(ctypes.POINTER(ctypes.c_double)), samples.size) == 0:
+                    check_error()
+                self.__sent__["data"] = samples.copy()
+                restart = True
+
+        # settings which can be changed on the fly
+        changed = False
+        for name, value, setter in (("frequency", frequency, dwf.FDwfAnalogOutNodeFrequencySet), ("amplitude", amplitude, dwf.FDwfAnalogOutNodeAmplitudeSet),
+                                    ("offset", offset, dwf.FDwfAnalogOutNodeOffsetSet), ("symmetry", symmetry, dwf.FDwfAnalogOutNodeSymmetrySet)):
+            if value is not None and not self.__same__(name, value):
+                if setter(handle, index, carrier, value) == 0:
+                    check_error()
+                self.__sent__[name] = value
+                changed = True
+
+        # timing settings, they take effect on restart
+        for name, value, setter in (("run_time", run_time, dwf.FDwfAnalogOutRunSet), ("wait", wait, dwf.FDwfAnalogOutWaitSet),
+                                    ("repeat", repeat, dwf.FDwfAnalogOutRepeatSet)):
+            if value is not None and not self.__same__(name, value):
+                if setter(handle, index, value) == 0:
+                    check_error()
+                self.__sent__[name] = value
+                restart = True
+
+        # start, or apply the changes to the running signal (3)
+        if restart:
+            self.start()
+        elif changed:
+            if dwf.FDwfAnalogOutConfigure(handle, index, 3) == 0:
+                check_error()
+        return
+
+    def modulate(self, node, function=None, frequency=None, percentage=None, offset=None, symmetry=None, data=None, normalize=False, enable=True):
+        """
+            change the modulation of the signal, see modulate, only the changed settings are sent
+
+            the modulation is applied with the next set or start if the signal is stopped
+
+            parameters: - node - possible: am, fm
+                        - the settings of modulate, None keeps the current value
+                        - enable - False turns the modulation off, the other settings are ignored
+        """
+        handle = self.device_data.handle
+        index = self.channel - 1
+        node_index = __node_index__(node)
+        restart = False
+        changed = False
+
+        # the settings of a node are stored under (node index, name)
+        if not self.__same__((node_index, "enabled"), enable):
+            if dwf.FDwfAnalogOutNodeEnableSet(handle, index, node, enable) == 0:
+                check_error()
+            self.__sent__[(node_index, "enabled")] = enable
+            restart = True
+
+        if enable:
+            # a new function needs its custom data again
+            if function is not None and not self.__same__((node_index, "function"), function):
+                if dwf.FDwfAnalogOutNodeFunctionSet(handle, index, node, function) == 0:
+                    check_error()
+                self.__sent__[(node_index, "function")] = function
+                self.__sent__.pop((node_index, "data"), None)
+                restart = True
+            if data is not None and self.__same__((node_index, "function"), constants.funcCustom):
+                samples = __custom_data__(self.device_data, index, data, normalize, node_index)
+                if not self.__same__((node_index, "data"), samples):
+                    if dwf.FDwfAnalogOutNodeDataSet(handle, index, node, samples.ctypes.data_as(ctypes.POINTER(ctypes.c_double)), samples.size) == 0:
+                        check_error()
+                    self.__sent__[(node_index, "data")] = samples.copy()
+                    restart = True
+
+            # settings which can be changed on the fly
+            for name, value, setter in (("frequency", frequency, dwf.FDwfAnalogOutNodeFrequencySet), ("percentage", percentage, dwf.FDwfAnalogOutNodeAmplitudeSet),
+                                        ("offset", offset, dwf.FDwfAnalogOutNodeOffsetSet), ("symmetry", symmetry, dwf.FDwfAnalogOutNodeSymmetrySet)):
+                if value is not None and not self.__same__((node_index, name), value):
+                    if setter(handle, index, node, value) == 0:
+                        check_error()
+                    self.__sent__[(node_index, name)] = value
+                    changed = True
+
+        # a stopped signal waits for start, a running one is restarted or updated (3)
+        if self.running:
+            if restart:
+                self.start()
+            elif changed:
+                if dwf.FDwfAnalogOutConfigure(handle, index, 3) == 0:
+                    check_error()
+        return
+
+    def start(self):
+        """ starts (or restarts) the signal """
+        if dwf.FDwfAnalogOutConfigure(self.device_data.handle, self.channel - 1, True) == 0:
+            check_error()
+        self.running = True
+        return
+
+    def stop(self):
+        """ stops the signal, the settings are kept """
+        if dwf.FDwfAnalogOutConfigure(self.device_data.handle, self.channel - 1, False) == 0:
+            check_error()
+        self.running = False
+        return
+
+    def close(self):
+        """
+            reset the channel, the next call sends every setting again
+        """
+        close(self.device_data, self.channel)
+        self.running = False
+        self.__sent__ = {}
+        return
+
+    def __same__(self, name, value):
+        """
+            check if a setting is already on the device
+        """
+        if name not in self.__sent__:
+            return False
+        if isinstance(value, np.ndarray):
+            return np.array_equal(self.__sent__[name], value)
+        # the functions are ctypes values, which are compared by identity
+        return getattr(self.__sent__[name], "value", self.__sent__[name]) == getattr(value, "value", value)
@@ -0,0 +1,67 @@
+""" IMPORT TIME BENCHMARK: measures how long the package imports take in a fresh interpreter """
+
+import argparse                   # command line options
+import os                         # paths of the repository
+import statistics                 # median of the runs
+import subprocess                 # every import runs in a new interpreter
+import sys                        # the current interpreter
+
+# statements to measure: name, statement
+statements = [("import WF_SDK", "import WF_SDK"),
+              ("WF_SDK.scope", "from WF_SDK import scope"),
+              ("WF_SDK.logic", "from WF_SDK import logic"),
+              ("all submodules", "import WF_SDK; [getattr(WF_SDK, name) for name in WF_SDK.__submodules__]; import WF_SDK.protocol.uart, WF_SDK.protocol.spi, WF_SDK.protocol.i2c"),
+              ("lab_10_template", "import lab_10_template")]
+
+# the repository root, so the package and the template are found without installing them
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+"""-----------------------------------------------------------------------"""
+
+def measure(statement, runs):
+    """
+        measure an import statement
+
+        parameters: - the statement to execute
+                    - number of runs
+
+        returns:    - the median time in seconds
+    """
+    # the timer runs inside the child, so the interpreter start up is not counted
+    code = "import time; start = time.perf_counter(); " + statement + "; print(time.perf_counter() - start)"
+    environment = dict(os.environ)
+    environment["PYTHONPATH"] = root + os.pathsep + environment.get("PYTHONPATH", "")
+    times = []
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, cwd=root, env=environment)
+        if result.returncode != 0:
+            raise RuntimeError(statement + " failed:\n" + result.stderr)
+        times.append(float(result.stdout.split()[-1]))
+    return statistics.median(times)
+
+"""-----------------------------------------------------------------------"""
+
+def main():
+    parser = argparse.ArgumentParser(description="measure the import time of WF_SDK")
+    parser.add_argument("--runs", type=int, default=5, help="runs per statement, the median is reported (default: 5)")
+    parser.add_argument("--limit", type=float, default=0, help="fail if \"import WF_SDK\" takes longer than this many milliseconds (default: no limit)")
+    arguments = parser.parse_args()
+
+    failed = False
+    for name, statement in statements:
+        try:
+            seconds = measure(statement, arguments.runs)
+        except RuntimeError as error:
+            print(name.ljust(20) + "skipped: " + str(error).splitlines()[-1])
+            continue
+        print(name.ljust(20) + format(seconds * 1e03, "8.1f") + " ms")
+        if name == "import WF_SDK" and arguments.limit > 0 and seconds * 1e03 > arguments.limit:
+            failed = True
+
+    if failed:
+        print("import WF_SDK is slower than " + str(arguments.limit) + " ms")
+        sys.exit(1)
+    return
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+""" REPLAY BENCHMARK: records a script against a device, or runs it again on a recorded trace and measures it """
+
+import argparse                   # command line options
+import cProfile                   # optional profile of the run
+import os                         # paths of the repository
+import pstats                     # report of the profile
+import runpy                      # the script runs as __main__
+import sys                        # the script arguments
+import time                       # duration of the run
+
+# the repository root, so the package is found without installing it
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+"""-----------------------------------------------------------------------"""
+
+def main():
+    parser = argparse.ArgumentParser(description="record a WF_SDK script into a trace, or replay it without the device")
+    parser.add_argument("trace", help="trace file")
+    parser.add_argument("script", help="script to run as __main__, e.g. lab_10_template.py")
+    parser.add_argument("arguments", nargs=argparse.REMAINDER, help="arguments of the script")
+    parser.add_argument("--record", choices=["libdwf", "simulator"], help="record the trace with this backend instead of replaying it")
+    parser.add_argument("--realtime", action="store_true", help="replay with the recorded timing (default: as fast as possible)")
+    parser.add_argument("--profile", type=int, default=0, metavar="N", help="print the N functions with the largest cumulative time")
+    arguments = parser.parse_args()
+
+    sys.path.insert(0, root)
+    from WF_SDK import library, trace
+    library.select(arguments.record or "replay", arguments.trace)
+    trace.settings.realtime = arguments.realtime
+
+    # run the script like "python script arguments"
+    sys.argv = [arguments.script] + arguments.arguments
+    sys.path.insert(0, os.path.dirname(os.path.abspath(arguments.script)))
+    profile = cProfile.Profile() if arguments.profile > 0 else None
+    start = time.perf_counter()
+    if profile is not None:
+        profile.enable()
+    try:
+        runpy.run_path(arguments.script, run_name="__main__")
+    finally:
+        if profile is not None:
+            profile.disable()
+        print(("recorded " if arguments.record else "replayed ") + arguments.script + " in " + format(time.perf_counter() - start, ".3f") + " s")
+    if profile is not None:
+        pstats.Stats(profile).sort_stats("cumulative").print_stats(arguments.profile)
+    return
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+""" WAVEGEN UPDATE BENCHMARK: measures how many frequency steps per second the waveform generator accepts """
+
+import argparse                   # command line options
+import os                         # paths of the repository
+import sys                        # the package is imported from the repository
+import time                       # duration of the steps
+
+# the repository root, so the package is found without installing it
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+"""-----------------------------------------------------------------------"""
+
+def measure(step, frequencies):
+    """
+        call a step function for every frequency
+
+        returns:    - steps per second
+    """
+    start = time.perf_counter()
+    for frequency in frequencies:
+        step(frequency)
+    return len(frequencies) / (time.perf_counter() - start)
+
+"""-----------------------------------------------------------------------"""
+
+def main():
+    parser = argparse.ArgumentParser(description="measure the frequency update rate of wavegen.generate and wavegen.output")
+    parser.add_argument("--backend", choices=["libdwf", "simulator"], default="libdwf", help="library backend (default: libdwf, a connected device)")
+    parser.add_argument("--steps", type=int, default=200, help="frequency steps per method (default: 200)")
+    arguments = parser.parse_args()
+
+    sys.path.insert(0, root)
+    from WF_SDK import library
+    library.select(arguments.backend)
+    from WF_SDK import device, wavegen
+
+    frequencies = [1e03 + 10 * index for index in range(arguments.steps)]
+    device_data = device.open()
+    try:
+        rate = measure(lambda frequency: wavegen.generate(device_data, 1, wavegen.function.sine, 0, frequency, 1), frequencies)
+        print("wavegen.generate".ljust(20) + format(rate, "10.1f") + " steps/s")
+        channel = wavegen.output(device_data, 1)
+        channel.generate(wavegen.function.sine, 0, frequencies[0], 1)
+        rate = measure(lambda frequency: channel.set(frequency=frequency), frequencies[1:] + frequencies[:1])
+        print("wavegen.output.set".ljust(20) + format(rate, "10.1f") + " steps/s")
+        wavegen.close(device_data)
+    finally:
+        device.close(device_data)
+    return
+
+if __name__ == "__main__":
+    main()
@@ -10,7 +10,10 @@ Important objects:
             open_scope: opens connection to oscilloscope
             trigger_scope: sets trigger level for scope (buggy)
             read_scope: collects data from oscilloscope
+            stream_scope: collects long traces from oscilloscope in record mode
             close_scope: closes connection to oscilloscope
+            start_monitor: keeps the oscilloscope recording in the background
+            stop_monitor: stops the background recording
             use_wavegen: outputs function at wavegen
             close_wavegen: closes connection to wavegen
             disconnect: closes connection to ADS
@@ -21,14 +24,15 @@ Important objects:
     wavegen_functions (dict): easy names to access major types of functions wavegen can output
 """
 import traceback
+import warnings
 import time
 import os
 import numpy as np
-import matplotlib.pyplot as plt
-import scipy.signal as sig
+# matplotlib and scipy.signal are imported in the functions which use them, so the import of this file stays fast
 from WF_SDK import device
 from WF_SDK import scope
 from WF_SDK import wavegen
+from WF_SDK import monitor
 
 class ADSHardware():
     """Class of functions for interfacing with the ADS.
@@ -36,12 +40,16 @@ class ADSHardware():
 
     def __init__(self):
         self.handle = None
+        self.monitor = None
+        self.scope_session = None
+        self.wavegen_outputs = {}
 
     def startup(self):
         """Connects to the ADS. Defines 'handle', the address to the ADS.
         Must be run at the beginning of every program using the ADS.
         """
         self.handle = device.open()
+        self.scope_session = scope.session(self.handle)
 
     def open_scope(self, buffer_size=1000, sample_freq=1e6):
         """Opens connection to the scope.
@@ -55,7 +63,7 @@ class ADSHardware():
             many data points/the function is taking awhile to run for the time scale you need.
             (16e3 can be a reasonable selection.)
         """
-        scope.open(self.handle, buffer_size=buffer_size, sampling_frequency=sample_freq)
+        self.scope_session.configure(buffer_size=buffer_size, sampling_frequency=sample_freq)
 
     def trigger_scope(self, channel=1, level=0.1):
         """Sets trigger level for the scope. Kind of a buggy function; not used.
@@ -65,8 +73,8 @@ class ADSHardware():
             Defaults to 1.
             level (float, optional): Sets trigger level for scope. Defaults to 0.1.
         """
-        scope.trigger(self.handle, enable=True, source=scope.trigger_source.analog, channel=channel,
-                      edge_rising=True, level=level)
+        self.scope_session.trigger(enable=True, source=scope.trigger_source.analog, channel=channel,
+                                   edge_rising=True, level=level)
 
     def read_scope(self, channel=1):
         """Collects data from the scope.
@@ -78,13 +86,59 @@ class ADSHardware():
             buffer (array): An array of output data points. The buffer is a temporary slot 
             for storing a small amount of data before it is transferred to its final destination.
         """
-        buffer = scope.record(self.handle, channel=channel)
+        buffer = scope.record(self.handle, channel=channel, as_array=True)
         return buffer
 
+    def stream_scope(self, duration, channel=1):
+        """Collects data from the scope in record mode. Use this for traces
+        longer than the scope buffer.
+
+        Args:
+            duration (float): Time length of trace to collect in seconds.
+            channel (int, optional): Which channel to read from. Defaults to 1.
+
+        Returns:
+            buffer (array): An array of output data points.
+        """
+        chunks = []
+        lost = 0
+        corrupted = 0
+        for samples, chunk_lost, chunk_corrupted in scope.stream(self.handle, channel=channel, duration=duration):
+            chunks.append(samples)
+            lost += chunk_lost
+            corrupted += chunk_corrupted
+        if lost > 0 or corrupted > 0:
+            warnings.warn(f"{lost} samples lost and {corrupted} samples corrupted; try a lower sampling frequency.")
+        if not chunks:
+            return np.empty(0)
+        return np.concatenate(chunks)
+
     def close_scope(self):
         """Closes connection to the scope.
         """
-        scope.close(self.handle)
+        self.scope_session.close()
+
+    def start_monitor(self, length=60, sample_freq=500, channels=(1,)):
+        """Starts recording the scope in the background. While the monitor runs,
+        oscilloscope_run reads from it instead of opening and closing the scope.
+
+        Args:
+            length (float, optional): Seconds of history kept in memory. Defaults to 60.
+            sample_freq (float, optional): Sampling frequency (Hz). Defaults to 500.
+            channels (tuple, optional): Which channels to record. Defaults to (1,).
+        """
+        self.stop_monitor()
+        self.scope_session.configure(sampling_frequency=sample_freq)
+        self.monitor = monitor.background(self.handle, channels=channels, length=length, oscilloscope=self.scope_session)
+        self.monitor.start()
+
+    def stop_monitor(self):
+        """Stops the background recording and closes the scope.
+        """
+        if self.monitor is not None:
+            self.monitor.stop()
+            self.monitor = None
+            self.scope_session.close()
 
     def use_wavegen(self, channel=1, function=wavegen.function.sine, offset_v=0, freq_hz=1e3, amp_v=1):
         """Runs the wavegen producing function with given parameters.
@@ -97,18 +151,25 @@ class ADSHardware():
             freq (int, optional): Frequency (Hz). Defaults to 1e3.
             amp (int, optional): Amplitude (V). Defaults to 1.
         """
-        wavegen.generate(self.handle, channel=channel, function=function, offset=offset_v,
-                         frequency=freq_hz, amplitude=amp_v)
+        # the output remembers the settings, a sweep only sends the changed frequency or amplitude
+        if channel not in self.wavegen_outputs:
+            self.wavegen_outputs[channel] = wavegen.output(self.handle, channel)
+        self.wavegen_outputs[channel].generate(function=function, offset=offset_v, frequency=freq_hz, amplitude=amp_v)
 
     def close_wavegen(self):
         """Closes wavegen.
         """
         wavegen.close(self.handle)
+        self.wavegen_outputs = {}
 
     def disconnect(self):
         """Closes ADS connection. Must be run at the end of every program.
         """
-        device.close(self.handle)
+        self.stop_monitor()
+        if self.scope_session is not None:
+            self.scope_session.close()
+        if self.handle is not None:
+            device.close(self.handle)
 
 def oscilloscope_run(ads_object: ADSHardware, duration: int, channel: int, sampling_freq=500):
     """Collects data from the oscilloscope.
@@ -127,17 +188,37 @@ def oscilloscope_run(ads_object: ADSHardware, duration: int, channel: int, sampl
     """
     buffer_size = int(duration * sampling_freq)
     data = {}
-    ads_object.open_scope(sample_freq=sampling_freq, buffer_size=buffer_size)
-
     MS_CONVERSION = 1e3
 
-    buffer = ads_object.read_scope()
+    #if the scope is recording in the background, take the next trace from it
+    recorder = ads_object.monitor
+    if recorder is not None and recorder.running and channel in recorder.channels \
+            and recorder.sampling_frequency == sampling_freq and buffer_size <= recorder.size:
+        cursor = recorder.cursor
+        while recorder.cursor < cursor + buffer_size:
+            if not recorder.running:
+                raise RuntimeError("The scope monitor stopped: " + repr(recorder.exception))
+            time.sleep(0.05)
+        samples, _ = recorder.read_since(cursor)
+        data["y"] = samples[recorder.channels.index(channel), :buffer_size]
+        data["x"] = np.arange(buffer_size)
+        return data
+
+    #long traces do not fit in the scope buffer, so they are streamed
+    #through a buffer of the device's size
+    streaming = buffer_size > ads_object.handle.analog.input.max_buffer_size
+    ads_object.open_scope(sample_freq=sampling_freq, buffer_size=0 if streaming else buffer_size)
+
+    if streaming:
+        buffer = ads_object.stream_scope(duration)
+    else:
+        buffer = ads_object.read_scope()
     data["y"] = buffer
 
     # MODIFY THE LINE BELOW THIS ONE IN L10.2(d)
-    data["x"] = np.arange(buffer_size)
+    data["x"] = np.arange(len(buffer))
 
-    ads_object.close_scope()
+    #the scope stays configured, so repeated runs only pay for the acquisition
     return data
 
 def fft(data: dict):
@@ -172,6 +253,8 @@ def butter_lowpass_filter(data, cutoff: float, fs: float, order=5):
     Returns:
         list: Low pass filtered data in V.
     """
+    import scipy.signal as sig
+
     # Define lowpass filter coefficients using butter function in scipy.signal package
     b, a = sig.butter(order, cutoff, btype='lowpass', analog=False, fs=fs, output='ba')
     # Applies lowpass filter using scipy.signal.filtfilt function
@@ -203,6 +286,7 @@ def demodulate_radio(data: dict, nu_3db: float, save=True):
     demod_data["y"] = ... #low pass
 
     #plot the different steps
+    import matplotlib.pyplot as plt
     fig, axs = plt.subplots(2, 2)
     axs[0, 0].plot(demod_data["x"], data["y"])
     axs[0, 0].set_title('Raw Signal (Vout)')
@@ -283,6 +367,7 @@ def demodulate_lockin(ads_object: ADSHardware, nu_mod: float, nu_3db: float, dur
     demodulated_data["y"] = np.sqrt(demodulated_data["lowpass_cos"]**2 + demodulated_data["lowpass_sin"]**2)
 
     #plot the steps to get demodulated signal
+    import matplotlib.pyplot as plt
     fig, axs = plt.subplots(2, 2)
     axs[0, 0].plot(demodulated_data["x"], data["y"])
     axs[0, 0].set_title('Raw Signal')
@@ -324,6 +409,8 @@ wavegen_functions = {"sine":wavegen.function.sine, "square":wavegen.function.squ
                      "triangle":wavegen.function.triangle, "dc":wavegen.function.dc}
 
 if __name__ == "__main__":
+    import matplotlib.pyplot as plt
+
     ads = ADSHardware()
     ads.startup()
 
@@ -0,0 +1,53 @@
+""" TEST SETUP: the tests run on the simulated device (WF_SDK_BACKEND=simulator), no hardware or WaveForms needed """
+
+import collections                # call counters
+import os                         # backend selection
+import sys                        # the package is found without installing it
+
+# select the backend before the package loads it, a trace would change the recorded calls
+os.environ["WF_SDK_BACKEND"] = "simulator"
+os.environ.pop("WF_SDK_TRACE", None)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from WF_SDK import device, library, simulator
+
+# two devices for the manager, the device clock jumps ahead instead of waiting
+simulator.settings.device_count = 2
+simulator.settings.realtime = False
+simulator.settings.seed = 0
+
+"""-----------------------------------------------------------------------"""
+
+@pytest.fixture(autouse=True, scope="session")
+def capability_cache(tmp_path_factory):
+    """ keep the capability cache out of the home directory """
+    device.info_cache.path = str(tmp_path_factory.mktemp("cache"))
+    return device.info_cache.path
+
+@pytest.fixture
+def device_data():
+    """ an opened simulated device """
+    device_data = device.open()
+    yield device_data
+    device.close(device_data)
+
+@pytest.fixture
+def calls(monkeypatch):
+    """
+        count the calls of SDK functions
+
+        returns:    - a function which starts counting the given SDK functions and
+                      returns the counter (function name: number of calls)
+    """
+    counter = collections.Counter()
+
+    def watch(*names):
+        for name in names:
+            function = getattr(library.dwf, name)
+            def call(*arguments, function=function, name=name):
+                counter[name] += 1
+                return function(*arguments)
+            monkeypatch.setattr(library.dwf, name, call)
+        return counter
+    return watch
@@ -0,0 +1,73 @@
+""" ACQUISITION TESTS: logic.record, monitor.background, aio """
+
+import asyncio
+import time
+import numpy as np
+import pytest
+from WF_SDK import aio, logic, monitor, pattern, scope, wavegen
+
+"""-----------------------------------------------------------------------"""
+
+def test_logic_record(device_data):
+    # a 100kHz clock on DIO 0, recorded at 1MHz: 5 samples high, 5 low
+    pattern.generate(device_data, 0, pattern.function.pulse, 100e03)
+    logic.open(device_data, sampling_frequency=1e06, buffer_size=100)
+    samples = logic.record(device_data, 0, as_array=True)
+    assert samples.dtype == np.uint8 and samples.shape == (100,)
+    assert np.all(np.abs(np.diff(np.flatnonzero(np.diff(samples))) - 5) <= 1)
+    assert 45 <= samples.sum() <= 55
+    assert set(logic.record(device_data, 0)) == {0, 1}
+
+    # the bits are written into a preallocated array
+    out = np.full(100, 7, dtype=np.uint8)
+    assert np.shares_memory(logic.record(device_data, 0, out=out), out)
+    assert 45 <= out.sum() <= 55
+    logic.close(device_data)
+    pattern.close(device_data)
+
+"""-----------------------------------------------------------------------"""
+
+def test_monitor(device_data):
+    wavegen.generate(device_data, 1, wavegen.function.dc, 0.25)
+    oscilloscope = scope.instrument(device_data)
+    oscilloscope.open(sampling_frequency=10e03, buffer_size=1000)
+    background = monitor.background(device_data, channels=(1,), length=1, oscilloscope=oscilloscope)
+    with background:
+        deadline = time.perf_counter() + 5
+        while background.cursor < 20000 and time.perf_counter() < deadline:
+            time.sleep(0.01)
+    assert background.exception is None and not background.running
+
+    # the ring buffer keeps the last second
+    assert background.cursor >= 20000
+    assert background.read_latest().shape == (1, 10000)
+    latest = background.read_latest(0.01)
+    assert latest.shape == (1, 100) and np.allclose(latest, 0.25, atol=0.01)
+
+    # old cursors are moved to the oldest kept sample
+    samples, cursor = background.read_since(0)
+    assert samples.shape == (1, 10000) and cursor == background.cursor
+    assert background.overruns == background.cursor - 10000
+    wavegen.close(device_data)
+
+"""-----------------------------------------------------------------------"""
+
+def test_aio(device_data):
+    wavegen.generate(device_data, 1, wavegen.function.dc, 0.5)
+    wavegen.generate(device_data, 2, wavegen.function.dc, -0.5)
+    scope.open(device_data, sampling_frequency=1e06, buffer_size=1000)
+
+    async def capture():
+        # the acquisition and an other task run on the same event loop
+        ticks = []
+        async def tick():
+            ticks.append(True)
+        single, both, _ = await asyncio.gather(aio.record_scope(device_data, 1), aio.record_scope_channels(device_data, [1, 2]), tick())
+        return single, both, ticks
+
+    single, both, ticks = asyncio.run(capture())
+    assert single.shape == (1000,) and np.allclose(single, 0.5, atol=0.01)
+    assert both.shape == (2, 1000) and np.allclose(both.mean(axis=1), [0.5, -0.5], atol=0.01)
+    assert ticks == [True]
+    scope.close(device_data)
+    wavegen.close(device_data)
@@ -0,0 +1,45 @@
+""" FREQUENCY RESPONSE TESTS: capture, sweep, response """
+
+import numpy as np
+import pytest
+from WF_SDK import bode
+from WF_SDK.device import error
+
+"""-----------------------------------------------------------------------"""
+
+@pytest.mark.parametrize("frequency", [10, 1e03, 1234.5, 33333, 1e06])
+def test_capture(frequency):
+    sampling_frequency, count = bode.capture(frequency, 100e06, 8192)
+    # the sample rate divides the clock, the capture holds whole periods in the buffer
+    divider = 100e06 / sampling_frequency
+    assert divider == pytest.approx(round(divider))
+    assert count <= 8192
+    periods = count * frequency / sampling_frequency
+    assert periods >= 2 - 1e-03
+    assert periods == pytest.approx(round(periods), abs=1e-03)
+
+def test_sweep_loopback(device_data):
+    # wavegen channel 1 is looped back into scope channel 1: unity gain, no phase shift
+    frequencies = np.logspace(2, 5, 7)
+    result = bode.sweep(device_data, frequencies, amplitude=1, input_channel=1, output_channel=1)
+    assert np.array_equal(result.frequency, frequencies)
+    assert np.allclose(result.input_amplitude, 1, atol=0.01)
+    assert np.allclose(result.gain, 1, atol=1e-06)
+    assert np.allclose(result.gain_db, 0, atol=1e-05)
+    assert np.allclose(result.phase, 0, atol=1e-03)
+
+def test_sweep_without_input(device_data):
+    # nothing drives scope channel 2, there is no gain to measure
+    with pytest.raises(error, match="input amplitude"):
+        bode.sweep(device_data, [100, 1e03], input_channel=2, output_channel=1)
+
+def test_sweep_frequencies(device_data):
+    with pytest.raises(error):
+        bode.sweep(device_data, [100, 0])
+
+def test_response():
+    result = bode.response(np.array([1.0, 2, 3]), np.array([1.0, 0, 0.5]), np.array([2.0, 1, 0]), np.zeros(3))
+    assert result.gain[0] == 2 and result.gain_db[0] == pytest.approx(20 * np.log10(2))
+    # no input: no gain, no output: -inf dB
+    assert np.isnan(result.gain[1]) and np.isnan(result.gain_db[1])
+    assert result.gain[2] == 0 and result.gain_db[2] == -np.inf
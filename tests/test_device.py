@@ -0,0 +1,122 @@
+""" DEVICE TESTS: info_cache, count_errors, error_rate, wait_policy, wait, manager """
+
+import os
+import threading
+import numpy as np
+import pytest
+from WF_SDK import device, manager, scope, wavegen
+
+"""-----------------------------------------------------------------------"""
+
+def test_capability_cache(monkeypatch, tmp_path, calls):
+    monkeypatch.setattr(device.info_cache, "path", str(tmp_path))
+    counter = calls("FDwfAnalogInBufferSizeInfo", "FDwfAnalogIOChannelCount")
+
+    # the first open queries the capabilities and stores them
+    device_data = device.open()
+    device.close(device_data)
+    assert counter["FDwfAnalogInBufferSizeInfo"] == 1
+    files = os.listdir(tmp_path)
+    assert len(files) == 1 and files[0].endswith("-v" + str(device.info_cache.version) + ".json")
+
+    # the next one loads them, and gets the same capabilities
+    cached = device.open()
+    device.close(cached)
+    assert counter["FDwfAnalogInBufferSizeInfo"] == 1 and counter["FDwfAnalogIOChannelCount"] == 1
+    assert cached.analog.input.max_buffer_size == device_data.analog.input.max_buffer_size
+    assert cached.analog.IO.channel_label == device_data.analog.IO.channel_label
+    assert cached.analog.IO.__lookup__ == device_data.analog.IO.__lookup__
+
+    # refresh queries them again
+    device.close(device.open(refresh=True))
+    assert counter["FDwfAnalogInBufferSizeInfo"] == 2
+
+def test_capability_cache_disabled(monkeypatch, tmp_path, calls):
+    monkeypatch.setattr(device.info_cache, "path", str(tmp_path))
+    monkeypatch.setattr(device.info_cache, "enabled", False)
+    counter = calls("FDwfAnalogInBufferSizeInfo")
+    device.close(device.open())
+    device.close(device.open())
+    assert counter["FDwfAnalogInBufferSizeInfo"] == 2
+    assert os.listdir(tmp_path) == []
+
+def test_capability_cache_corrupted(monkeypatch, tmp_path):
+    monkeypatch.setattr(device.info_cache, "path", str(tmp_path))
+    device_data = device.open()
+    device.close(device_data)
+    for name in os.listdir(tmp_path):
+        with open(os.path.join(tmp_path, name), "w") as file:
+            file.write("{")
+    # a broken entry is queried again
+    reopened = device.open()
+    device.close(reopened)
+    assert reopened.analog.input.max_buffer_size == device_data.analog.input.max_buffer_size
+
+"""-----------------------------------------------------------------------"""
+
+def test_error_counters(device_data):
+    device.count_errors()
+    try:
+        for _ in range(2):
+            with pytest.raises(device.error) as failure:
+                wavegen.generate(device_data, 3, wavegen.function.sine, 0)
+        assert failure.value.instrument == "wavegen"
+
+        # the errors are counted for the device and the instrument
+        count, rate = device.error_rate("wavegen", device_data)
+        assert count == 2 and rate > 0
+        assert device.error_rate("scope", device_data)[0] == 0
+        assert device.error_rate()[0] == 2
+
+        # resetting an instrument keeps the other counters
+        device.count_errors(instrument="scope")
+        assert device.error_rate("wavegen", device_data)[0] == 2
+        device.count_errors(instrument="wavegen", device_data=device_data)
+        assert device.error_rate("wavegen", device_data)[0] == 0
+    finally:
+        device.count_errors(False)
+
+"""-----------------------------------------------------------------------"""
+
+def test_wait_policy_delays():
+    policy = device.wait_policy(min_interval=1e-03, max_interval=8e-03)
+    delays = policy.delays()
+    # exponential backoff up to the longest interval
+    assert [next(delays) for _ in range(6)] == pytest.approx([1e-03, 2e-03, 4e-03, 8e-03, 8e-03, 8e-03])
+    assert next(device.wait_policy(interval=5e-03).delays()) == 5e-03
+    with pytest.raises(device.error):
+        device.wait_policy(interval=0)
+    with pytest.raises(device.error):
+        device.wait_policy(min_interval=1, max_interval=0.1)
+
+def test_wait():
+    polls = []
+    device.wait(lambda: polls.append(1) or len(polls) == 3, device.wait_policy(interval=1e-03))
+    assert len(polls) == 3
+    with pytest.raises(device.error, match="Timeout"):
+        device.wait(lambda: False, device.wait_policy(timeout=0.01))
+    cancel = threading.Event()
+    cancel.set()
+    with pytest.raises(device.error, match="Cancelled"):
+        device.wait(lambda: False, device.wait_policy(cancel=cancel))
+
+"""-----------------------------------------------------------------------"""
+
+def test_pool():
+    def capture(device_data, channel):
+        wavegen.generate(device_data, channel, wavegen.function.dc, 0.5)
+        recorder = scope.instrument(device_data)
+        recorder.open(sampling_frequency=1e06, buffer_size=100)
+        return recorder.record(1, as_array=True).mean()
+
+    with manager.pool() as devices:
+        assert len(devices.serials) == 2
+        results = devices.run(capture, 1)
+        assert sorted(results) == sorted(devices.serials)
+        assert np.allclose(list(results.values()), 0.5, atol=0.01)
+
+        # a failed call is returned or raised after every device finished
+        results = devices.run(capture, 3, return_exceptions=True)
+        assert all(isinstance(result, device.error) for result in results.values())
+        with pytest.raises(device.error):
+            devices.run(capture, 3)
@@ -0,0 +1,154 @@
+""" OSCILLOSCOPE TESTS: stream, record_channels, record_raw, record_segments, measure_batch, decimate, session """
+
+import numpy as np
+import pytest
+from WF_SDK import scope, wavegen
+from WF_SDK.device import error
+from WF_SDK.library import constants
+
+"""-----------------------------------------------------------------------"""
+
+@pytest.fixture
+def levels(device_data):
+    """ 1V on channel 1 and -0.5V on channel 2 """
+    wavegen.generate(device_data, 1, wavegen.function.dc, 1)
+    wavegen.generate(device_data, 2, wavegen.function.dc, -0.5)
+    scope.open(device_data, sampling_frequency=100e03, buffer_size=1000)
+    yield device_data
+    scope.close(device_data)
+    wavegen.close(device_data)
+
+"""-----------------------------------------------------------------------"""
+
+def test_record_channels(levels):
+    samples = scope.record_channels(levels, [1, 2])
+    assert samples.shape == (2, 1000)
+    assert np.allclose(samples.mean(axis=1), [1, -0.5], atol=0.01)
+
+    # the rows are written into a preallocated array
+    out = np.zeros((2, 1000))
+    assert np.shares_memory(scope.record_channels(levels, [1, 2], out=out), out)
+    with pytest.raises(error):
+        scope.record_channels(levels, [1, 2], out=np.zeros((2, 10)))
+
+def test_record_channels_aligned(device_data):
+    # the same sine on both channels, the rows come from one acquisition
+    for channel in (1, 2):
+        wavegen.generate(device_data, channel, wavegen.function.sine, 0, 1e03, 1)
+    scope.open(device_data, sampling_frequency=1e06, buffer_size=2000)
+    samples = scope.record_channels(device_data, [1, 2])
+    assert np.max(np.abs(samples[0] - samples[1])) < 0.02
+
+def test_record_raw(levels):
+    raw, scale = scope.record_raw(levels, [1, 2])
+    assert raw.dtype == np.int16 and raw.shape == (2, 1000)
+    assert np.allclose(scope.to_volts(raw, scale).mean(axis=1), [1, -0.5], atol=0.01)
+
+    # a single channel gives 1-D samples
+    raw, scale = scope.record_raw(levels, [2])
+    assert np.allclose(scope.to_volts(raw[0], scale), -0.5, atol=0.01)
+
+def test_measure_batch(levels):
+    batch = scope.measure_batch(levels, 1, count=100, sampling_frequency=10e03)
+    assert len(batch.values) == 100
+    assert batch.mean == pytest.approx(1, abs=0.01)
+    # the times are relative to the first reading
+    assert np.allclose(batch.times, np.arange(100) / 10e03)
+
+def test_stream(levels):
+    chunks = list(scope.stream(levels, [1, 2], duration=0.05))
+    samples = np.concatenate([chunk for chunk, lost, corrupted in chunks], axis=1)
+    assert samples.shape == (2, 5000)
+    assert sum(lost + corrupted for chunk, lost, corrupted in chunks) == 0
+    assert np.allclose(samples.mean(axis=1), [1, -0.5], atol=0.01)
+
+    # a single channel yields 1-D chunks
+    chunk = next(iter(scope.stream(levels, 2, duration=0.01)))[0]
+    assert chunk.ndim == 1
+
+def test_record_segments(device_data):
+    wavegen.generate(device_data, 1, wavegen.function.sine, 0, 1e03, 1)
+    scope.open(device_data, sampling_frequency=1e06, buffer_size=500)
+    scope.trigger(device_data, True, scope.trigger_source.analog, 1, level=0)
+    try:
+        frames, timestamps, missed = scope.record_segments(device_data, 1, 5)
+    finally:
+        scope.trigger(device_data, False)
+    assert frames.shape == (5, 500)
+    # every frame is triggered on the rising zero crossing in its middle, once per period
+    assert np.allclose(frames[:, 250], 0, atol=0.02)
+    assert np.all(frames[:, 260] > frames[:, 240])
+    assert np.allclose(np.diff(timestamps), 1e-03, rtol=1e-03)
+    assert missed == 0
+
+"""-----------------------------------------------------------------------"""
+
+def test_decimate_dc():
+    samples = np.full((2, 1001), 3.0)
+    result = scope.decimate(samples, 4)
+    assert result.shape == (2, 251)
+    assert np.allclose(result, 3)
+
+def test_decimate_tone():
+    # a tone below the new Nyquist frequency (0.125 cycles/sample) passes unchanged
+    index = np.arange(4000)
+    result = scope.decimate(np.sin(2 * np.pi * 0.05 * index), 4)
+    expected = np.sin(2 * np.pi * 0.05 * index[::4])
+    assert np.max(np.abs(result - expected)[50:-50]) < 0.01
+
+def test_decimate_alias():
+    # a tone above the new Nyquist frequency would alias, it is filtered out
+    index = np.arange(4000)
+    result = scope.decimate(np.sin(2 * np.pi * 0.4 * index), 4)
+    assert np.max(np.abs(result[50:-50])) < 0.01
+
+def test_decimate_out():
+    samples = np.random.default_rng(0).normal(size=(3, 1001))
+    out = np.zeros((3, 260))
+    result = scope.decimate(samples, 4, out=out)
+    assert np.shares_memory(result, out)
+    assert np.allclose(result, scope.decimate(samples, 4))
+    with pytest.raises(error):
+        scope.decimate(samples, 4, out=np.zeros((3, 100)))
+    with pytest.raises(error):
+        scope.decimate(samples, 4, out=np.zeros((3, 260), dtype=np.float32))
+
+def test_record_decimation(device_data):
+    wavegen.generate(device_data, 1, wavegen.function.dc, 0.5)
+    scope.open(device_data, sampling_frequency=1e06, buffer_size=1000, decimation=4)
+    samples = scope.record(device_data, 1, as_array=True)
+    assert samples.shape == (250,)
+    assert np.allclose(samples, 0.5, atol=0.01)
+
+"""-----------------------------------------------------------------------"""
+
+def test_session_sends_changes(device_data, calls):
+    session = scope.session(device_data)
+    session.configure(sampling_frequency=1e06, buffer_size=1000)
+    counter = calls("FDwfAnalogInReset", "FDwfAnalogInFrequencySet", "FDwfAnalogInBufferSizeSet",
+                    "FDwfAnalogInChannelRangeSet", "FDwfAnalogInChannelOffsetSet", "FDwfAnalogInChannelFilterSet")
+
+    # the same settings, also with the mode given as an SDK constant, send nothing
+    session.configure(sampling_frequency=1e06, buffer_size=1000)
+    session.configure(sampling_frequency=1e06, buffer_size=1000, mode=constants.filterDecimate)
+    assert sum(counter.values()) == 0
+
+    # a new sampling frequency is the only call
+    session.configure(sampling_frequency=2e06, buffer_size=1000)
+    assert counter == {"FDwfAnalogInFrequencySet": 1}
+    assert len(session.record(1)) == 1000
+
+    # close forgets the settings, the next configure sends every setting
+    session.close()
+    session.configure(sampling_frequency=2e06, buffer_size=1000)
+    assert counter["FDwfAnalogInFrequencySet"] == 2 and counter["FDwfAnalogInBufferSizeSet"] == 1
+    session.close()
+
+def test_session_settings(device_data):
+    session = scope.session(device_data)
+    session.configure(sampling_frequency=1e06, buffer_size=1000)
+    # the module functions don't change the settings of the session
+    assert session.data is not scope.data
+    scope.open(device_data, sampling_frequency=5e06)
+    assert session.data.sampling_frequency == 1e06
+    session.close()
@@ -0,0 +1,71 @@
+""" TRACE TESTS: a session recorded on the simulator is replayed without it """
+
+import json
+import os
+import subprocess
+import sys
+import pytest
+
+# the backend is chosen once per process, so every session runs in its own interpreter
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+session = """
+import json, sys
+import numpy as np
+from WF_SDK import library, simulator
+library.select(sys.argv[1], sys.argv[2])
+simulator.settings.realtime = False
+from WF_SDK import device, scope, wavegen, logic, pattern
+from WF_SDK.protocol import uart
+
+results = []
+device_data = device.open()
+results.append(device_data.serial)
+wavegen.generate(device_data, 1, wavegen.function.sine, 0.5, 1e03, 2)
+scope.open(device_data, sampling_frequency=1e06, buffer_size=1000)
+results.append(scope.record(device_data, 1, as_array=True).tolist())
+raw, scale = scope.record_raw(device_data, [1, 2])
+results.append(raw.tolist())
+results.append([chunk.tolist() for chunk, lost, corrupted in scope.stream(device_data, 1, duration=0.002)])
+pattern.generate(device_data, 0, pattern.function.pulse, 100e03)
+logic.open(device_data, sampling_frequency=1e06, buffer_size=100)
+results.append(logic.record(device_data, 0))
+uart.open(device_data, 1, 1)
+uart.write(device_data, "trace")
+results.append(uart.read(device_data))
+uart.close(device_data)
+if sys.argv[3] == "diverge":
+    scope.measure(device_data, 2)
+device.close(device_data)
+print(json.dumps(results))
+"""
+
+"""-----------------------------------------------------------------------"""
+
+def run(tmp_path, backend, variant="same"):
+    """ run the session with a backend, returns the completed process """
+    script = tmp_path / "session.py"
+    script.write_text(session)
+    environment = dict(os.environ, PYTHONPATH=root, XDG_CACHE_HOME=str(tmp_path / "cache"))
+    environment.pop("WF_SDK_BACKEND", None)
+    environment.pop("WF_SDK_TRACE", None)
+    return subprocess.run([sys.executable, str(script), backend, str(tmp_path / "session.trace"), variant],
+                          capture_output=True, text=True, env=environment, timeout=120)
+
+def test_replay_equals_recording(tmp_path):
+    recorded = run(tmp_path, "simulator")
+    assert recorded.returncode == 0, recorded.stderr
+    replayed = run(tmp_path, "replay")
+    assert replayed.returncode == 0, replayed.stderr
+
+    # the noisy measurements are reproduced exactly
+    assert json.loads(replayed.stdout) == json.loads(recorded.stdout)
+    results = json.loads(recorded.stdout)
+    assert len(results[1]) == 1000 and len(set(results[1])) > 1
+    assert bytes(results[-1]) == b"trace"
+
+def test_replay_diverges(tmp_path):
+    assert run(tmp_path, "simulator").returncode == 0
+    replayed = run(tmp_path, "replay", "diverge")
+    assert replayed.returncode != 0
+    assert "the replay diverged from the trace" in replayed.stderr or "the trace has no more calls" in replayed.stderr
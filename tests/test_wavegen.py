@@ -0,0 +1,94 @@
+""" WAVEFORM GENERATOR TESTS: output, modulate, play, custom data """
+
+import numpy as np
+import pytest
+from WF_SDK import scope, wavegen
+from WF_SDK.device import error
+
+"""-----------------------------------------------------------------------"""
+
+def peak(samples, sampling_frequency):
+    """ frequency of the strongest spectral line """
+    spectrum = np.abs(np.fft.rfft(samples - np.mean(samples)))
+    return np.argmax(spectrum) * sampling_frequency / len(samples)
+
+@pytest.fixture
+def recorder(device_data):
+    """ the oscilloscope on the wavegen outputs """
+    scope.open(device_data, sampling_frequency=1e06, buffer_size=8192)
+    yield device_data
+    scope.close(device_data)
+    wavegen.close(device_data)
+
+"""-----------------------------------------------------------------------"""
+
+def test_output_sends_changes(recorder, calls):
+    output = wavegen.output(recorder, 1)
+    output.generate(wavegen.function.sine, 0, 10e03, 1)
+    counter = calls("FDwfAnalogOutNodeFrequencySet", "FDwfAnalogOutNodeAmplitudeSet", "FDwfAnalogOutNodeFunctionSet", "FDwfAnalogOutConfigure")
+
+    # a frequency step is the setting and the apply, without a restart
+    output.set(frequency=20e03)
+    assert counter == {"FDwfAnalogOutNodeFrequencySet": 1, "FDwfAnalogOutConfigure": 1}
+    assert peak(scope.record(recorder, 1, as_array=True), 1e06) == pytest.approx(20e03, rel=0.01)
+
+    # the same settings send nothing
+    counter.clear()
+    output.set(frequency=20e03, amplitude=1)
+    assert sum(counter.values()) == 0
+
+    # a new function restarts the signal
+    output.set(function=wavegen.function.square, amplitude=0.5)
+    assert counter["FDwfAnalogOutNodeFunctionSet"] == 1 and counter["FDwfAnalogOutConfigure"] == 1
+    samples = scope.record(recorder, 1, as_array=True)
+    assert np.allclose([samples.min(), samples.max()], [-0.5, 0.5], atol=0.02)
+    output.close()
+
+def test_output_custom_data(recorder):
+    output = wavegen.output(recorder, 2)
+    output.generate(wavegen.function.custom, 0, 1e03, 1, data=np.linspace(-1, 1, 100))
+    samples = scope.record(recorder, 2, as_array=True)
+    assert np.allclose([samples.min(), samples.max()], [-1, 1], atol=0.05)
+    with pytest.raises(error):
+        output.set(data=np.zeros(0))
+    output.close()
+
+"""-----------------------------------------------------------------------"""
+
+def test_modulate_am(recorder):
+    wavegen.generate(recorder, 1, wavegen.function.sine, 0, 10e03, 1)
+    wavegen.modulate(recorder, 1, wavegen.node.am, wavegen.function.sine, 500, 50)
+    samples = scope.record(recorder, 1, as_array=True)
+    # 50% amplitude modulation: the envelope is between 0.5 and 1.5
+    assert np.max(np.abs(samples)) == pytest.approx(1.5, abs=0.05)
+
+    wavegen.modulate(recorder, 1, wavegen.node.am, enable=False)
+    samples = scope.record(recorder, 1, as_array=True)
+    assert np.max(np.abs(samples)) == pytest.approx(1, abs=0.02)
+
+def test_modulate_fm(recorder):
+    output = wavegen.output(recorder, 1)
+    output.generate(wavegen.function.sine, 0, 10e03, 1)
+    output.modulate(wavegen.node.fm, wavegen.function.square, 200, 20)
+    # a square FM switches between two frequencies, 20% above and below the carrier
+    samples = scope.record(recorder, 1, as_array=True)
+    spectrum = np.abs(np.fft.rfft(samples))
+    frequencies = np.fft.rfftfreq(samples.size, 1e-06)
+    below = frequencies < 10e03
+    assert frequencies[below][np.argmax(spectrum[below])] == pytest.approx(8e03, rel=0.02)
+    assert frequencies[~below][np.argmax(spectrum[~below])] == pytest.approx(12e03, rel=0.02)
+    with pytest.raises(error):
+        output.modulate(wavegen.node.carrier)
+    output.close()
+
+"""-----------------------------------------------------------------------"""
+
+def test_play(device_data):
+    samples = np.sin(2 * np.pi * 1e03 * np.arange(10000) / 100e03)
+    played, lost, corrupted = wavegen.play(device_data, 1, samples, 100e03)
+    assert (played, lost, corrupted) == (10000, 0, 0)
+
+    # a generator of chunks is streamed the same way
+    chunks = (samples[start:start + 1000] for start in range(0, 10000, 1000))
+    assert wavegen.play(device_data, 1, chunks, 100e03)[0] == 10000
+    wavegen.close(device_data)